@@ -0,0 +1,75 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Import time of wavesql.sync and wavesql.aio, measured with `python -X importtime` (no database required).
+
+Every run is a fresh interpreter. The benchmark fails if importing wavesql loads a module that is deferred
+until first use (the connector, colorama, NumPy, ...) or, when `max_ms` is given, if a median import time is above it.
+
+Usage:
+    python -m benchmarks.bench_import [number_of_runs] [max_ms]
+"""
+
+import statistics
+import subprocess
+import sys
+
+from pathlib import Path
+
+MODULES = ("wavesql.sync", "wavesql.aio")
+# * loaded on first connection, first console print, first result or by start(), never by the import itself
+DEFERRED = ("mysql.connector", "colorama", "numpy", "configparser", "pprint", "hashlib")
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def measure(module: str) -> tuple[float, list[str]]:
+    code = f"import sys, {module}; print(*(name for name in {DEFERRED!r} if name in sys.modules))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    # * report lines are "import time: self [us] | cumulative | name", nested imports are indented in the name column
+    for line in result.stderr.splitlines():
+        columns = line.split("|")
+        if line.startswith("import time:") and len(columns) == 3 and columns[2].strip() == module and not columns[2].startswith("   "):
+            return int(columns[1]) / 1000, result.stdout.split()
+    raise RuntimeError(f"{module} not found in the -X importtime report:\n{result.stderr}")
+
+
+def main(number: int = 10, max_ms: float | None = None) -> int:
+    failed = False
+    for module in MODULES:
+        # * the first run may compile .pyc files
+        measure(module)
+        times = []
+        loaded: set[str] = set()
+        for _ in range(number):
+            cumulative, modules = measure(module)
+            times.append(cumulative)
+            loaded.update(modules)
+        median = statistics.median(times)
+        print(f"{module:<15} median {median:8.2f} ms   min {min(times):8.2f} ms   ({number} runs)")
+        if loaded:
+            print(f"  FAIL: deferred modules imported: {', '.join(sorted(loaded))}")
+            failed = True
+        if max_ms is not None and median > max_ms:
+            print(f"  FAIL: median is above {max_ms:.2f} ms")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:2]), *(float(arg) for arg in sys.argv[2:3])))
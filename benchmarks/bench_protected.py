@@ -0,0 +1,101 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-call overhead of the @__protected guard (no database required).
+
+Usage:
+    python -m benchmarks.bench_protected [number_of_calls]
+"""
+
+import asyncio
+import inspect
+import sys
+import time
+
+from wavesql.database import WaveSQL
+from wavesql.asyncdatabase import AsyncWaveSQL
+
+CONFIG = {"MYSQL": {"database": "bench", "host": "localhost", "user": "root", "password": "root"}}
+
+
+def legacy_protected(method):
+    # * the previous inspect.stack() based guard, kept as the baseline
+    def wrapper(self, *args, **kwargs):
+        caller_self = inspect.stack()[1].frame.f_locals.get('self')
+        if caller_self is not None and isinstance(caller_self, self.__class__):
+            return method(self, *args, **kwargs)
+        raise PermissionError(f"Method '{method.__name__}' is protected and cannot be called from outside")
+    return wrapper
+
+
+def legacy_async_protected(method):
+    async def wrapper(self, *args, **kwargs):
+        caller_self = inspect.stack()[1].frame.f_locals.get('self')
+        if caller_self is not None and isinstance(caller_self, self.__class__):
+            return await method(self, *args, **kwargs)
+        raise PermissionError(f"Async method '{method.__name__}' is protected and cannot be called from outside")
+    return wrapper
+
+
+class SyncBench(WaveSQL):
+    def _noop(self):
+        return None
+
+    legacy = legacy_protected(_noop)
+    current = WaveSQL._WaveSQL__protected(_noop)
+
+    def run(self, name: str, number: int) -> float:
+        # * the loop lives in a method so that the guard sees `self` in the caller frame
+        method = getattr(self, name)
+        start = time.perf_counter()
+        for _ in range(number):
+            method()
+        return (time.perf_counter() - start) / number
+
+
+class AsyncBench(AsyncWaveSQL):
+    async def _noop(self):
+        return None
+
+    legacy = legacy_async_protected(_noop)
+    current = AsyncWaveSQL._AsyncWaveSQL__protected(_noop)
+
+    async def run(self, name: str, number: int) -> float:
+        method = getattr(self, name)
+        start = time.perf_counter()
+        for _ in range(number):
+            await method()
+        return (time.perf_counter() - start) / number
+
+
+def main(number: int = 20000) -> None:
+    db = SyncBench(config=CONFIG)
+    adb = AsyncBench(config=CONFIG)
+    results = {
+        "sync legacy (inspect.stack)": db.run("legacy", number),
+        "sync current (caller frame)": db.run("current", number),
+        "async legacy (inspect.stack)": asyncio.run(adb.run("legacy", number)),
+        "async current (caller frame)": asyncio.run(adb.run("current", number)),
+    }
+    for name, seconds in results.items():
+        print(f"{name:<30} {seconds * 1e6:10.2f} us/call")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,163 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from wavesql import logLimiter
+from wavesql.logLimiter import LogLimiter, get_log_insert
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(logLimiter, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def rolls(monkeypatch):
+    values = []
+    monkeypatch.setattr(logLimiter, "random", SimpleNamespace(random=lambda: values.pop(0)))
+    return values
+
+
+def test_without_limit_and_sampling_every_record_is_written():
+    limiter = LogLimiter()
+    assert all(limiter.check(8, "API", "error") for _ in range(100))
+    assert limiter.pop_summaries(is_force=True) == []
+    assert limiter.stats()["written"] == 100
+
+
+def test_limit_applies_per_module_level_and_fingerprint(clock):
+    limiter = LogLimiter(limit=2, window=60.0)
+    # * numbers don't split a group
+    assert [limiter.check(8, "API", f"timeout after {ms} ms") for ms in (31, 40, 52, 7)] == [True, True, False, False]
+    assert limiter.check(8, "API", "connection refused") is True
+    assert limiter.check(5, "API", "timeout after 1 ms") is True
+    assert limiter.check(8, "AUTH", "timeout after 1 ms") is True
+    assert limiter.stats() == {"groups": 4, "written": 5, "coalesced": 2, "sampled": 0, "summaries": 0}
+
+
+def test_window_restarts_the_limit(clock):
+    limiter = LogLimiter(limit=1, window=10.0)
+    assert limiter.check(8, "API", "error") is True
+    assert limiter.check(8, "API", "error") is False
+    clock[0] += 9.9
+    assert limiter.check(8, "API", "error") is False
+    clock[0] += 0.1
+    assert limiter.check(8, "API", "error") is True
+
+
+def test_summary_of_coalesced_records(clock):
+    limiter = LogLimiter(limit=1, window=10.0)
+    before = datetime.now()
+    limiter.check(8, "API", "timeout after 30 ms")
+    limiter.check(8, "API", "timeout after 31 ms")
+    limiter.check(8, "API", "timeout after 32 ms")
+    limiter.check(8, "API", "timeout after 33 ms")
+    after = datetime.now()
+    # * nothing is summarized while the window is open
+    assert limiter.pop_summaries() == []
+    clock[0] += 10.0
+    summaries = limiter.pop_summaries()
+    assert len(summaries) == 1
+    level, first_date, module, message, traceback, repeat_count, last_date = summaries[0]
+    assert (level, module, message, traceback, repeat_count) == (8, "API", "timeout after 31 ms", "", 3)
+    assert before <= first_date <= last_date <= after
+    assert limiter.pop_summaries() == []
+    assert limiter.stats()["summaries"] == 1
+
+
+def test_group_without_coalesced_records_has_no_summary(clock):
+    limiter = LogLimiter(limit=5, window=10.0)
+    limiter.check(8, "API", "error")
+    clock[0] += 10.0
+    assert limiter.pop_summaries() == []
+    assert limiter.stats()["groups"] == 0
+
+
+def test_forced_summaries_ignore_the_window(clock):
+    limiter = LogLimiter(limit=1, window=60.0)
+    for _ in range(3):
+        limiter.check(8, "API", "error")
+    summaries = limiter.pop_summaries(is_force=True)
+    assert [summary[5] for summary in summaries] == [2]
+
+
+def test_reopened_window_summarizes_the_previous_one(clock):
+    limiter = LogLimiter(limit=1, window=10.0)
+    limiter.check(8, "API", "error")
+    limiter.check(8, "API", "error")
+    clock[0] += 10.0
+    # * the first record of the new window closes the old one
+    assert limiter.check(8, "API", "error") is True
+    assert [summary[5] for summary in limiter.pop_summaries()] == [1]
+
+
+def test_sample_rate(rolls):
+    limiter = LogLimiter(sample_rate=0.25)
+    rolls.extend([0.1, 0.25, 0.9, 0.0])
+    assert [limiter.check(3, "API", "info") for _ in range(4)] == [True, False, False, True]
+    assert limiter.stats()["sampled"] == 2 and limiter.stats()["written"] == 2
+
+
+def test_sample_rate_per_level(rolls):
+    limiter = LogLimiter(sample_rate={3: 0.5})
+    rolls.extend([0.7, 0.2])
+    assert limiter.check(3, "API", "info") is False
+    assert limiter.check(3, "API", "info") is True
+    # * levels without a rate are always kept and don't roll
+    assert limiter.check(8, "API", "error") is True
+    assert rolls == []
+
+
+def test_sampled_out_records_are_not_counted_by_the_limit(clock, rolls):
+    limiter = LogLimiter(limit=1, window=10.0, sample_rate=0.5)
+    rolls.extend([0.9, 0.1, 0.1])
+    assert [limiter.check(8, "API", "error") for _ in range(3)] == [False, True, False]
+    assert limiter.stats()["sampled"] == 1 and limiter.stats()["coalesced"] == 1
+
+
+@pytest.mark.parametrize("kwargs", [{"limit": -1}, {"limit": 1.5}, {"window": 0}, {"window": "60"}])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        LogLimiter(**kwargs)
+
+
+def test_insert_of_plain_records():
+    date = datetime(2025, 6, 1, 12, 0)
+    query, params = get_log_insert([(8, date, "API", "error", "trace"), (3, None, "API", "info", "")])
+    assert query == (
+        "INSERT INTO logs (level_id, date, module, message, traceback) VALUES "
+        "(%s, COALESCE(%s, NOW()), %s, %s, %s), (%s, COALESCE(%s, NOW()), %s, %s, %s)"
+    )
+    assert params == (8, date, "API", "error", "trace", 3, None, "API", "info", "")
+
+
+def test_insert_of_mixed_plain_and_summary_records():
+    first, last = datetime(2025, 6, 1, 12, 0), datetime(2025, 6, 1, 12, 1)
+    query, params = get_log_insert([(8, first, "API", "error", ""), (8, first, "API", "error", "", 5, last)])
+    assert query == (
+        "INSERT INTO logs (level_id, date, module, message, traceback, repeat_count, last_date) VALUES "
+        "(%s, COALESCE(%s, NOW()), %s, %s, %s, %s, %s), (%s, COALESCE(%s, NOW()), %s, %s, %s, %s, %s)"
+    )
+    assert params == (8, first, "API", "error", "", 1, None, 8, first, "API", "error", "", 5, last)
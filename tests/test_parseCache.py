@@ -0,0 +1,149 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+
+from wavesql import parseCache
+from wavesql.parseCache import ParseCache, PARSE_CACHE_NAME
+
+
+class Parser:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, text: str) -> list[str]:
+        self.calls += 1
+        return text.split()
+
+
+@pytest.fixture
+def sql_file(tmp_path):
+    path = tmp_path / "0_init_users.sql"
+    path.write_text("CREATE TABLE users")
+    return path
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / PARSE_CACHE_NAME
+
+
+def touch(path, seconds: int = 10) -> None:
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10 ** 9))
+
+
+def saved_and_reloaded(cache_path, sql_file, options=(), parser=None):
+    cache = ParseCache(cache_path)
+    cache.load(sql_file, options, parser or Parser())
+    assert cache.save()
+    return ParseCache(cache_path)
+
+
+def test_unchanged_file_is_parsed_once(sql_file, cache_path):
+    cache, parse = ParseCache(cache_path), Parser()
+    assert cache.load(sql_file, (), parse) == ["CREATE", "TABLE", "users"]
+    assert cache.load(sql_file, (), parse) == ["CREATE", "TABLE", "users"]
+    assert parse.calls == 1
+
+
+def test_saved_cache_is_used_by_the_next_process(sql_file, cache_path):
+    cache, parse = saved_and_reloaded(cache_path, sql_file), Parser()
+    assert cache.load(sql_file, (), parse) == ["CREATE", "TABLE", "users"]
+    assert parse.calls == 0
+    assert cache.save() is False
+
+
+def test_changed_mtime_with_same_content_keeps_the_entry(sql_file, cache_path, monkeypatch):
+    cache, parse = saved_and_reloaded(cache_path, sql_file), Parser()
+    touch(sql_file)
+    assert cache.load(sql_file, (), parse) == ["CREATE", "TABLE", "users"]
+    assert parse.calls == 0
+    # * the new mtime is stored, so the next start doesn't even hash the file
+    assert cache.save() is True
+    monkeypatch.setattr(parseCache, "get_content_hash", pytest.fail)
+    assert ParseCache(cache_path).load(sql_file, (), parse) == ["CREATE", "TABLE", "users"]
+    assert parse.calls == 0
+
+
+def test_changed_content_is_parsed_again(sql_file, cache_path):
+    cache, parse = saved_and_reloaded(cache_path, sql_file), Parser()
+    sql_file.write_text("CREATE TABLE orders")
+    touch(sql_file)
+    assert cache.load(sql_file, (), parse) == ["CREATE", "TABLE", "orders"]
+    assert parse.calls == 1
+
+
+def test_changed_options_are_parsed_again(sql_file, cache_path):
+    cache, parse = saved_and_reloaded(cache_path, sql_file, options=({"dbname": "a"}, True)), Parser()
+    assert cache.load(sql_file, ({"dbname": "b"}, True), parse) == ["CREATE", "TABLE", "users"]
+    assert cache.load(sql_file, ({"dbname": "b"}, False), parse) == ["CREATE", "TABLE", "users"]
+    assert parse.calls == 2
+
+
+def test_changed_generator_fingerprint_drops_the_file(sql_file, cache_path, monkeypatch):
+    saved_and_reloaded(cache_path, sql_file)
+    monkeypatch.setattr(parseCache, "get_generator_fingerprint", lambda: "upgraded")
+    cache, parse = ParseCache(cache_path), Parser()
+    cache.load(sql_file, (), parse)
+    assert parse.calls == 1
+
+
+@pytest.mark.parametrize("content", [b"", b"not a pickle", b"\x80\x05K\x01."])
+def test_unreadable_cache_file_is_ignored(sql_file, cache_path, content):
+    cache_path.write_bytes(content)
+    cache, parse = ParseCache(cache_path), Parser()
+    assert cache.load(sql_file, (), parse) == ["CREATE", "TABLE", "users"]
+    assert parse.calls == 1
+    assert cache.save() is True
+    parse = Parser()
+    ParseCache(cache_path).load(sql_file, (), parse)
+    assert parse.calls == 0
+
+
+def test_save_keeps_only_files_used_since_load(tmp_path, sql_file, cache_path):
+    other_file = tmp_path / "1_init_orders.sql"
+    other_file.write_text("CREATE TABLE orders")
+    cache = ParseCache(cache_path)
+    cache.load(sql_file, (), Parser())
+    cache.load(other_file, (), Parser())
+    assert cache.save()
+
+    cache = ParseCache(cache_path)
+    sql_file.write_text("CREATE TABLE users2")
+    cache.load(sql_file, (), Parser())
+    assert cache.save()
+
+    parse = Parser()
+    ParseCache(cache_path).load(other_file, (), parse)
+    assert parse.calls == 1
+
+
+def test_save_errors_are_ignored(tmp_path, sql_file):
+    cache = ParseCache(tmp_path / "missing" / PARSE_CACHE_NAME)
+    cache.load(sql_file, (), Parser())
+    assert cache.save() is False
+    assert list(tmp_path.iterdir()) == [sql_file]
+
+
+def test_missing_file_raises(tmp_path, cache_path):
+    with pytest.raises(OSError):
+        ParseCache(cache_path).load(tmp_path / "missing.sql", (), Parser())
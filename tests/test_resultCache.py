@@ -0,0 +1,164 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+import pytest
+
+from wavesql import resultCache
+from wavesql.resultCache import ResultCache, normalize_table_name
+from wavesql.sqlFileObject import SqlQuery
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resultCache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_get_returns_stored_result():
+    cache = ResultCache()
+    hit, value, generation = cache.get("q")
+    assert (hit, value) == (False, None)
+    assert cache.set("q", [{"id": 1}], ["users"], generation)
+    assert cache.get("q")[:2] == (True, [{"id": 1}])
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_size=2)
+    cache.set("a", 1, ["t"])
+    cache.set("b", 2, ["t"])
+    cache.get("a")
+    cache.set("c", 3, ["t"])
+    assert cache.get("b")[0] is False
+    assert cache.get("a")[:2] == (True, 1)
+    assert cache.get("c")[:2] == (True, 3)
+    assert len(cache) == 2 and cache.stats()["evictions"] == 1
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = ResultCache(ttl=10.0)
+    cache.set("q", 1, ["t"])
+    clock[0] += 9.9
+    assert cache.get("q")[0] is True
+    clock[0] += 0.1
+    assert cache.get("q")[0] is False
+    assert len(cache) == 0 and cache.stats()["expirations"] == 1
+
+
+def test_entry_without_ttl_never_expires(clock):
+    cache = ResultCache(ttl=None)
+    cache.set("q", 1, ["t"])
+    clock[0] += 10 ** 9
+    assert cache.get("q")[0] is True
+
+
+def test_results_are_copied_on_set_and_get():
+    cache = ResultCache()
+    rows = [{"id": 1}]
+    cache.set("q", rows, ["t"])
+    rows[0]["id"] = 2
+    rows.append({"id": 3})
+    _, cached, _ = cache.get("q")
+    assert cached == [{"id": 1}]
+    cached[0]["id"] = 4
+    cached.append({"id": 5})
+    assert cache.get("q")[1] == [{"id": 1}]
+
+    cache.set("row", {"id": 1}, ["t"])
+    cache.get("row")[1]["id"] = 2
+    assert cache.get("row")[1] == {"id": 1}
+
+
+def test_invalidate_drops_only_entries_of_written_tables():
+    cache = ResultCache()
+    cache.set("users", 1, ["users"])
+    cache.set("orders", 2, ["orders"])
+    cache.set("join", 3, ["users", "orders"])
+    assert cache.invalidate(["`shop`.`Users`"]) == 2
+    assert cache.get("users")[0] is False
+    assert cache.get("join")[0] is False
+    assert cache.get("orders")[:2] == (True, 2)
+    assert cache.invalidate(["users"]) == 0
+
+
+def test_invalidate_all():
+    cache = ResultCache()
+    cache.set("a", 1, ["t1"])
+    cache.set("b", 2, ["t2"])
+    assert cache.invalidate() == 2
+    assert len(cache) == 0
+    assert cache.invalidate(["t1"]) == 0
+
+
+def test_set_after_invalidation_is_dropped_as_stale():
+    cache = ResultCache()
+    _, _, generation = cache.get("q")
+    # * a write lands between the read of the database and storing its result
+    cache.invalidate(["other"])
+    assert cache.set("q", 1, ["t"], generation) is False
+    assert cache.get("q")[0] is False
+    _, _, generation = cache.get("q")
+    assert cache.set("q", 1, ["t"], generation) is True
+
+
+def test_replaced_entry_is_untagged_from_its_old_tables():
+    cache = ResultCache()
+    cache.set("q", 1, ["old"])
+    cache.set("q", 2, ["new"])
+    assert cache.invalidate(["old"]) == 0
+    assert cache.get("q")[:2] == (True, 2)
+
+
+@pytest.mark.parametrize("table, expected", [
+    ("users", "users"),
+    ("`Users`", "users"),
+    ("shop.users", "users"),
+    ("`shop`.`Users`", "users"),
+])
+def test_normalize_table_name(table, expected):
+    assert normalize_table_name(table) == expected
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("SELECT * FROM users WHERE id = %s", ("users",)),
+    ("SELECT * FROM `Users` AS u", ("users",)),
+    ("SELECT * FROM shop.users u", ("shop.users",)),
+    ("SELECT * FROM users u JOIN orders o ON o.user_id = u.id LEFT JOIN items i USING (order_id)", ("users", "orders", "items")),
+    ("SELECT * FROM users, orders WHERE users.id = orders.user_id", ("users", "orders")),
+    ("SELECT * FROM users WHERE id IN (SELECT user_id FROM orders)", ("users", "orders")),
+    ("SELECT COUNT(*) FROM users GROUP BY status ORDER BY 1 LIMIT 1", ("users",)),
+    ("SELECT a.id FROM a UNION SELECT b.id FROM b", ("a", "b")),
+    ("INSERT INTO logs (level_id, message) VALUES (%s, %s)", ("logs",)),
+    ("INSERT IGNORE INTO logs (message) VALUES (%s)", ("logs",)),
+    ("INSERT INTO archive SELECT * FROM logs", ("archive", "logs")),
+    ("UPDATE LOW_PRIORITY users SET name = %s WHERE id = %s", ("users",)),
+    ("UPDATE users u JOIN orders o ON o.user_id = u.id SET u.total = o.total", ("users", "orders")),
+    ("DELETE FROM sessions WHERE expires < NOW()", ("sessions",)),
+    ("DELETE QUICK FROM sessions", ("sessions",)),
+    ("SELECT * FROM users FOR UPDATE", ("users",)),
+])
+def test_get_tables(query, expected):
+    assert SqlQuery.get_tables(query) == expected
+
+
+def test_get_tables_lists_every_table_once():
+    assert SqlQuery.get_tables("SELECT * FROM users u JOIN users m ON m.id = u.manager_id") == ("users",)
@@ -0,0 +1,67 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import sys
+
+from pathlib import Path
+
+from .database import WaveSQL
+
+
+def generate(args: argparse.Namespace) -> int:
+    db = WaveSQL(
+        config=args.config, path_to_sql=args.sql, is_dictionary=args.dictionary,
+        is_row_class=args.row_class, is_parse_cache=not args.no_parse_cache
+    )
+    try:
+        written = db.generate_python_bridge(output_path=args.output)
+    except FileNotFoundError as ex:
+        print(ex, file=sys.stderr)
+        return 1
+    for file_path in written:
+        print(f"Written {file_path}")
+    if not written:
+        print(f"Python bridge in {Path(args.output).resolve()} is up to date")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m wavesql", description="WaveSQL command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = commands.add_parser(
+        "generate", help="generate the Python bridge from SQL files without connecting to the database",
+        description="Generates database.py, asyncdatabase.py, sync.py and aio.py from the *_init_*.sql files and queries.sql. "
+        "Only files whose content changed are written."
+    )
+    generate_parser.add_argument("--config", default=None, help="path to the settings .ini file (default: the bundled config.ini)")
+    generate_parser.add_argument("--sql", default=None, help="directory with the SQL files (default: the bundled sql directory)")
+    generate_parser.add_argument("--output", "-o", default=".", help="directory the bridge is written to (default: current directory)")
+    generate_parser.add_argument("--dictionary", action="store_true", help="generated SELECT methods return dicts (is_dictionary=True)")
+    generate_parser.add_argument("--row-class", action="store_true", help="generate NamedTuple row classes (is_row_class=True)")
+    generate_parser.add_argument("--no-parse-cache", action="store_true", help="parse every SQL file instead of using the parse cache")
+    generate_parser.set_defaults(handler=generate)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,38 +17,64 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import mysql
-import colorama
+from __future__ import annotations
+
 import os
-import traceback
-import configparser
 import copy
-import inspect
-import shutil
 import pathlib
 import sys
-import pprint
+import inspect
 import functools
+import contextlib
+import contextvars
+import itertools
 import asyncio
+import threading
+import atexit
+import time
 
-from mysql.connector.aio import connect
-from mysql.connector.errorcode import ER_BAD_DB_ERROR
-from mysql.connector.connection import MySQLConnection
-from mysql.connector.cursor import MySQLCursor
-from typing import Literal, Any
+from typing import TYPE_CHECKING, Literal, Any, Callable, Iterable, Iterator, AsyncIterator, Awaitable
 from datetime import datetime
-from colorama import Fore
 from pathlib import Path
+from collections import deque, OrderedDict
 
 
 if __name__ == "__main__":
-    from constants import PATH_DB_INIT_SCRIPTS, CONFIG_PATH, LOG_COLORS
+    from constants import PATH_DB_INIT_SCRIPTS, PATH_LOG_PARTITIONING_SCRIPT, PATH_MIGRATIONS_SCRIPT, CONFIG_PATH, LOG_COLORS, LOG_LEVELS
     from sqlFileObject import SqlFileObject, SqlFileQueries
+    from parseCache import ParseCache, PARSE_CACHE_NAME
+    from schemaMigrations import Migration, MIGRATION_INSERT, MIGRATION_LOOKUP, MIGRATION_ACKNOWLEDGE, LOG_SCHEMA_LOOKUP, get_migrations, get_schema_checksum, get_log_upgrades
+    from errors import PoolError, PoolTimeoutError, TransactionError, MigrationError
+    from lazyImport import LazyModule, init_console
+    from resultCache import ResultCache
+    from columnarResult import ColumnBuilder
+    from rowClass import resolve_row_class, make_row, make_rows
+    from logLimiter import LogLimiter, get_log_insert
+    from logSpool import LogSpool, is_connection_error
 else:
-    from .constants import PATH_DB_INIT_SCRIPTS, CONFIG_PATH, LOG_COLORS
+    from .constants import PATH_DB_INIT_SCRIPTS, PATH_LOG_PARTITIONING_SCRIPT, PATH_MIGRATIONS_SCRIPT, CONFIG_PATH, LOG_COLORS, LOG_LEVELS
     from .sqlFileObject import SqlFileObject, SqlFileQueries
+    from .parseCache import ParseCache, PARSE_CACHE_NAME
+    from .schemaMigrations import Migration, MIGRATION_INSERT, MIGRATION_LOOKUP, MIGRATION_ACKNOWLEDGE, LOG_SCHEMA_LOOKUP, get_migrations, get_schema_checksum, get_log_upgrades
+    from .errors import PoolError, PoolTimeoutError, TransactionError, MigrationError
+    from .lazyImport import LazyModule, init_console
+    from .resultCache import ResultCache
+    from .columnarResult import ColumnBuilder
+    from .rowClass import resolve_row_class, make_row, make_rows
+    from .logLimiter import LogLimiter, get_log_insert
+    from .logSpool import LogSpool, is_connection_error
 
-colorama.init(autoreset=True)
+if TYPE_CHECKING:
+    from mysql.connector.connection import MySQLConnection
+    from mysql.connector.cursor import MySQLCursor
+
+# * imported on first use, `import wavesql.aio` doesn't load the connector or modules only needed on errors and in start()
+mysql_aio = LazyModule("mysql.connector.aio")
+mysql_connector = LazyModule("mysql.connector")
+errorcode = LazyModule("mysql.connector.errorcode")
+pprint = LazyModule("pprint")
+traceback = LazyModule("traceback")
+configparser = LazyModule("configparser")
 
 
 def read_files_to_vars(directory: str):
@@ -67,11 +93,612 @@ def read_files_to_vars(directory: str):
     return file_contents
 
 
+def write_changed_files(directory: Path, files: dict[str, str]) -> list[Path]:
+    written = []
+    for filename, content in files.items():
+        file_path = directory / filename
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                if f.read() == content:
+                    continue
+        except OSError:
+            pass
+        # * concurrent workers may generate the same file, readers never see it half-written
+        tmp_path = file_path.with_name(f"{filename}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, file_path)
+        written.append(file_path)
+
+    return written
+
+
+class AsyncConnectionPool:
+    """Asyncio-native pool of MySQL connections.\n
+    The pool is bound to the event loop it is first used in. Waiters are served strictly FIFO:
+    a released connection (or a free slot) is handed directly to the oldest waiting coroutine.
+    Connections are checked for liveness on acquire and reset (unread results, open transaction,
+    session state) when released. Connections idle longer than `max_idle_time` are closed, but never below `min_size`.
+    `on_close` is called with every connection right before the pool closes it.
+
+    Example:\n
+        pool = AsyncConnectionPool({"host": "localhost", "user": "root", "password": "root", "database": "test"}, max_size=20)
+        connection = await pool.acquire()
+        try:
+            ...
+        finally:
+            await pool.release(connection)
+        await pool.aclose()
+    """
+    def __init__(
+        self, connection_config: dict, min_size: int = 1, max_size: int = 10,
+        max_idle_time: float | None = 300.0, timeout: float | None = 30.0,
+        ping_interval: float = 1.0, is_reset_session: bool = True,
+        on_close: Callable[[MySQLConnection], None] | None = None
+    ) -> None:
+        if not isinstance(min_size, int) or isinstance(min_size, bool):
+            raise TypeError(f"Expected 'min_size' to be of type int, but got: {type(min_size).__name__}")
+        if not isinstance(max_size, int) or isinstance(max_size, bool):
+            raise TypeError(f"Expected 'max_size' to be of type int, but got: {type(max_size).__name__}")
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Expected 0 <= 'min_size' <= 'max_size' and 'max_size' >= 1, but got: min_size={min_size}, max_size={max_size}")
+        self.connection_config = dict(connection_config)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle_time = max_idle_time
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self.is_reset_session = is_reset_session
+        self.on_close = on_close
+
+        self.__loop: asyncio.AbstractEventLoop | None = None
+        self.__idle: deque[tuple[MySQLConnection, float]] = deque()
+        self.__waiters: deque[asyncio.Future] = deque()
+        self.__in_use: set[int] = set()
+        self.__size = 0
+        self.__is_closed = False
+        self.__drained = asyncio.Event()
+        self.__stats = {
+            "created": 0, "closed": 0, "acquired": 0, "released": 0,
+            "waited": 0, "timeouts": 0, "reaped": 0, "broken": 0
+        }
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        return self.__loop
+
+    @property
+    def is_closed(self) -> bool:
+        return self.__is_closed
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the pool counters.
+
+        Returns:
+            dict: `size`, `idle`, `in_use` and `waiting` (queued coroutines), configured `min_size`/`max_size`
+                and cumulative counters (`created`, `closed`, `acquired`, `released`,
+                `waited`, `timeouts`, `reaped`, `broken`).
+        """
+        return {
+            "size": self.__size,
+            "idle": len(self.__idle),
+            "in_use": len(self.__in_use),
+            "waiting": len(self.__waiters),
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            **self.__stats
+        }
+
+    async def fill(self) -> None:
+        """Opens new connections until the pool holds at least `min_size` of them."""
+        self.__bind_loop()
+        while not self.__is_closed and self.__size < self.min_size:
+            self.__size += 1
+            try:
+                connection = await self.__connect()
+            except BaseException:
+                self.__put(None)
+                raise
+            self.__put((connection, time.monotonic()))
+
+    async def acquire(self) -> MySQLConnection:
+        """
+        Takes a live connection from the pool, opening a new one while the pool is below `max_size`.
+        When the pool is exhausted the caller is queued (FIFO) until a connection is released.
+
+        Returns:
+            MySQLConnection: A connection that must be handed back with `release()`.
+
+        Raises:
+            PoolError: If the pool is closed.
+            PoolTimeoutError: If no connection became available within `timeout` seconds.
+            Exception: Any connection error is re-raised.
+        """
+        self.__bind_loop()
+        await self.reap()
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            if self.__is_closed:
+                raise PoolError("Connection pool is closed")
+            if self.__idle and not self.__waiters:
+                item = self.__idle.pop()
+            elif self.__size < self.max_size and not self.__waiters:
+                self.__size += 1
+                item = None
+            else:
+                item = await self.__wait(deadline)
+
+            if item is None:
+                try:
+                    connection = await self.__connect()
+                except BaseException:
+                    self.__put(None)
+                    raise
+            else:
+                connection, released_at = item
+                if time.monotonic() - released_at >= self.ping_interval and not await self.__is_alive(connection):
+                    await self.__discard(connection, counter="broken")
+                    continue
+
+            self.__in_use.add(id(connection))
+            self.__stats["acquired"] += 1
+            return connection
+
+    async def release(self, connection: MySQLConnection, is_broken: bool = False) -> None:
+        """
+        Returns a connection to the pool.\n
+        Unread results are consumed, an open transaction is rolled back and, if `is_reset_session`
+        is set, the session state is reset. Connections that fail this are closed instead.
+
+        Args:
+            connection (MySQLConnection): A connection previously taken with `acquire()`.
+                Connections that do not belong to the pool are simply closed.
+            is_broken (bool, optional): If True, the connection is closed instead of being returned,
+                e.g. when it was left in the middle of an unbuffered result.
+        """
+        if id(connection) not in self.__in_use:
+            await self.__close_connection(connection, is_counted=False)
+            return
+        self.__in_use.discard(id(connection))
+        if is_broken:
+            await self.__discard(connection, counter="broken")
+            return
+        if self.__is_closed:
+            await self.__discard(connection)
+            return
+        try:
+            await connection.handle_unread_result()
+            if connection.in_transaction:
+                await connection.rollback()
+            if self.is_reset_session:
+                await connection.cmd_reset_connection()
+        except Exception:
+            await self.__discard(connection, counter="broken")
+            return
+
+        if self.__is_closed:
+            await self.__discard(connection)
+            return
+        self.__stats["released"] += 1
+        self.__put((connection, time.monotonic()))
+
+    async def reap(self) -> int:
+        """
+        Closes connections that stayed idle longer than `max_idle_time`, keeping at least `min_size` open.
+
+        Returns:
+            int: Number of closed connections.
+        """
+        if self.max_idle_time is None:
+            return 0
+        expired = []
+        now = time.monotonic()
+        while self.__idle and self.__size > self.min_size and now - self.__idle[0][1] > self.max_idle_time:
+            expired.append(self.__idle.popleft()[0])
+            self.__size -= 1
+        self.__stats["reaped"] += len(expired)
+        for connection in expired:
+            await self.__close_connection(connection)
+        return len(expired)
+
+    async def aclose(self, timeout: float | None = None) -> None:
+        """
+        Gracefully closes the pool.\n
+        New acquires and queued waiters fail with `PoolError`, idle connections are closed immediately
+        and connections still in use are closed as soon as they are released.
+
+        Args:
+            timeout (float, optional): Seconds to wait for connections in use to be released. None waits forever.
+        """
+        self.__is_closed = True
+        while self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(PoolError("Connection pool is closed"))
+        idle = [connection for connection, _ in self.__idle]
+        self.__idle.clear()
+        self.__size -= len(idle)
+        for connection in idle:
+            await self.__close_connection(connection)
+        if self.__size <= 0:
+            self.__drained.set()
+            return
+        try:
+            await asyncio.wait_for(self.__drained.wait(), timeout)
+        except TimeoutError:
+            pass
+
+    def __bind_loop(self) -> None:
+        if self.__loop is None:
+            self.__loop = asyncio.get_running_loop()
+
+    async def __wait(self, deadline: float | None) -> tuple[MySQLConnection, float] | None:
+        waiter = self.__loop.create_future()
+        self.__waiters.append(waiter)
+        self.__stats["waited"] += 1
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            await asyncio.wait((waiter,), timeout=remaining)
+        except asyncio.CancelledError:
+            self.__abandon(waiter)
+            raise
+        if not waiter.done():
+            self.__abandon(waiter)
+            self.__stats["timeouts"] += 1
+            raise PoolTimeoutError(f"No free connection in the pool after {self.timeout} seconds (max_size={self.max_size})")
+        return waiter.result()
+
+    def __abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done():
+            if not waiter.cancelled() and waiter.exception() is None:
+                self.__put(waiter.result())
+            return
+        waiter.cancel()
+        try:
+            self.__waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def __put(self, item: tuple[MySQLConnection, float] | None) -> None:
+        # * item is an idle connection or None for a freed slot; the oldest waiter gets it first
+        while self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(item)
+                return
+        if item is None:
+            self.__size -= 1
+            if self.__is_closed and self.__size <= 0:
+                self.__drained.set()
+        else:
+            self.__idle.append(item)
+
+    async def __connect(self) -> MySQLConnection:
+        connection = await mysql_aio.connect(**self.connection_config)
+        self.__stats["created"] += 1
+        return connection
+
+    @staticmethod
+    async def __is_alive(connection: MySQLConnection) -> bool:
+        try:
+            return await connection.is_connected()
+        except Exception:
+            return False
+
+    async def __discard(self, connection: MySQLConnection, counter: str | None = None) -> None:
+        if counter is not None:
+            self.__stats[counter] += 1
+        self.__put(None)
+        await self.__close_connection(connection)
+
+    async def __close_connection(self, connection: MySQLConnection, is_counted: bool = True) -> None:
+        try:
+            if self.on_close is not None:
+                self.on_close(connection)
+            await connection.close()
+        except Exception:
+            pass
+        if is_counted:
+            self.__stats["closed"] += 1
+
+
+class AsyncStatementCache:
+    """Bounded LRU of server-side prepared statements of one connection, keyed by SQL text.\n
+    Every entry is a prepared cursor that keeps its statement allocated on the server;
+    evicted entries are closed, which deallocates the statement.
+    """
+    def __init__(self, connection: MySQLConnection, max_size: int = 100) -> None:
+        self.connection = connection
+        self.max_size = max_size
+        self.__statements: OrderedDict[tuple[str, bool], MySQLCursor] = OrderedDict()
+        self.__stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return len(self.__statements)
+
+    def stats(self) -> dict:
+        return {"size": len(self.__statements), **self.__stats}
+
+    async def get(self, query: str, is_dictionary: bool = False) -> MySQLCursor:
+        """
+        Returns the prepared cursor for `query`, creating it (and evicting the least recently used one) on a miss.\n
+        The statement itself is prepared by the first `execute()` of the returned cursor.
+        """
+        key = (query, is_dictionary)
+        cursor = self.__statements.get(key)
+        if cursor is not None:
+            self.__statements.move_to_end(key)
+            self.__stats["hits"] += 1
+            return cursor
+        self.__stats["misses"] += 1
+        cursor = await self.connection.cursor(prepared=True, dictionary=is_dictionary)
+        self.__statements[key] = cursor
+        while len(self.__statements) > self.max_size:
+            _, evicted = self.__statements.popitem(last=False)
+            self.__stats["evictions"] += 1
+            await self.__close_cursor(evicted)
+        return cursor
+
+    async def discard(self, query: str, is_dictionary: bool = False) -> None:
+        """Closes and forgets the statement for `query`, e.g. after it failed."""
+        cursor = self.__statements.pop((query, is_dictionary), None)
+        if cursor is not None:
+            await self.__close_cursor(cursor)
+
+    async def clear(self) -> None:
+        """Closes all cached statements."""
+        while self.__statements:
+            await self.__close_cursor(self.__statements.popitem()[1])
+
+    @staticmethod
+    async def __close_cursor(cursor: MySQLCursor) -> None:
+        try:
+            await cursor.close()
+        except Exception:
+            pass
+
+
+class AsyncTransaction:
+    """Unit of work of `AsyncWaveSQL.transaction()`: one connection pinned for the whole block.\n
+    Nested blocks are savepoints. Queries log their errors instead of raising them, so a query that fails
+    inside a block marks it failed; the block is then rolled back on exit and `TransactionError` is raised.
+    """
+    def __init__(self, connection: MySQLConnection, cursor: MySQLCursor, database: str | None = None) -> None:
+        self.connection = connection
+        self.cursor = cursor
+        self.database = database
+        self.depth = 0
+        self.is_failed = False
+        self.invalidate_tables: set[str] = set()
+        # * tasks started inside the block inherit it, the connection must not run two queries at once
+        self.lock = asyncio.Lock()
+
+
+_FAN_OUT_DONE = object()
+_FAN_OUT_FAILED = object()
+
+
+async def _fan_out_worker(
+    jobs: Iterator[tuple[int, Awaitable]], results: asyncio.Queue, slots: asyncio.Semaphore,
+    stopped: asyncio.Event, return_exceptions: bool
+) -> None:
+    # * a module-level function on purpose: protected methods awaited from here see no `self` in the caller frame
+    try:
+        while not stopped.is_set():
+            await slots.acquire()
+            job = next(jobs, None)
+            if job is None or stopped.is_set():
+                slots.release()
+                if job is not None and inspect.iscoroutine(job[1]):
+                    job[1].close()
+                break
+            index, call = job
+            try:
+                result = await call
+            except Exception as err:
+                if not return_exceptions:
+                    raise
+                result = err
+            results.put_nowait((index, result))
+    except Exception as err:
+        results.put_nowait((_FAN_OUT_FAILED, err))
+    else:
+        results.put_nowait((_FAN_OUT_DONE, None))
+
+
+_LOG_WRITER_STOP = object()
+
+
+class AsyncLogWriter:
+    """Asyncio task that saves log records in batches.\n
+    Records are put on a bounded `asyncio.Queue`; a dedicated task drains it and hands lists of up to
+    `batch_size` records to `write_batch`, at the latest `flush_interval` seconds after the first record of a batch.
+    When the queue is full `put()` waits (`policy="block"`) or drops the record (`policy="drop"`).
+    The writer is bound to the event loop it was started in; `aclose()` drains pending records,
+    and if the loop cancels the task on shutdown the remaining records are still written.
+
+    Example:\n
+        writer = AsyncLogWriter(write_batch=save_records, batch_size=500)
+        writer.start()
+        await writer.put((1, datetime.now(), "DATABASE", "message", ""))
+        await writer.aclose()
+    """
+    def __init__(
+        self, write_batch: Callable[[list[tuple]], Awaitable[None]],
+        on_error: Callable[[list[tuple], Exception], Awaitable[None]] | None = None,
+        batch_size: int = 100, flush_interval: float = 1.0, queue_size: int = 10000,
+        policy: Literal["block", "drop"] = "block"
+    ) -> None:
+        if policy not in ("block", "drop"):
+            raise ValueError(f"Expected 'policy' to be 'block' or 'drop', but got: {policy!r}")
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError(f"Expected 'batch_size' to be a positive int, but got: {batch_size!r}")
+        self.write_batch = write_batch
+        self.on_error = on_error
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+
+        self.__queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.__task: asyncio.Task | None = None
+        self.__loop: asyncio.AbstractEventLoop | None = None
+        self.__is_closed = False
+        self.__stats = {"queued": 0, "written": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        return self.__loop
+
+    @property
+    def is_running(self) -> bool:
+        return not self.__is_closed and self.__task is not None and not self.__task.done()
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the writer counters.
+
+        Returns:
+            dict: `pending` records in the queue and cumulative `queued`, `written`, `dropped`, `failed` and `batches` counters.
+        """
+        return {"pending": self.__queue.qsize(), **self.__stats}
+
+    def start(self) -> None:
+        """Starts the draining task in the running event loop."""
+        if self.__task is None:
+            self.__loop = asyncio.get_running_loop()
+            self.__task = self.__loop.create_task(self.__run(), name="WaveSQL-AsyncLogWriter")
+
+    async def put(self, record: tuple) -> bool:
+        """
+        Queues a record for writing.
+
+        Args:
+            record (tuple): Values passed to `write_batch`.
+
+        Returns:
+            bool: False if the record was dropped (queue full with `policy="drop"` or writer closed).
+        """
+        if self.__is_closed:
+            self.__stats["dropped"] += 1
+            return False
+        if self.policy == "block":
+            await self.__queue.put(record)
+        else:
+            try:
+                self.__queue.put_nowait(record)
+            except asyncio.QueueFull:
+                self.__stats["dropped"] += 1
+                return False
+        self.__stats["queued"] += 1
+        return True
+
+    async def flush(self, timeout: float | None = None) -> bool:
+        """
+        Waits until every record queued before the call is written.
+
+        Args:
+            timeout (float, optional): Seconds to wait. None waits forever.
+
+        Returns:
+            bool: True if the flush completed in time.
+        """
+        if not self.is_running:
+            return False
+        is_flushed = self.__loop.create_future()
+        await self.__queue.put(is_flushed)
+        try:
+            await asyncio.wait_for(asyncio.shield(is_flushed), timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    async def aclose(self, timeout: float | None = None) -> None:
+        """
+        Writes pending records and stops the draining task.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the task. None waits forever.
+        """
+        if self.__is_closed:
+            return
+        self.__is_closed = True
+        if self.__task is None or self.__task.done():
+            return
+        await self.__queue.put(_LOG_WRITER_STOP)
+        try:
+            await asyncio.wait_for(asyncio.shield(self.__task), timeout)
+        except TimeoutError:
+            pass
+
+    async def __run(self) -> None:
+        batch: list[tuple] = []
+        deadline = 0.0
+        try:
+            while True:
+                try:
+                    if batch:
+                        async with asyncio.timeout_at(deadline):
+                            item = await self.__queue.get()
+                    else:
+                        item = await self.__queue.get()
+                except TimeoutError:
+                    item = None
+
+                # * drain whatever is already queued so a burst of logs becomes one batch
+                while isinstance(item, tuple):
+                    if not batch:
+                        deadline = self.__loop.time() + self.flush_interval
+                    batch.append(item)
+                    if len(batch) >= self.batch_size or self.__queue.empty():
+                        item = None
+                        break
+                    item = self.__queue.get_nowait()
+
+                if item is None and batch and len(batch) < self.batch_size and self.__loop.time() < deadline:
+                    continue
+                await self.__write(batch)
+                batch = []
+
+                if item is _LOG_WRITER_STOP:
+                    return
+                if isinstance(item, asyncio.Future) and not item.done():
+                    item.set_result(True)
+        except asyncio.CancelledError:
+            while not self.__queue.empty():
+                item = self.__queue.get_nowait()
+                if isinstance(item, tuple):
+                    batch.append(item)
+            for i in range(0, len(batch), self.batch_size):
+                await self.__write(batch[i:i + self.batch_size])
+            raise
+
+    async def __write(self, batch: list[tuple]) -> None:
+        if not batch:
+            return
+        try:
+            await self.write_batch(batch)
+            self.__stats["written"] += len(batch)
+            self.__stats["batches"] += 1
+        except Exception as err:
+            self.__stats["failed"] += len(batch)
+            if self.on_error is not None:
+                try:
+                    await self.on_error(batch, err)
+                except Exception:
+                    pass
+
+
 class AsyncWaveSQL:
     """Example:\n
         adb = AsyncWaveSQL(is_dictionary=True, is_console_log=True, is_log_backtrace=True, is_auto_start=True)
         adb.sync_log(level=3, text="All is good!")
         
+    config : dict | str, optional
+            MySQL settings as a dict with a "MYSQL" section, or the path to an .ini file (the bundled `config.ini` by default).
+            The file is read on first use of `config` or `settings` (usually by `start()`), so constructing AsyncWaveSQL does no I/O.
+            The MySQL connector and colorama are imported on first connection and first console print as well.
+
     default_log_level : int, optional
             Logging level indicating the type of message. Default is 1 (INFO).
 
@@ -85,21 +712,116 @@ class AsyncWaveSQL:
             - 7: UNEXPECTED ERROR — an unexpected error (color: RED)
             - 8: ERROR — general error (color: RED)
             - 9: FATAL ERROR — critical error requiring immediate attention (color: LIGHTRED)
+
+    is_pool : bool, optional
+            If True (default), queries, procedures and logs share an `AsyncConnectionPool`
+            (one per database and event loop) instead of opening a new connection for every call.
+            The pool is tuned with `pool_min_size`, `pool_max_size`, `pool_max_idle_time` (seconds, None disables reaping)
+            and `pool_timeout` (seconds a coroutine waits for a free connection, None waits forever).
+            Current counters are available through `pool_stats()`, `await aclose()` closes all pools.
+
+    is_log_writer : bool, optional
+            If True, `log()` only puts the record on an `asyncio.Queue` and prints it to the console from local level data,
+            an `AsyncLogWriter` task saves queued records with one multi-row INSERT per batch.
+            A batch is written every `log_batch_size` records or `log_flush_interval` seconds.
+            When `log_queue_size` records are pending `log()` waits (`log_queue_policy="block"`) or drops the record (`"drop"`).
+            Use `await flush_logs()` to wait for pending records; `await aclose()` drains them.
+
+    is_prepared : bool, optional
+            If True, `_db_query` (and so every method generated from `queries.sql`) runs queries as server-side prepared statements.
+            Each distinct query is prepared once per pooled connection and kept in an `AsyncStatementCache` of `prepared_cache_size` entries;
+            evicted statements are deallocated on the server. Pooled connections then skip the session reset on release,
+            because it would deallocate the cached statements. Counters are available through `statement_cache_stats()`.
+
+    bulk_chunk_size : int, optional
+            Default number of rows `_db_query_many` (and the `*_many` methods generated from `with bulk query` directives)
+            sends per `executemany` call. Multi-row INSERTs are built per chunk, so it bounds the packet size.
+
+    is_result_cache : bool, optional
+            If True, SELECT methods generated from `queries.sql` go through an in-process `ResultCache`
+            (LRU of `result_cache_size` entries, each kept for `result_cache_ttl` seconds, None keeps them until evicted),
+            keyed by query, parameters, fetch mode, dictionary mode and database. Generated INSERT/UPDATE/DELETE methods
+            drop the entries of the tables they write. Writes made in other ways are not seen: call `invalidate_cache()`.
+            Counters are available through `result_cache_stats()`.
+
+    stream_chunk_size : int, optional
+            Number of rows `stream()` reads from the server per round. Rows are only read when the consumer asks for them,
+            so at most one chunk is held in memory and the connection is held until the stream is exhausted or closed.
+
+    is_row_class : bool, optional
+            If True, the Python bridge is generated with a `NamedTuple` row class for every multi-column SELECT in `queries.sql`
+            (`SELECT *` and unnamed columns use a class derived from the cursor at runtime). Generated methods then read tuple rows
+            and return them as these classes (`_db_query(..., row_class=...)`) instead of dicts, keeping attribute access at tuple size.
+
+    log_rate_limit : int, optional
+            If set, `log()` writes at most `log_rate_limit` records per `log_rate_window` seconds for each group of
+            module, level and message fingerprint (the message with numbers replaced by `#`). Further records of the group
+            are coalesced: after the window one summary record is written with `repeat_count` and `last_date` columns.
+            Remaining summaries are written by `aclose()`.
+
+    log_sample_rate : float | dict[int, float], optional
+            Share of records `log()` keeps, for all levels or per level (e.g. `{2: 0.01}` keeps 1% of DEBUG records).
+            Records sampled out are neither saved nor printed. Counters are available through `log_limiter_stats()`.
+
+    is_log_partitioning : bool, optional
+            If True, a new database is created with `logs` and `archived_logs` RANGE-partitioned by day
+            (`sql/partitioning/-1_partition_logs.sql`): the daily `rotate_logs` event moves partitions older than 30 days
+            to `archived_logs` with `EXCHANGE PARTITION` and drops archived ones older than 60 days, instead of copying and deleting rows.
+            `start()` creates partitions for the next `log_partition_days_ahead` days. An existing database is converted with `partition_logs()`.
+
+    log_archive_batch_size : int, optional
+            Rows the `archive_logs` procedure (run daily by the `delete_old_logs` event, or by `archive_logs()`) moves per transaction.
+            Rows older than `log_keep_days` are moved from `logs` to `archived_logs` in primary key order, `log_archive_sleep` seconds apart,
+            then rows older than `log_archive_days` are deleted from `archived_logs` the same way. Progress and metrics of every run
+            are kept in `log_archive_runs`; a run stopped early is resumed from its last batch.
+
+    log_spool_path : Path | str, optional
+            If set, log records that can't be saved (the database is unreachable, a log writer batch lost its connection or, with
+            `log_queue_policy="drop"`, the writer queue is full) are appended to a `LogSpool` in this directory instead of being lost:
+            memory-mapped segment files of `log_spool_segment_size` bytes, flushed to disk every `log_spool_fsync_interval` seconds.
+            While the database is down new records go straight to the spool. Every `log_spool_replay_interval` seconds spooled records
+            are written back to `logs` with one multi-row INSERT per batch, keeping their original timestamps (`replay_log_spool()` does it on demand).
+            Other errors (a rejected record) are reported and not spooled; records rejected on replay are moved to `quarantine.jsonl`.
+
+    is_try_update_db : bool, optional
+            If True, `start()` runs `migrate()` on an existing database: `*_init_*.sql` files numbered 0 and up that are not recorded
+            in `wavesql_migrations` are applied in ascending order under `GET_LOCK` (waiting at most `migration_lock_timeout` seconds),
+            so workers starting at once don't race. When the schema is current this is one indexed lookup and no SQL file is parsed.
+
+    is_try_update_python_bridge : bool, optional
+            With `is_create_python_bridge=True`, if True (default) `start()` regenerates the bridge and rewrites the files whose content changed;
+            if False the bridge is only generated when its files are missing from `run_path`. To skip code generation on start entirely,
+            generate the bridge at build time with `python -m wavesql generate` and keep `is_create_python_bridge=False`.
+
+    is_parse_cache : bool, optional
+            If True (default), `start()` keeps the parsed SQL files and the generated bridge code in `{path_to_sql}/.wavesql_parse_cache.pickle`
+            (`ParseCache`), so a restart with unchanged files doesn't parse them again. A file is parsed again when its content
+            (checked by mtime and size, then by hash), `settings` or the bridge options change. The cache file is not written if the directory is read-only.
     """
     def __init__(
         self, config: dict | str | None = None, path_to_sql: Path | str | None = None, is_dictionary: bool = False,
         is_console_log: bool = False, is_log_backtrace: bool = False, raise_log_on_fail: bool = False,
         is_pprint: bool = False, is_protected: bool = True, is_auto_start: bool = False, is_try_update_db: bool = False,
         is_create_python_bridge: bool = False, is_try_update_python_bridge: bool = True, default_log_sep: str = " ",
-        default_log_module: str = "DATABASE", default_log_level: int | Literal[1, 2, 3, 4, 5, 6, 7, 8, 9] = 1
+        default_log_module: str = "DATABASE", default_log_level: int | Literal[1, 2, 3, 4, 5, 6, 7, 8, 9] = 1,
+        is_pool: bool = True, pool_min_size: int = 1, pool_max_size: int = 10,
+        pool_max_idle_time: float | None = 300.0, pool_timeout: float | None = 30.0,
+        is_log_writer: bool = False, log_batch_size: int = 100, log_flush_interval: float = 1.0,
+        log_queue_size: int = 10000, log_queue_policy: Literal["block", "drop"] = "block",
+        is_prepared: bool = False, prepared_cache_size: int = 100, bulk_chunk_size: int = 1000,
+        stream_chunk_size: int = 1000, is_result_cache: bool = False, result_cache_size: int = 1024,
+        result_cache_ttl: float | None = 60.0, is_row_class: bool = False, log_rate_limit: int | None = None,
+        log_rate_window: float = 60.0, log_sample_rate: float | dict[int, float] = 1.0, is_log_partitioning: bool = False,
+        log_partition_days_ahead: int = 7, log_archive_batch_size: int = 5000,
+        log_archive_sleep: float = 0.1, log_keep_days: int = 30, log_archive_days: int = 60,
+        log_spool_path: Path | str | None = None, log_spool_segment_size: int = 4194304, log_spool_fsync_interval: float = 1.0,
+        log_spool_replay_interval: float = 5.0, is_parse_cache: bool = True, migration_lock_timeout: int = 60
     ) -> None:
-        if not isinstance(config, dict):
-            if config is None:
-                config = CONFIG_PATH
-            self.config = configparser.ConfigParser()
-            self.config.read(config, encoding="utf-8")
-        else:
+        if isinstance(config, dict):
             self.config = config
+        else:
+            # * the file is read by the `config` property on first use
+            self.__config_path = CONFIG_PATH if config is None else config
         if path_to_sql is None:
             self.path_to_sql = PATH_DB_INIT_SCRIPTS
         else:
@@ -142,80 +864,270 @@ class AsyncWaveSQL:
         if not isinstance(default_log_level, int):
             raise TypeError(f"Expected 'default_log_level' to be of type int (worked examples in (1, 2, 3, 4, 5, 6, 7, 8, 9)), but got: {type(default_log_level).__name__}")
         self.default_log_level = default_log_level
+        if not isinstance(is_pool, bool):
+            raise TypeError(f"Expected 'is_pool' to be of type bool (True or False), but got: {type(is_pool).__name__}")
+        self.is_pool = is_pool
+        if not isinstance(pool_min_size, int):
+            raise TypeError(f"Expected 'pool_min_size' to be of type int, but got: {type(pool_min_size).__name__}")
+        self.pool_min_size = pool_min_size
+        if not isinstance(pool_max_size, int):
+            raise TypeError(f"Expected 'pool_max_size' to be of type int, but got: {type(pool_max_size).__name__}")
+        self.pool_max_size = pool_max_size
+        if pool_max_idle_time is not None and not isinstance(pool_max_idle_time, (int, float)):
+            raise TypeError(f"Expected 'pool_max_idle_time' to be of type float or None, but got: {type(pool_max_idle_time).__name__}")
+        self.pool_max_idle_time = pool_max_idle_time
+        if pool_timeout is not None and not isinstance(pool_timeout, (int, float)):
+            raise TypeError(f"Expected 'pool_timeout' to be of type float or None, but got: {type(pool_timeout).__name__}")
+        self.pool_timeout = pool_timeout
+        if not isinstance(is_log_writer, bool):
+            raise TypeError(f"Expected 'is_log_writer' to be of type bool (True or False), but got: {type(is_log_writer).__name__}")
+        self.is_log_writer = is_log_writer
+        if not isinstance(log_batch_size, int):
+            raise TypeError(f"Expected 'log_batch_size' to be of type int, but got: {type(log_batch_size).__name__}")
+        self.log_batch_size = log_batch_size
+        if not isinstance(log_flush_interval, (int, float)):
+            raise TypeError(f"Expected 'log_flush_interval' to be of type float, but got: {type(log_flush_interval).__name__}")
+        self.log_flush_interval = log_flush_interval
+        if not isinstance(log_queue_size, int):
+            raise TypeError(f"Expected 'log_queue_size' to be of type int, but got: {type(log_queue_size).__name__}")
+        self.log_queue_size = log_queue_size
+        if log_queue_policy not in ("block", "drop"):
+            raise ValueError(f"Expected 'log_queue_policy' to be 'block' or 'drop', but got: {log_queue_policy!r}")
+        self.log_queue_policy = log_queue_policy
+        if not isinstance(is_prepared, bool):
+            raise TypeError(f"Expected 'is_prepared' to be of type bool (True or False), but got: {type(is_prepared).__name__}")
+        self.is_prepared = is_prepared
+        if not isinstance(prepared_cache_size, int):
+            raise TypeError(f"Expected 'prepared_cache_size' to be of type int, but got: {type(prepared_cache_size).__name__}")
+        self.prepared_cache_size = prepared_cache_size
+        if not isinstance(bulk_chunk_size, int):
+            raise TypeError(f"Expected 'bulk_chunk_size' to be of type int, but got: {type(bulk_chunk_size).__name__}")
+        if bulk_chunk_size < 1:
+            raise ValueError(f"Expected 'bulk_chunk_size' to be a positive int, but got: {bulk_chunk_size!r}")
+        self.bulk_chunk_size = bulk_chunk_size
+        if not isinstance(stream_chunk_size, int):
+            raise TypeError(f"Expected 'stream_chunk_size' to be of type int, but got: {type(stream_chunk_size).__name__}")
+        if stream_chunk_size < 1:
+            raise ValueError(f"Expected 'stream_chunk_size' to be a positive int, but got: {stream_chunk_size!r}")
+        self.stream_chunk_size = stream_chunk_size
+        if not isinstance(is_result_cache, bool):
+            raise TypeError(f"Expected 'is_result_cache' to be of type bool (True or False), but got: {type(is_result_cache).__name__}")
+        self.is_result_cache = is_result_cache
+        if not isinstance(result_cache_size, int):
+            raise TypeError(f"Expected 'result_cache_size' to be of type int, but got: {type(result_cache_size).__name__}")
+        self.result_cache_size = result_cache_size
+        if result_cache_ttl is not None and not isinstance(result_cache_ttl, (int, float)):
+            raise TypeError(f"Expected 'result_cache_ttl' to be of type float or None, but got: {type(result_cache_ttl).__name__}")
+        self.result_cache_ttl = result_cache_ttl
+        if not isinstance(is_row_class, bool):
+            raise TypeError(f"Expected 'is_row_class' to be of type bool (True or False), but got: {type(is_row_class).__name__}")
+        self.is_row_class = is_row_class
+        if log_rate_limit is not None and not isinstance(log_rate_limit, int):
+            raise TypeError(f"Expected 'log_rate_limit' to be of type int or None, but got: {type(log_rate_limit).__name__}")
+        self.log_rate_limit = log_rate_limit
+        if not isinstance(log_rate_window, (int, float)):
+            raise TypeError(f"Expected 'log_rate_window' to be of type float, but got: {type(log_rate_window).__name__}")
+        self.log_rate_window = log_rate_window
+        if not isinstance(log_sample_rate, (int, float, dict)):
+            raise TypeError(f"Expected 'log_sample_rate' to be of type float or dict[int, float], but got: {type(log_sample_rate).__name__}")
+        self.log_sample_rate = log_sample_rate
+        if not isinstance(is_log_partitioning, bool):
+            raise TypeError(f"Expected 'is_log_partitioning' to be of type bool (True or False), but got: {type(is_log_partitioning).__name__}")
+        self.is_log_partitioning = is_log_partitioning
+        if not isinstance(log_partition_days_ahead, int):
+            raise TypeError(f"Expected 'log_partition_days_ahead' to be of type int, but got: {type(log_partition_days_ahead).__name__}")
+        self.log_partition_days_ahead = log_partition_days_ahead
+        if not isinstance(log_archive_batch_size, int):
+            raise TypeError(f"Expected 'log_archive_batch_size' to be of type int, but got: {type(log_archive_batch_size).__name__}")
+        if log_archive_batch_size < 1:
+            raise ValueError(f"Expected 'log_archive_batch_size' to be a positive int, but got: {log_archive_batch_size!r}")
+        self.log_archive_batch_size = log_archive_batch_size
+        if not isinstance(log_archive_sleep, (int, float)):
+            raise TypeError(f"Expected 'log_archive_sleep' to be of type float, but got: {type(log_archive_sleep).__name__}")
+        self.log_archive_sleep = log_archive_sleep
+        if not isinstance(log_keep_days, int):
+            raise TypeError(f"Expected 'log_keep_days' to be of type int, but got: {type(log_keep_days).__name__}")
+        self.log_keep_days = log_keep_days
+        if not isinstance(log_archive_days, int):
+            raise TypeError(f"Expected 'log_archive_days' to be of type int, but got: {type(log_archive_days).__name__}")
+        self.log_archive_days = log_archive_days
+        if log_spool_path is not None and not isinstance(log_spool_path, (Path, str)):
+            raise TypeError(f"Expected 'log_spool_path' to be of type Path (Path or str) or None, but got: {type(log_spool_path).__name__}")
+        self.log_spool_path = log_spool_path
+        if not isinstance(log_spool_segment_size, int):
+            raise TypeError(f"Expected 'log_spool_segment_size' to be of type int, but got: {type(log_spool_segment_size).__name__}")
+        self.log_spool_segment_size = log_spool_segment_size
+        if not isinstance(log_spool_fsync_interval, (int, float)):
+            raise TypeError(f"Expected 'log_spool_fsync_interval' to be of type float, but got: {type(log_spool_fsync_interval).__name__}")
+        self.log_spool_fsync_interval = log_spool_fsync_interval
+        if not isinstance(log_spool_replay_interval, (int, float)):
+            raise TypeError(f"Expected 'log_spool_replay_interval' to be of type float, but got: {type(log_spool_replay_interval).__name__}")
+        self.log_spool_replay_interval = log_spool_replay_interval
+        if not isinstance(is_parse_cache, bool):
+            raise TypeError(f"Expected 'is_parse_cache' to be of type bool, but got: {type(is_parse_cache).__name__}")
+        self.is_parse_cache = is_parse_cache
+        if not isinstance(migration_lock_timeout, int):
+            raise TypeError(f"Expected 'migration_lock_timeout' to be of type int, but got: {type(migration_lock_timeout).__name__}")
+        self.migration_lock_timeout = migration_lock_timeout
         
         self.__db_init_succsess = False
+        self.__pools: dict[tuple[asyncio.AbstractEventLoop, str | None], AsyncConnectionPool] = {}
+        self.__log_writer: AsyncLogWriter | None = None
+        self.__log_levels: dict[int, dict] = dict(LOG_LEVELS)
+        self.__log_spool = LogSpool(log_spool_path, segment_size=log_spool_segment_size, fsync_interval=log_spool_fsync_interval) if log_spool_path is not None else None
+        self.__log_spool_task: asyncio.Task | None = None
+        self.__is_log_spooling = False
+        self.__log_limiter = LogLimiter(limit=log_rate_limit, window=log_rate_window, sample_rate=log_sample_rate) if log_rate_limit is not None or log_sample_rate != 1.0 else None
+        self.__transaction: contextvars.ContextVar[AsyncTransaction | None] = contextvars.ContextVar(f"wavesql_transaction_{id(self)}", default=None)
+        self.__result_cache = ResultCache(max_size=result_cache_size, ttl=result_cache_ttl) if is_result_cache else None
+        self.__statement_caches: dict[int, AsyncStatementCache] = {}
+        self.__background_lock = threading.Lock()
+        self.__background_loop: asyncio.AbstractEventLoop | None = None
+        self.__background_thread: threading.Thread | None = None
 
         self.run_path: Path = pathlib.Path("/".join(str(sys.argv[0]).replace("\\", "/").split("/")[:-1])).resolve()
         self.local_dir: Path = Path(__file__).parent
         
-        self.settings = {"dbname": self.config["MYSQL"]["database"]}
-        
         # * autorun
         if is_auto_start:
             self.sync_start()
     
-    def run_async(self, coro):
+    def run_async(self, coro: Awaitable, timeout: float | None = None) -> Any:
+        """
+        Runs a coroutine on the background event loop of this instance and waits for its result.\n
+        The loop lives in a daemon thread that is started on the first call and reused by every later one,
+        so the pools, prepared statements and log writer created there survive between sync calls.
+        Safe to call from any number of threads and from code running another event loop.
+
+        Args:
+            coro (Awaitable): Coroutine to run.
+            timeout (float, optional): Seconds to wait for the result. On timeout the coroutine is cancelled. None waits forever.
+
+        Returns:
+            Any: Result of the coroutine.
+
+        Raises:
+            RuntimeError: If called from the background loop itself, where waiting would deadlock.
+            TimeoutError: If `timeout` expired.
+        """
+        loop = self.__get_background_loop()
+        if threading.current_thread() is self.__background_thread:
+            coro.close()
+            raise RuntimeError("run_async() can't be called from the background loop of the instance, await the coroutine instead")
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
         try:
-            loop = asyncio.get_running_loop()
-            task = loop.create_task(coro)
-            return asyncio.run_coroutine_threadsafe(task, loop).result()
-        except RuntimeError:
-            return asyncio.run(coro)
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def __get_background_loop(self) -> asyncio.AbstractEventLoop:
+        with self.__background_lock:
+            if self.__background_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name=f"wavesql-loop-{id(self):x}", daemon=True)
+                thread.start()
+                self.__background_loop, self.__background_thread = loop, thread
+                # * daemon threads are killed at exit, drain queued logs and close connections before that
+                atexit.register(self.sync_close)
+            return self.__background_loop
+
+    def sync_close(self, timeout: float | None = None) -> None:
+        """
+        Runs `aclose()` on the background loop, then stops the loop and joins its thread.\n
+        Called automatically at interpreter exit. A later sync call starts a new background loop.
+
+        Args:
+            timeout (float, optional): Passed to `aclose()`.
+        """
+        with self.__background_lock:
+            loop, thread = self.__background_loop, self.__background_thread
+            self.__background_loop = self.__background_thread = None
+        if loop is None:
+            return
+        atexit.unregister(self.sync_close)
+        if threading.current_thread() is thread:
+            raise RuntimeError("sync_close() can't be called from the background loop of the instance, await aclose() instead")
+        try:
+            asyncio.run_coroutine_threadsafe(self.aclose(timeout=timeout), loop).result()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
     
+    @functools.cached_property
+    def config(self) -> dict | configparser.ConfigParser:
+        """Settings read from the .ini file given to `__init__` on first use, constructing AsyncWaveSQL doesn't touch the disk."""
+        config = configparser.ConfigParser()
+        config.read(self.__config_path, encoding="utf-8")
+        return config
+
+    @functools.cached_property
+    def settings(self) -> dict:
+        return {"dbname": self.config["MYSQL"]["database"]}
+
     @staticmethod
     def __protected(method):
+        if inspect.isasyncgenfunction(method):
+            # * async generators are checked when they are created, the caller frame is gone by the first `__anext__`
+            @functools.wraps(method)
+            def generator_wrapper(self, *args, **kwargs):
+                if self.is_protected:
+                    caller_self = sys._getframe(1).f_locals.get('self')
+
+                    if caller_self is None or not isinstance(caller_self, self.__class__):
+                        raise PermissionError(f"Async method '{method.__name__}' is protected and cannot be called from outside")
+
+                return method(self, *args, **kwargs)
+
+            return generator_wrapper
+
         @functools.wraps(method)
         async def wrapper(self, *args, **kwargs):
-            caller_frame = inspect.stack()[1].frame
-            caller_self = caller_frame.f_locals.get('self')
+            if self.is_protected:
+                # * only the direct caller is inspected, inspect.stack() would build frame info for the whole stack
+                caller_self = sys._getframe(1).f_locals.get('self')
 
-            if caller_self is not None and isinstance(caller_self, self.__class__):
-                return await method(self, *args, **kwargs)
+                if caller_self is not None and isinstance(caller_self, self.__class__):
+                    return await method(self, *args, **kwargs)
 
-            raise PermissionError(f"Async method '{method.__name__}' is protected and cannot be called from outside")
+                raise PermissionError(f"Async method '{method.__name__}' is protected and cannot be called from outside")
+
+            return await method(self, *args, **kwargs)
         
         return wrapper
     
     async def start(self) -> None:
-        all_sql_paths = sorted(self.path_to_sql.rglob("*_init_*.sql"), key=lambda x: int(Path(x).name.split("_")[0]))
-        # required_files = {"0_init_db.sql", "1_init_logs.sql"}
-        dir_path = self.local_dir / "sql"
-        required_files = {f.name for f in dir_path.rglob('*') if f.is_file()}
-        
-        found_filenames = {p.name for p in all_sql_paths}
-        missing_files = required_files - found_filenames
-        sql_file_objects = []
-        if missing_files:
-            local_sql_dir = self.local_dir / "sql"
-            if not local_sql_dir.exists():
-                raise FileNotFoundError(f"Local folder with default SQL files not found: {local_sql_dir}")
-            for file_name in missing_files:
-                src_file = local_sql_dir / file_name
-                dest_file = self.path_to_sql / file_name
-                if not src_file.exists():
-                    raise FileNotFoundError(f"Local file missing: {src_file}")
-                
-                dest_file.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy(src_file, dest_file)
-                await self.__print_log(backtrace=None, def_level="INFO", def_color="CYAN", def_module="DATABASE", def_msg=f"Copied file {file_name} from local folder to {dest_file}", is_raise_on_fail=False)
-        else:
-            await self.__print_log(backtrace=None, def_level="INFO", def_color="CYAN", def_module="DATABASE", def_msg="All required SQL files found in the user path.", is_raise_on_fail=False)
-            
-        all_sql_paths = sorted(self.path_to_sql.rglob("*_init_*.sql"), key=lambda x: int(Path(x).name.split("_")[0]))
-        sql_file_objects.extend([SqlFileObject(path=i, dict_of_values=self.settings) for i in all_sql_paths])
+        parse_cache = ParseCache(self.path_to_sql / PARSE_CACHE_NAME) if self.is_parse_cache else None
+        await self.__copy_missing_sql_files()
+        # * init scripts are parsed only to create the database or to generate the bridge, a warm start doesn't touch them
+        sql_file_objects: list[SqlFileObject] | None = None
         
         try:
-            cnx = await connect(**self.config["MYSQL"])
+            if self.is_pool:
+                pool = self.__get_pool()
+                await pool.release(await pool.acquire())
+                await pool.fill()
+            else:
+                cnx = await mysql_aio.connect(**self.config["MYSQL"])
+                await cnx.close()
+            try:
+                await self.upgrade_logs()
+            except MigrationError as ex:
+                await self.__print_log(backtrace=ex, def_level="WARNING", def_color="YELLOW", def_module="DATABASE", def_msg="The log schema was not upgraded, run upgrade_logs()", is_raise_on_fail=False)
             if self.is_try_update_db:
-                # TODO write db update
-                pass
-            await cnx.close()
+                try:
+                    await self.migrate()
+                except MigrationError as ex:
+                    await self.log(level=8, text="Error updating the database:", err=ex, is_console_log=True, is_log_backtrace=True)
+                    raise
             
             await self.log(level=1, text="Initializing skipped!")
-        except mysql.connector.Error as err:
-            if err.errno == ER_BAD_DB_ERROR:
+        except mysql_connector.Error as err:
+            if err.errno == errorcode.ER_BAD_DB_ERROR:
                 try:
-                    connection = await connect(
+                    sql_file_objects = await self.__get_sql_file_objects(parse_cache=parse_cache, is_create_python=self.is_create_python_bridge)
+                    connection = await mysql_aio.connect(
                         host=self.config["MYSQL"]["host"],
                         user=self.config["MYSQL"]["user"],
                         password=self.config["MYSQL"]["password"]
@@ -244,6 +1156,8 @@ class AsyncWaveSQL:
                     await connection.commit()
                     await cursor.close()
                     await connection.close()
+                    # * records the files just run as applied
+                    await self.migrate()
                 except Exception as ex:
                     try:
                         await self.log(level=8, text="Error initializing the database:", err=ex, is_console_log=True, is_log_backtrace=True, is_raise_on_fail=True)
@@ -251,51 +1165,328 @@ class AsyncWaveSQL:
                         await self.__print_log(backtrace=ex, def_module="DATABASE", def_msg="Error initializing the database:", is_raise_on_fail=True)
                 await self.log(level=3, text="Database initialized!")
                 
-        if self.is_create_python_bridge:
-            queries_path = self.path_to_sql / "queries.sql"
-            if os.path.exists(queries_path):
-                files = read_files_to_vars(directory=self.local_dir / "python")
-                
-                query_file = SqlFileQueries(path=queries_path, create_python=self.is_create_python_bridge, is_dictionary_default=self.is_dictionary, dict_of_values=self.settings)
-                
-                sql_queries_sync_lst = []
-                sql_queries_async_lst = []
-                
-                for sql_file in sql_file_objects:
-                    for sql_object in sql_file.sql_objects:
-                        if sql_object.can_python:
-                            sql_queries_sync_lst.append(sql_object.sync_python_code)
-                            sql_queries_async_lst.append(sql_object.async_python_code)
-                
-                for sql_query in query_file.sql_queries:
-                    if sql_query.can_python:
-                        sql_queries_sync_lst.append(sql_query.sync_python_code)
-                        sql_queries_async_lst.append(sql_query.async_python_code)
-                        
-                files["database.py"] += "\n" + "\n\n".join(sql_queries_sync_lst) + "\n\n\n" + 'db = WaveSQL(is_dictionary=True, is_console_log=True, is_log_backtrace=True, is_auto_start=True)\ndb.log(level=3, text="All is good!")\n'
-                files["asyncdatabase.py"] += "\n" + "\n\n".join(sql_queries_async_lst) + "\n\n\n" + 'async_db = AsyncWaveSQL(is_dictionary=True, is_console_log=True, is_log_backtrace=True, is_auto_start=True)\nasync_db.sync_log(level=3, text="All is good!")\n'
-                
-                for filename, content in files.items():
-                    file_path = self.run_path / filename
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
+        if self.is_log_partitioning:
+            try:
+                await self.add_log_partitions()
+            except Exception as ex:
+                await self.__print_log(backtrace=ex, def_level="WARNING", def_color="YELLOW", def_module="DATABASE", def_msg="Log partitions were not created, convert an existing database with partition_logs()", is_raise_on_fail=False)
+
+        try:
+            await self.__load_log_levels()
+        except Exception as ex:
+            await self.__print_log(backtrace=ex, def_level="WARNING", def_color="YELLOW", def_module="DATABASE", def_msg="Log levels were not loaded, the default ones are used", is_raise_on_fail=False)
+
+        if self.__log_spool is not None and await self.__has_spooled_logs() and (self.__log_spool_task is None or self.__log_spool_task.done()):
+            # * records spooled by a previous process
+            self.__log_spool_task = asyncio.get_running_loop().create_task(self.__run_log_spool_replay())
+
+        if self.is_create_python_bridge and (self.__is_try_update_python_bridge or not self.__has_python_bridge(self.run_path)):
+            if sql_file_objects is None:
+                sql_file_objects = await self.__get_sql_file_objects(parse_cache=parse_cache, is_create_python=self.is_create_python_bridge)
+            files = self.__get_python_bridge_files(sql_file_objects=sql_file_objects, parse_cache=parse_cache)
+            if files is not None:
+                write_changed_files(directory=self.run_path, files=files)
+
+        if parse_cache is not None:
+            parse_cache.save()
 
         await self.log(level=3, text="All is good !")
 
+    async def generate_python_bridge(self, output_path: Path | str | None = None) -> list[Path]:
+        """
+        Generates the Python bridge (`database.py`, `asyncdatabase.py`, `sync.py`, `aio.py`) from `path_to_sql` without connecting
+        to the database and writes the files whose content changed, like `python -m wavesql generate` does at build time,
+        so processes can run with `is_create_python_bridge=False` and skip code generation on start.
+
+        Args:
+            output_path (Path | str, optional): Directory the files are written to, `run_path` by default.
+
+        Returns:
+            list[Path]: Files that were written; empty if the bridge was up to date.
+
+        Raises:
+            FileNotFoundError: If there is no `queries.sql` in `path_to_sql`.
+        """
+        await self.__copy_missing_sql_files()
+        parse_cache = ParseCache(self.path_to_sql / PARSE_CACHE_NAME) if self.is_parse_cache else None
+        sql_file_objects = await self.__get_sql_file_objects(parse_cache=parse_cache, is_create_python=True)
+        files = self.__get_python_bridge_files(sql_file_objects=sql_file_objects, parse_cache=parse_cache)
+        if parse_cache is not None:
+            parse_cache.save()
+        if files is None:
+            raise FileNotFoundError(f"File not found: {self.path_to_sql / 'queries.sql'}")
+        return write_changed_files(directory=self.run_path if output_path is None else Path(output_path), files=files)
+
+    async def __copy_missing_sql_files(self) -> None:
+        import shutil
+        all_sql_paths = sorted(self.path_to_sql.rglob("*_init_*.sql"), key=lambda x: int(Path(x).name.split("_")[0]))
+        # required_files = {"0_init_db.sql", "1_init_logs.sql"}
+        dir_path = self.local_dir / "sql"
+        # * optional scripts (sql/partitioning) are applied on demand, not copied with the init ones
+        required_files = {f.name for f in dir_path.glob("*_init_*.sql")}
+        
+        found_filenames = {p.name for p in all_sql_paths}
+        missing_files = required_files - found_filenames
+        if missing_files:
+            local_sql_dir = self.local_dir / "sql"
+            if not local_sql_dir.exists():
+                raise FileNotFoundError(f"Local folder with default SQL files not found: {local_sql_dir}")
+            for file_name in missing_files:
+                src_file = local_sql_dir / file_name
+                dest_file = self.path_to_sql / file_name
+                if not src_file.exists():
+                    raise FileNotFoundError(f"Local file missing: {src_file}")
+                
+                dest_file.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy(src_file, dest_file)
+                await self.__print_log(backtrace=None, def_level="INFO", def_color="CYAN", def_module="DATABASE", def_msg=f"Copied file {file_name} from local folder to {dest_file}", is_raise_on_fail=False)
+        else:
+            await self.__print_log(backtrace=None, def_level="INFO", def_color="CYAN", def_module="DATABASE", def_msg="All required SQL files found in the user path.", is_raise_on_fail=False)
+
+    async def __get_sql_file_objects(self, parse_cache: ParseCache | None, is_create_python: bool) -> list[SqlFileObject]:
+        sql_file_objects: list[SqlFileObject] = []
+        all_sql_paths = sorted(self.path_to_sql.rglob("*_init_*.sql"), key=lambda x: int(Path(x).name.split("_")[0]))
+        sql_file_objects.extend([SqlFileObject(path=i, dict_of_values=self.settings, is_create_python=is_create_python, parse_cache=parse_cache) for i in all_sql_paths])
+        if self.is_log_partitioning:
+            sql_file_objects.append(SqlFileObject(path=PATH_LOG_PARTITIONING_SCRIPT, dict_of_values=self.settings, parse_cache=parse_cache))
+        return sql_file_objects
+
+    def __get_python_bridge_files(self, sql_file_objects: list[SqlFileObject], parse_cache: ParseCache | None) -> dict[str, str] | None:
+        queries_path = self.path_to_sql / "queries.sql"
+        if not os.path.exists(queries_path):
+            return None
+        files = read_files_to_vars(directory=self.local_dir / "python")
+
+        query_file = SqlFileQueries(path=queries_path, create_python=True, is_dictionary_default=self.is_dictionary, dict_of_values=self.settings, is_row_class=self.is_row_class, parse_cache=parse_cache)
+
+        sql_queries_sync_lst = []
+        sql_queries_async_lst = []
+
+        for sql_file in sql_file_objects:
+            for sql_object in sql_file.sql_objects:
+                if sql_object.can_python:
+                    sql_queries_sync_lst.append(sql_object.sync_python_code)
+                    sql_queries_async_lst.append(sql_object.async_python_code)
+
+        for sql_query in query_file.sql_queries:
+            if sql_query.can_python:
+                sql_queries_sync_lst.append(sql_query.sync_python_code)
+                sql_queries_async_lst.append(sql_query.async_python_code)
+
+        files["database.py"] += "\n" + "\n\n".join(sql_queries_sync_lst) + "\n\n\n" + 'db = WaveSQL(is_dictionary=True, is_console_log=True, is_log_backtrace=True, is_auto_start=True)\ndb.log(level=3, text="All is good!")\n'
+        files["asyncdatabase.py"] += "\n" + "\n\n".join(sql_queries_async_lst) + "\n\n\n" + 'async_db = AsyncWaveSQL(is_dictionary=True, is_console_log=True, is_log_backtrace=True, is_auto_start=True)\nasync_db.sync_log(level=3, text="All is good!")\n'
+        return files
+
+    def __has_python_bridge(self, directory: Path) -> bool:
+        return all((directory / file_path.name).exists() for file_path in (self.local_dir / "python").glob("*.py"))
+
     def sync_start(self) -> None:
         self.run_async(self.start())
 
+    def __get_pool(self, database: str | None = None) -> AsyncConnectionPool:
+        loop = asyncio.get_running_loop()
+        pool = self.__pools.get((loop, database))
+        if pool is None or pool.is_closed:
+            # * connections can't outlive their event loop, so every loop (the background one, the caller's) keeps its own pool;
+            # * pools of loops closed since then can't be closed anymore, their connections died with the loop
+            for key in [key for key in list(self.__pools) if key[0].is_closed()]:
+                self.__pools.pop(key, None)
+            mysql_config = dict(self.config["MYSQL"])
+            if database is not None:
+                mysql_config["database"] = database
+            pool = AsyncConnectionPool(
+                connection_config={**mysql_config, "use_unicode": True}, min_size=self.pool_min_size,
+                max_size=self.pool_max_size, max_idle_time=self.pool_max_idle_time, timeout=self.pool_timeout,
+                is_reset_session=not self.is_prepared, on_close=self.__drop_statement_cache
+            )
+            self.__pools[(loop, database)] = pool
+        return pool
+
+    def pool_stats(self) -> dict[str | None, dict]:
+        """
+        Returns statistics of every connection pool created by this instance.
+        Counters of the pools of one database on different event loops are added up.
+
+        Returns:
+            dict[str | None, dict]: `AsyncConnectionPool.stats()` keyed by database name (None for the database from config).
+        """
+        stats = {}
+        for (_, database), pool in list(self.__pools.items()):
+            pool_stats = pool.stats()
+            if database in stats:
+                pool_stats = {key: value if key in ("min_size", "max_size") else stats[database][key] + value for key, value in pool_stats.items()}
+            stats[database] = pool_stats
+        return stats
+
+    def __get_statement_cache(self, connection: MySQLConnection) -> AsyncStatementCache:
+        # * keyed by id(): the entry is dropped by `__drop_statement_cache` before the connection is closed
+        statement_cache = self.__statement_caches.get(id(connection))
+        if statement_cache is None:
+            statement_cache = AsyncStatementCache(connection, max_size=self.prepared_cache_size)
+            self.__statement_caches[id(connection)] = statement_cache
+        return statement_cache
+
+    def __drop_statement_cache(self, connection: MySQLConnection) -> None:
+        self.__statement_caches.pop(id(connection), None)
+
+    @contextlib.asynccontextmanager
+    async def transaction(self, database: str | None = None) -> AsyncIterator[AsyncTransaction]:
+        """
+        Pins one connection for the block and commits once at the end.\n
+        `_db_query`, `_db_query_many`, `_db_call_procedure` and every generated method called inside the block,
+        directly or from nested calls, run on that connection (the active transaction is kept in a context variable).
+        Nested blocks create savepoints. If the block raises or a query inside it failed, the block is rolled back
+        (to its savepoint when nested). Queries for another `database`, streams and logs are not part of the transaction,
+        cached results are bypassed inside it and invalidated on commit.
+
+        Example:
+            async with adb.transaction():
+                await adb.add_user(name="Alice")
+                await adb.add_order(user_id=1)
+
+        Args:
+            database (str, optional): Target database name. Defaults to config value.
+
+        Yields:
+            AsyncTransaction: The active transaction.
+
+        Raises:
+            TransactionError: If a query inside the block failed, or a nested block targets another database.
+        """
+        transaction = self.__transaction.get()
+        if transaction is None:
+            connection, cursor = await self.__db_connect(database)
+            transaction = AsyncTransaction(connection, cursor, database)
+            token = self.__transaction.set(transaction)
+            is_committed = False
+            try:
+                await connection.start_transaction()
+                yield transaction
+                if not transaction.is_failed:
+                    await connection.commit()
+                    is_committed = True
+            finally:
+                self.__transaction.reset(token)
+                if not is_committed:
+                    try:
+                        await connection.rollback()
+                    except Exception:
+                        pass
+                await self.__db_release(connection, cursor, database)
+            if not is_committed:
+                raise TransactionError("The transaction was rolled back because a query inside it failed")
+            if transaction.invalidate_tables and self.__result_cache is not None:
+                self.__result_cache.invalidate(transaction.invalidate_tables)
+            return
+
+        if transaction.database != database:
+            raise TransactionError(f"Cannot nest a transaction for database {database!r} inside a transaction for {transaction.database!r}")
+        transaction.depth += 1
+        savepoint = f"wavesql_savepoint_{transaction.depth}"
+        is_outer_failed, transaction.is_failed = transaction.is_failed, False
+        is_released = False
+        try:
+            async with transaction.lock:
+                await transaction.cursor.execute(f"SAVEPOINT {savepoint}")
+            yield transaction
+            if not transaction.is_failed:
+                async with transaction.lock:
+                    await transaction.cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+                is_released = True
+        finally:
+            if not is_released:
+                try:
+                    async with transaction.lock:
+                        await transaction.cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                except Exception:
+                    is_outer_failed = True
+            transaction.depth -= 1
+            transaction.is_failed = is_outer_failed
+        if not is_released:
+            raise TransactionError(f"Savepoint {savepoint} was rolled back because a query inside it failed")
+
+    def result_cache_stats(self) -> dict:
+        """
+        Returns the counters of the result cache.
+
+        Returns:
+            dict: `size`, `max_size` and cumulative `hits`, `misses`, `evictions`, `expirations` and `invalidations`,
+                or an empty dict if `is_result_cache` is False.
+        """
+        if self.__result_cache is None:
+            return {}
+        return self.__result_cache.stats()
+
+    def invalidate_cache(self, *tables: str) -> int:
+        """
+        Drops cached results of SELECTs that read any of `tables`, or all cached results if no table is given.\n
+        Use it after writes the result cache cannot see, e.g. stored procedures or other applications.
+
+        Returns:
+            int: Number of dropped entries.
+        """
+        if self.__result_cache is None:
+            return 0
+        return self.__result_cache.invalidate(tables or None)
+
+    def statement_cache_stats(self) -> dict:
+        """
+        Returns prepared statement counters summed over all live connections.
+
+        Returns:
+            dict: `connections` with a cache, cached `size` and cumulative `hits`, `misses` and `evictions`.
+        """
+        statement_caches = list(self.__statement_caches.values())
+        stats = {"connections": len(statement_caches), "size": 0, "hits": 0, "misses": 0, "evictions": 0}
+        for statement_cache in statement_caches:
+            for key, value in statement_cache.stats().items():
+                stats[key] += value
+        return stats
+
+    async def aclose(self, timeout: float | None = None) -> None:
+        """
+        Drains the log writer and gracefully closes all connection pools of this instance. New pools are created on the next query.
+        Pools of other event loops that are still running are closed on their own loop, without waiting for them.
+
+        Args:
+            timeout (float, optional): Seconds to wait for pending logs and for connections in use to be released. None waits forever.
+        """
+        if self.__log_limiter is not None:
+            await self.__save_log_summaries(is_force=True)
+        log_spool_task, self.__log_spool_task = self.__log_spool_task, None
+        if log_spool_task is not None and log_spool_task.get_loop() is asyncio.get_running_loop():
+            log_spool_task.cancel()
+        log_writer, self.__log_writer = self.__log_writer, None
+        if log_writer is not None and log_writer.loop is asyncio.get_running_loop():
+            await log_writer.aclose(timeout=timeout)
+        loop = asyncio.get_running_loop()
+        pools = list(self.__pools.items())
+        self.__pools.clear()
+        for (pool_loop, _), pool in pools:
+            if pool_loop is loop:
+                await pool.aclose(timeout=timeout)
+            elif pool_loop.is_running():
+                # * not awaited: that loop's thread may itself be blocked waiting for this call (`sync_close()`)
+                asyncio.run_coroutine_threadsafe(pool.aclose(timeout=timeout), pool_loop)
+        if self.__log_spool is not None:
+            await asyncio.to_thread(self.__log_spool.close)
+
     async def __db_connect(
         self,
         database: str | None = None,
-        is_dictionary: bool | None = None
+        is_dictionary: bool | None = None,
+        prepared_query: str | None = None,
+        is_buffered: bool = True
     ) -> tuple[MySQLConnection, MySQLCursor]:
         """
-        Establishes a connection to the MySQL database and returns a connection and cursor.
+        Takes a connection from the pool (or establishes a new one if `is_pool` is False) and returns a connection and cursor.
 
         Args:
             database (str, optional): Name of the target database. If None, the default from config is used.
             is_dictionary (bool, optional): If True, returns rows as dictionaries. If None, uses instance default.
+            prepared_query (str, optional): If given, the cursor is the cached prepared statement of this query
+                on the taken connection. It must not be closed by the caller.
+            is_buffered (bool, optional): If False, the cursor reads rows from the server on demand.
 
         Returns:
             tuple[MySQLConnection, MySQLCursor]:
@@ -307,19 +1498,43 @@ class AsyncWaveSQL:
         """
         if is_dictionary is None:
             is_dictionary = self.is_dictionary
-            
+
+        transaction = self.__transaction.get()
+        if transaction is not None and transaction.database == database and is_buffered:
+            await transaction.lock.acquire()
+            try:
+                if prepared_query is not None:
+                    cursor = await self.__get_statement_cache(transaction.connection).get(prepared_query, is_dictionary)
+                else:
+                    cursor = await transaction.connection.cursor(buffered=True, dictionary=is_dictionary)
+            except Exception:
+                transaction.lock.release()
+                raise
+            return transaction.connection, cursor
+
         try:
             if database is not None:
                 if not isinstance(database, str):
                     raise TypeError
 
-                mysql_config = copy.deepcopy(self.config["MYSQL"])
-                mysql_config["database"] = database
+            if self.is_pool:
+                connection = await self.__get_pool(database).acquire()
             else:
-                mysql_config = self.config["MYSQL"]
+                if database is not None:
+                    mysql_config = copy.deepcopy(self.config["MYSQL"])
+                    mysql_config["database"] = database
+                else:
+                    mysql_config = self.config["MYSQL"]
 
-            connection = await connect(**mysql_config, use_unicode=True)
-            cursor = await connection.cursor(buffered=True, dictionary=is_dictionary)
+                connection = await mysql_aio.connect(**mysql_config, use_unicode=True)
+            try:
+                if prepared_query is not None:
+                    cursor = await self.__get_statement_cache(connection).get(prepared_query, is_dictionary)
+                else:
+                    cursor = await connection.cursor(buffered=is_buffered, dictionary=is_dictionary)
+            except Exception:
+                await self.__db_release(connection, database=database)
+                raise
             
             self.__db_init_succsess = True
 
@@ -335,43 +1550,137 @@ class AsyncWaveSQL:
                         is_console_log=True
                     )
                 else:
+                    init_console()
                     print(LOG_COLORS["LIGHTRED"] + f"[{datetime.now().strftime("%d-%m-%Y %H:%M:%S")}] [ERROR] [DATABASE] DB_CONNECT: {database}")
             raise err
 
+    async def __db_release(
+        self, connection: MySQLConnection, cursor: MySQLCursor | None = None,
+        database: str | None = None, is_broken: bool = False
+    ) -> None:
+        transaction = self.__transaction.get()
+        if transaction is not None and transaction.connection is connection:
+            try:
+                if cursor is not None:
+                    await cursor.close()
+            finally:
+                transaction.lock.release()
+            return
+        try:
+            if is_broken:
+                # * closing the socket is cheaper than reading the rest of an unbuffered result
+                await connection.shutdown()
+            elif cursor is not None:
+                await cursor.close()
+        finally:
+            pool = self.__pools.get((asyncio.get_running_loop(), database)) if self.is_pool else None
+            if pool is not None:
+                await pool.release(connection, is_broken=is_broken)
+            else:
+                self.__drop_statement_cache(connection)
+                await connection.close()
+
+    async def __db_commit(self, connection: MySQLConnection) -> None:
+        transaction = self.__transaction.get()
+        if transaction is None or transaction.connection is not connection:
+            await connection.commit()
+
+    async def __db_rollback(self, connection: MySQLConnection) -> None:
+        transaction = self.__transaction.get()
+        if transaction is not None and transaction.connection is connection:
+            transaction.is_failed = True
+            return
+        try:
+            await connection.rollback()
+        except Exception:
+            pass
+
+    def __invalidate_tables(self, connection: MySQLConnection, tables: tuple[str, ...]) -> None:
+        transaction = self.__transaction.get()
+        if transaction is not None and transaction.connection is connection:
+            # * other connections must not cache the old rows again before the commit
+            transaction.invalidate_tables.update(tables)
+        else:
+            self.__result_cache.invalidate(tables)
+
     @__protected
     async def _db_query(
         self,
         query: str,
         inputs: tuple | Any = (),
-        fetch: Literal[0, 1, 2] = 0,
+        fetch: Literal[0, 1, 2, 4, "scalar", "column"] = 0,
         database: str | None = None,
-        is_dictionary: bool | None = None
-    ) -> None | list[tuple] | list[dict] | tuple | dict:
+        is_dictionary: bool | None = None,
+        is_prepared: bool | None = None,
+        chunk_size: int | None = None,
+        cache_tables: tuple[str, ...] | None = None,
+        invalidate_tables: tuple[str, ...] | None = None,
+        row_class: type[tuple] | bool | None = None
+    ) -> None | list[tuple] | list[dict] | tuple | dict | dict[str, Any] | Any:
         """
         Executes a SQL query with optional input parameters and fetch mode.
 
         Args:
             query (str): SQL query string to be executed.
             inputs (tuple or Any, optional): Parameters to pass with the query. Defaults to ().
-            fetch (Literal[0, 1, 2], optional) Result retrieval mode
+            fetch (Literal[0, 1, 2, 4, "scalar", "column"], optional) Result retrieval mode
             - 0: Return None (no data expected).
             - 1: Return a single row.
             - 2: Return all rows.
+            - 4: Return the columns of all rows (see `ColumnBuilder`). Rows are read from an unbuffered cursor.
+            - "scalar": Return the first column of the first row (None if there are no rows).
+            - "column": Return a list of the first column of all rows.
             ---------------------
             database (str, optional): Target database name. Defaults to config value.
             is_dictionary (bool, optional): If True, results are returned as dicts. If False, as tuples. If None using default value `self.is_dictionary`.
+            is_prepared (bool, optional): If True, the query runs as a cached server-side prepared statement. If None using default value `self.is_prepared`.
+                Ignored for fetch = 4.
+            chunk_size (int, optional): For fetch = 4, number of rows read and converted per round. Defaults to `self.stream_chunk_size`.
+            cache_tables (tuple[str, ...], optional): Tables a fetch = 1/2/"scalar"/"column" query reads. If given and `is_result_cache` is True,
+                the result is served from and stored in the result cache.
+            invalidate_tables (tuple[str, ...], optional): Tables the query writes. Their cached results are dropped after the commit.
+            row_class (type[tuple] | bool, optional): For fetch = 1/2, rows are read from a tuple cursor and returned as instances
+                of this tuple subclass (e.g. a `NamedTuple`) instead of dicts/tuples. True uses a named tuple class derived from
+                the column names of the result. Overrides `is_dictionary`.
 
         Returns
         ------------------
-        None | tuple | dict | list[tuple] | list[dict]:
+        None | tuple | dict | list[tuple] | list[dict] | dict[str, Any] | Any:
             - None: if fetch = 0,
             - tuple/dict: if fetch = 1,
-            - list of tuple/dict: if fetch = 2
+            - list of tuple/dict: if fetch = 2,
+            - column name -> NumPy array (`array.array` or list without NumPy): if fetch = 4,
+            - a single value: if fetch = "scalar",
+            - list of values: if fetch = "column".
 
         Raises:
             Exception: Any error raised during SQL execution, re-raised after logging.
         """
-        connection, cursor = await self.__db_connect(database, is_dictionary)
+        if fetch == 4:
+            return await self.__db_columns(query, inputs, database, chunk_size)
+        if is_prepared is None:
+            is_prepared = self.is_prepared
+        if row_class or fetch in ("scalar", "column"):
+            is_dictionary = False
+        elif is_dictionary is None:
+            is_dictionary = self.is_dictionary
+        cache_key = None
+        if cache_tables and self.__result_cache is not None and fetch in (1, 2, "scalar", "column") and self.__transaction.get() is None:
+            cache_key = (query, inputs, fetch, is_dictionary, database, row_class)
+            try:
+                is_hit, cached_result, cache_generation = self.__result_cache.get(cache_key)
+            except TypeError:
+                # * unhashable parameters, the query is simply not cached
+                cache_key = None
+            else:
+                if is_hit:
+                    return cached_result
+        if is_prepared:
+            # * prepared cursors only reuse their statement for the very same string object
+            query = sys.intern(query)
+            connection, cursor = await self.__db_connect(database, is_dictionary, prepared_query=query)
+        else:
+            connection, cursor = await self.__db_connect(database, is_dictionary)
         result = None
 
         try:
@@ -384,9 +1693,29 @@ class AsyncWaveSQL:
                 result = await cursor.fetchone()
             elif fetch == 2:
                 result = await cursor.fetchall()
+            elif fetch == "scalar":
+                row = await cursor.fetchone()
+                result = None if row is None else row[0]
+            elif fetch == "column":
+                result = [row[0] for row in await cursor.fetchall()]
+            if row_class and fetch in (1, 2):
+                row_type = resolve_row_class(row_class, cursor.column_names)
+                result = make_row(row_type, result) if fetch == 1 else make_rows(row_type, result)
+            if is_prepared and fetch not in (2, "column") and cursor.with_rows:
+                # * prepared cursors are unbuffered, the rest of the result must be read before the connection is reused
+                await cursor.fetchall()
 
-            await connection.commit()
+            await self.__db_commit(connection)
+            if cache_key is not None:
+                self.__result_cache.set(cache_key, result, cache_tables, cache_generation)
+            elif invalidate_tables and self.__result_cache is not None:
+                self.__invalidate_tables(connection, invalidate_tables)
         except Exception as err:
+            await self.__db_rollback(connection)
+            if is_prepared:
+                await self.__get_statement_cache(connection).discard(query, is_dictionary)
+            await self.__db_release(connection, None if is_prepared else cursor, database)
+            connection = None
             await self.log(
                 level=8,
                 module="DATABASE",
@@ -396,8 +1725,310 @@ class AsyncWaveSQL:
             )
             raise err
         finally:
-            await cursor.close()
-            await connection.close()
+            if connection is not None:
+                await self.__db_release(connection, None if is_prepared else cursor, database)
+            return result
+
+    async def stream(
+        self,
+        query: str,
+        inputs: tuple | Any = (),
+        database: str | None = None,
+        is_dictionary: bool | None = None,
+        chunk_size: int | None = None,
+        row_class: type[tuple] | bool | None = None
+    ) -> AsyncIterator[tuple | dict | list[tuple] | list[dict]]:
+        """
+        Executes a SQL query and streams its rows from an unbuffered cursor.
+
+        The next chunk is read from the server only when the consumer asks for more rows, so a slow consumer
+        never forces the whole result into memory. The pooled connection is held until the stream is exhausted
+        or closed; a stream left early (`break`, error, cancellation) closes the connection instead of reading the rest.
+        Use `contextlib.aclosing()` to release it right after a `break`, otherwise it is released when the stream is collected.
+
+        Example:
+            async with contextlib.aclosing(adb.stream("SELECT * FROM users")) as rows:
+                async for row in rows:
+                    ...
+
+        Args:
+            query (str): SQL query string to be executed.
+            inputs (tuple or Any, optional): Parameters to pass with the query. Defaults to ().
+            database (str, optional): Target database name. Defaults to config value.
+            is_dictionary (bool, optional): If True, rows are returned as dicts. If False, as tuples. If None using default value `self.is_dictionary`.
+            chunk_size (int, optional): If given, yields lists of up to `chunk_size` rows instead of single rows.
+                Single rows are read in chunks of `self.stream_chunk_size`.
+            row_class (type[tuple] | bool, optional): Rows are read from a tuple cursor and yielded as instances of this tuple subclass.
+                True uses a named tuple class derived from the column names of the result. Overrides `is_dictionary`.
+
+        Yields:
+            tuple | dict | list[tuple] | list[dict]: The next row, or the next chunk of rows.
+
+        Raises:
+            Exception: Any error raised during SQL execution, re-raised after logging.
+        """
+        connection, cursor = await self.__db_connect(database, False if row_class else is_dictionary, is_buffered=False)
+        is_exhausted = False
+
+        try:
+            if not isinstance(inputs, tuple):
+                inputs = (inputs,)
+
+            await cursor.execute(query, inputs)
+
+            row_type = resolve_row_class(row_class, cursor.column_names) if row_class else None
+            while rows := await cursor.fetchmany(chunk_size or self.stream_chunk_size):
+                if row_type is not None:
+                    rows = make_rows(row_type, rows)
+                if chunk_size is None:
+                    for row in rows:
+                        yield row
+                else:
+                    yield rows
+            is_exhausted = True
+        except Exception as err:
+            await self.__db_release(connection, database=database, is_broken=True)
+            connection = None
+            await self.log(
+                level=8,
+                module="DATABASE",
+                text=f"DB_STREAM: {query}",
+                err=err,
+                is_console_log=True
+            )
+            raise err
+        finally:
+            if connection is not None:
+                if is_exhausted:
+                    await self.__db_release(connection, cursor, database)
+                else:
+                    await self.__db_release(connection, database=database, is_broken=True)
+
+    async def __db_columns(
+        self,
+        query: str,
+        inputs: tuple | Any,
+        database: str | None,
+        chunk_size: int | None
+    ) -> dict[str, Any]:
+        # * rows are read unbuffered and converted chunk by chunk, a transaction connection is always buffered
+        connection, cursor = await self.__db_connect(database, False, is_buffered=self.__transaction.get() is not None)
+        is_exhausted = False
+
+        try:
+            if not isinstance(inputs, tuple):
+                inputs = (inputs,)
+
+            await cursor.execute(query, inputs)
+
+            builder = ColumnBuilder(cursor.description or ())
+            while cursor.with_rows and (rows := await cursor.fetchmany(chunk_size or self.stream_chunk_size)):
+                builder.add(rows)
+            is_exhausted = True
+            return builder.result()
+        except Exception as err:
+            await self.__db_release(connection, database=database, is_broken=True)
+            connection = None
+            await self.log(
+                level=8,
+                module="DATABASE",
+                text=f"DB_COLUMNS: {query}",
+                err=err,
+                is_console_log=True
+            )
+            raise err
+        finally:
+            if connection is not None:
+                if is_exhausted:
+                    await self.__db_release(connection, cursor, database)
+                else:
+                    await self.__db_release(connection, database=database, is_broken=True)
+
+    async def __fan_out(
+        self, calls: Iterable[Awaitable], concurrency: int | None, return_exceptions: bool
+    ) -> AsyncIterator[tuple[int, Any]]:
+        if concurrency is None:
+            concurrency = self.pool_max_size
+        if not isinstance(concurrency, int):
+            raise TypeError(f"Expected 'concurrency' to be of type int, but got: {type(concurrency).__name__}")
+        if concurrency < 1:
+            raise ValueError(f"Expected 'concurrency' to be a positive int, but got: {concurrency!r}")
+
+        jobs = enumerate(calls)
+        results = asyncio.Queue()
+        # * a slot is taken per started call and given back once its result is consumed,
+        # * so finished but unconsumed results also hold back new calls
+        slots = asyncio.Semaphore(concurrency)
+        stopped = asyncio.Event()
+        workers = [
+            asyncio.create_task(_fan_out_worker(jobs, results, slots, stopped, return_exceptions))
+            for _ in range(concurrency)
+        ]
+        running = len(workers)
+        try:
+            while running:
+                index, result = await results.get()
+                if index is _FAN_OUT_DONE:
+                    running -= 1
+                elif index is _FAN_OUT_FAILED:
+                    raise result
+                else:
+                    yield index, result
+                    slots.release()
+        finally:
+            stopped.set()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            # * only calls that already exist are closed, a lazy (possibly endless) iterable is left unconsumed
+            if isinstance(calls, (list, tuple)):
+                for _, call in jobs:
+                    if inspect.iscoroutine(call):
+                        call.close()
+
+    async def gather_queries(
+        self, *calls: Awaitable, concurrency: int | None = None, return_exceptions: bool = False
+    ) -> list:
+        """
+        Runs awaitables (usually calls of generated methods) concurrently, at most `concurrency` at a time.\n
+        Unlike `asyncio.gather`, calls beyond the limit only start when a running one finishes, so the pool is never flooded.
+
+        Example:
+            users = await adb.gather_queries(*(adb.get_user(user_id=user_id) for user_id in ids), concurrency=8)
+
+        Args:
+            *calls (Awaitable): Calls to run, they are started in order.
+            concurrency (int, optional): Maximum number of calls in flight. If None using default value `self.pool_max_size`.
+            return_exceptions (bool, optional): If True, exceptions are returned in place of results.
+                If False, the first exception cancels the remaining calls and is raised.
+
+        Returns:
+            list: Results in the order of `calls`.
+        """
+        results = [None] * len(calls)
+        async for index, result in self.__fan_out(calls, concurrency, return_exceptions):
+            results[index] = result
+        return results
+
+    def as_completed(
+        self, calls: Iterable[Awaitable], concurrency: int | None = None, return_exceptions: bool = False
+    ) -> AsyncIterator[tuple[int, Any]]:
+        """
+        Runs awaitables concurrently like `gather_queries()` and yields their results as they complete.\n
+        `calls` may be a lazy iterable, it is consumed only as slots free up. A slot is given back
+        when its result is consumed, so a slow consumer also slows down the calls.
+
+        Example:
+            async for index, user in adb.as_completed(adb.get_user(user_id=user_id) for user_id in ids):
+                ...
+
+        Args:
+            calls (Iterable[Awaitable]): Calls to run, they are started in order.
+            concurrency (int, optional): Maximum number of calls in flight. If None using default value `self.pool_max_size`.
+            return_exceptions (bool, optional): If True, exceptions are yielded in place of results.
+                If False, the first exception cancels the remaining calls and is raised.
+
+        Yields:
+            tuple[int, Any]: Position of the call in `calls` and its result.
+        """
+        return self.__fan_out(calls, concurrency, return_exceptions)
+
+    async def __map_call(
+        self, query: str, inputs: tuple | Any, fetch: Literal[0, 1, 2, 4], database: str | None, is_dictionary: bool | None
+    ) -> None | list[tuple] | list[dict] | tuple | dict:
+        return await self._db_query(query, inputs, fetch, database, is_dictionary)
+
+    async def map_query(
+        self,
+        query: str,
+        params: Iterable[tuple | Any],
+        fetch: Literal[0, 1, 2, 4] = 2,
+        database: str | None = None,
+        is_dictionary: bool | None = None,
+        concurrency: int | None = None,
+        return_exceptions: bool = False
+    ) -> list:
+        """
+        Executes one SQL query for every item of `params` concurrently, at most `concurrency` at a time.
+
+        Args:
+            query (str): SQL query string to be executed.
+            params (Iterable[tuple | Any]): Parameters of every execution. It may be lazy, it is consumed as slots free up.
+            fetch (Literal[0, 1, 2, 4], optional): Result retrieval mode of `_db_query`. Defaults to 2.
+            database (str, optional): Target database name. Defaults to config value.
+            is_dictionary (bool, optional): If True, results are returned as dicts. If False, as tuples. If None using default value `self.is_dictionary`.
+            concurrency (int, optional): Maximum number of queries in flight. If None using default value `self.pool_max_size`.
+            return_exceptions (bool, optional): If True, exceptions are returned in place of results.
+
+        Returns:
+            list: Results in the order of `params`.
+        """
+        results = {}
+        calls = (self.__map_call(query, inputs, fetch, database, is_dictionary) for inputs in params)
+        async for index, result in self.__fan_out(calls, concurrency, return_exceptions):
+            results[index] = result
+        return [results[index] for index in range(len(results))]
+
+    @__protected
+    async def _db_query_many(
+        self,
+        query: str,
+        rows: Iterable[tuple | Any],
+        database: str | None = None,
+        chunk_size: int | None = None,
+        invalidate_tables: tuple[str, ...] | None = None
+    ) -> int | None:
+        """
+        Executes a SQL query for every row of parameters on one connection and in one transaction.
+
+        Rows are sent in chunks of `chunk_size` through `executemany`, which rewrites every chunk of
+        an `INSERT ... VALUES` query into a single multi-row INSERT; other queries run row by row.
+        All chunks are committed together, on error the transaction is rolled back.
+
+        Args:
+            query (str): SQL query string with the placeholders of a single row.
+            rows (Iterable[tuple | Any]): Parameters of every row. Non-tuple rows are passed as a single parameter.
+            database (str, optional): Target database name. Defaults to config value.
+            chunk_size (int, optional): Number of rows per `executemany` call. If None using default value `self.bulk_chunk_size`.
+            invalidate_tables (tuple[str, ...], optional): Tables the query writes. Their cached results are dropped after the commit.
+
+        Returns:
+            int | None: Total number of affected rows.
+
+        Raises:
+            Exception: Any error raised during SQL execution, re-raised after logging.
+        """
+        if chunk_size is None:
+            chunk_size = self.bulk_chunk_size
+        connection, cursor = await self.__db_connect(database)
+        result = None
+
+        try:
+            rowcount = 0
+            rows = (row if isinstance(row, tuple) else (row,) for row in rows)
+            for chunk in itertools.batched(rows, chunk_size):
+                await cursor.executemany(query, chunk)
+                rowcount += cursor.rowcount
+
+            await self.__db_commit(connection)
+            result = rowcount
+            if invalidate_tables and self.__result_cache is not None:
+                self.__invalidate_tables(connection, invalidate_tables)
+        except Exception as err:
+            await self.__db_rollback(connection)
+            await self.__db_release(connection, cursor, database)
+            connection = None
+            await self.log(
+                level=8,
+                module="DATABASE",
+                text=f"DB_QUERY_MANY: {query}",
+                err=err,
+                is_console_log=True
+            )
+            raise err
+        finally:
+            if connection is not None:
+                await self.__db_release(connection, cursor, database)
             return result
 
     @__protected
@@ -446,8 +2077,11 @@ class AsyncWaveSQL:
                 elif fetch == 2:
                     result = await result_cursor.fetchall()
 
-            await connection.commit()
+            await self.__db_commit(connection)
         except Exception as err:
+            await self.__db_rollback(connection)
+            await self.__db_release(connection, cursor, database)
+            connection = None
             await self.log(
                 level=8,
                 module="DATABASE",
@@ -457,24 +2091,455 @@ class AsyncWaveSQL:
             )
             raise err
         finally:
-            await cursor.close()
-            await connection.close()
+            if connection is not None:
+                await self.__db_release(connection, cursor, database)
             return result
 
-    async def __save_log_query(
-        self, *, level: int, module: str,
-        msg: str, backtrace: str
-    ) -> dict:
-        return await self._db_call_procedure(
-            "insert_log",
-            (
-                level,
-                module,
-                msg,
-                backtrace
-            ), fetch=1,
-            is_dictionary=True
+    def __get_log_writer(self) -> AsyncLogWriter:
+        log_writer = self.__log_writer
+        if log_writer is None or not log_writer.is_running or log_writer.loop is not asyncio.get_running_loop():
+            log_writer = AsyncLogWriter(
+                write_batch=self.__save_log_batch, on_error=self.__on_log_batch_error,
+                batch_size=self.log_batch_size, flush_interval=self.log_flush_interval,
+                queue_size=self.log_queue_size, policy=self.log_queue_policy
+            )
+            log_writer.start()
+            self.__log_writer = log_writer
+        return log_writer
+
+    async def flush_logs(self, timeout: float | None = None) -> bool:
+        """
+        Waits until all logs queued by the log writer are saved.
+
+        Args:
+            timeout (float, optional): Seconds to wait. None waits forever.
+
+        Returns:
+            bool: True if everything was flushed in time (always True without `is_log_writer`).
+        """
+        if self.__log_writer is None or not self.__log_writer.is_running:
+            return True
+        return await self.__log_writer.flush(timeout)
+
+    def log_writer_stats(self) -> dict:
+        """
+        Returns counters of the log writer.
+
+        Returns:
+            dict: `AsyncLogWriter.stats()`, empty if the writer was not started.
+        """
+        if self.__log_writer is None:
+            return {}
+        return self.__log_writer.stats()
+
+    async def __save_log_batch(self, records: list[tuple]) -> None:
+        # * the writer task may have been started inside a transaction block and inherited it
+        token = self.__transaction.set(None)
+        try:
+            connection, cursor = await self.__db_connect()
+            try:
+                await cursor.execute(*get_log_insert(records))
+                await connection.commit()
+            finally:
+                await self.__db_release(connection, cursor)
+        finally:
+            self.__transaction.reset(token)
+
+    async def __on_log_batch_error(self, records: list[tuple], err: Exception) -> None:
+        if self.__log_spool is not None and is_connection_error(err):
+            return await self.__spool_logs(records, err=err)
+        await self.__print_log(
+            backtrace="".join(traceback.format_exception(type(err), err, err.__traceback__)), def_module="DATABASE",
+            def_msg=f"LOG_WRITER: {len(records)} log records were not saved", is_raise_on_fail=False
+        )
+
+    async def __spool_logs(self, records: list[tuple], err: Exception | None = None) -> None:
+        # * while the database is unreachable records go straight to the spool, the replay task writes them back
+        if err is not None and not self.__is_log_spooling:
+            self.__is_log_spooling = True
+            await self.__print_log(
+                backtrace=err, def_level="WARNING", def_color="YELLOW", def_module="DATABASE",
+                def_msg=f"LOG_SPOOL: logs are spooled to {self.__log_spool.directory} until the database is reachable", is_raise_on_fail=False
+            )
+        # * the spool writes to memory-mapped files and flushes them, which must not stall the event loop during an outage
+        await asyncio.to_thread(self.__log_spool.append, *records)
+        if self.__log_spool_task is None or self.__log_spool_task.done():
+            self.__log_spool_task = asyncio.get_running_loop().create_task(self.__run_log_spool_replay())
+
+    async def __run_log_spool_replay(self) -> None:
+        while True:
+            await asyncio.sleep(self.log_spool_replay_interval)
+            try:
+                await self.replay_log_spool()
+            except Exception:
+                continue
+            if not await self.__has_spooled_logs():
+                return
+
+    async def __replay_log_batch(self, records: list[tuple]) -> int:
+        try:
+            await self.__save_log_query(*records)
+            return len(records)
+        except Exception as ex:
+            if is_connection_error(ex):
+                raise
+        # * a rejected batch would fail on every round and hold back the spool, so its records are written one by one
+        # * and the ones the database rejects are quarantined
+        count, rejected, error = 0, 0, None
+        for i, record in enumerate(records):
+            try:
+                await self.__save_log_query(record)
+                count += 1
+            except Exception as ex:
+                if is_connection_error(ex):
+                    # * the batch counts as replayed, the unwritten rest goes back to the spool instead of being written twice
+                    await asyncio.to_thread(self.__log_spool.append, *records[i:])
+                    break
+                await asyncio.to_thread(self.__log_spool.quarantine, record)
+                rejected, error = rejected + 1, ex
+        if rejected:
+            await self.__print_log(
+                backtrace=error, def_level="WARNING", def_color="YELLOW", def_module="DATABASE",
+                def_msg=f"LOG_SPOOL: {rejected} log records were rejected by the database and moved to {self.__log_spool.quarantine_path}",
+                is_raise_on_fail=False
+            )
+        return count
+
+    async def replay_log_spool(self) -> int:
+        """
+        Writes the records of the log spool back to `logs`, one multi-row INSERT per `log_batch_size` records.
+        Records the database rejects (not a connection error) are moved to `quarantine.jsonl` in the spool directory
+        and reported, the replay carries on with the rest of the spool.
+
+        Returns:
+            int: Number of records written.
+
+        Raises:
+            Exception: The connection error of the batch that failed; it and the following records stay spooled.
+        """
+        if self.__log_spool is None:
+            return 0
+        await asyncio.to_thread(self.__log_spool.sync)
+        count = 0
+        batches = self.__log_spool.replay_batches(self.log_batch_size)
+        try:
+            # * segments are mapped, flushed and deleted in a worker thread, the loop only writes the batches
+            while (records := await asyncio.to_thread(next, batches, None)) is not None:
+                count += await self.__replay_log_batch(records)
+        finally:
+            # * still running in its thread if the replay was cancelled, it is closed (batch kept) when collected
+            with contextlib.suppress(ValueError):
+                await asyncio.to_thread(batches.close)
+        if not await self.__has_spooled_logs():
+            self.__is_log_spooling = False
+        return count
+
+    async def __has_spooled_logs(self) -> bool:
+        return await asyncio.to_thread(lambda: self.__log_spool.has_pending)
+
+    def log_spool_stats(self) -> dict:
+        """
+        Returns counters of the log spool.
+
+        Returns:
+            dict: `LogSpool.stats()` and `is_spooling` (records go straight to the spool), empty without `log_spool_path`.
+        """
+        if self.__log_spool is None:
+            return {}
+        return {"is_spooling": self.__is_log_spooling, **self.__log_spool.stats()}
+
+    async def __save_log_query(self, *records: tuple) -> None:
+        await self.__save_log_batch(list(records))
+
+    async def __save_log_summaries(self, is_force: bool = False) -> None:
+        # * summaries are rare (one per group and window), they are written directly so they never wait behind a closed writer
+        summaries = self.__log_limiter.pop_summaries(is_force)
+        if not summaries:
+            return
+        try:
+            await self.__save_log_query(*summaries)
+            error = None
+        except Exception as ex:
+            if self.__log_spool is not None and is_connection_error(ex):
+                await self.__spool_logs(summaries, err=ex)
+                ex = None
+            error = ex
+        if self.is_console_log or error is not None:
+            for level, first_date, module, msg, _, repeat_count, last_date in summaries:
+                log_level = self.__log_levels.get(level, {})
+                db_log = {
+                    "log_date": last_date, "log_level_name": log_level.get("name"), "log_level_color_name": log_level.get("color"),
+                    "log_module": module, "log_message": f"{msg} (repeated {repeat_count} times since {first_date:%d-%m-%Y %H:%M:%S})"
+                }
+                await self.__print_log(log=db_log, backtrace=error, is_raise_on_fail=False)
+
+    def log_limiter_stats(self) -> dict:
+        """
+        Returns counters of log sampling and rate limiting.
+
+        Returns:
+            dict: `LogLimiter.stats()`, empty if neither `log_rate_limit` nor `log_sample_rate` is set.
+        """
+        if self.__log_limiter is None:
+            return {}
+        return self.__log_limiter.stats()
+
+    async def migrate(self) -> list[str]:
+        """
+        Applies the `*_init_*.sql` files of `path_to_sql` numbered 0 and up that are not recorded in `wavesql_migrations`,
+        in ascending order of their number, and records each one with the checksum of its content.\n
+        Every row also stores the combined checksum of all files recorded up to it, so when the files match the database
+        the only work is one indexed lookup. Otherwise the files are applied under `GET_LOCK` (waiting at most `migration_lock_timeout`
+        seconds): workers starting at once run them one at a time, and the ones that waited find them recorded.
+        A database created before `wavesql_migrations` existed is baselined: its current files are recorded without running them.
+        Files with negative numbers belong to WaveSQL and are never migrated; a recorded file whose content changed is
+        reported once with a WARNING and not applied again: its recorded checksum is kept, but the combined checksum is updated
+        to its new content, so later starts take the single lookup again. Statements are DDL, so a file that fails midway is not rolled back.
+
+        Returns:
+            list[str]: Names of the files applied by this call.
+
+        Raises:
+            MigrationError: If the lock wasn't acquired in time or a query failed; files applied before the failed one stay recorded.
+        """
+        migrations = get_migrations(self.path_to_sql)
+        if not migrations:
+            return []
+        checksums = {migration.name: (migration.number, migration.checksum) for migration in migrations}
+        # * DDL commits implicitly, so it is kept out of an active transaction
+        token = self.__transaction.set(None)
+        try:
+            connection, cursor = await self.__db_connect(is_dictionary=False)
+            try:
+                try:
+                    await cursor.execute(MIGRATION_LOOKUP, (get_schema_checksum(checksums),))
+                    if await cursor.fetchall():
+                        return []
+                except mysql_connector.Error as err:
+                    if err.errno != errorcode.ER_NO_SUCH_TABLE:
+                        raise
+                return await self.__apply_migrations(connection, cursor, migrations)
+            except mysql_connector.Error as err:
+                raise MigrationError(f"Error updating the database: {err}") from err
+            finally:
+                await self.__db_release(connection, cursor)
+        finally:
+            self.__transaction.reset(token)
+
+    async def __apply_migrations(self, connection: MySQLConnection, cursor: MySQLCursor, migrations: list[Migration]) -> list[str]:
+        lock_name = f"wavesql_migrations_{self.settings['dbname']}"
+        await cursor.execute("SELECT GET_LOCK(%s, %s)", (lock_name, self.migration_lock_timeout))
+        if (await cursor.fetchone())[0] != 1:
+            raise MigrationError(f"Migration lock '{lock_name}' was not acquired within {self.migration_lock_timeout} seconds")
+        applied = []
+        try:
+            await cursor.execute("SHOW TABLES LIKE 'wavesql_migrations'")
+            is_baseline = not await cursor.fetchall()
+            for sql_command in SqlFileObject(path=PATH_MIGRATIONS_SCRIPT, dict_of_values=self.settings).sql_objects:
+                await cursor.execute(sql_command.code)
+            await cursor.execute("SELECT name, number, checksum FROM wavesql_migrations")
+            recorded = {name: (number, checksum) for name, number, checksum in await cursor.fetchall()}
+            # * combined checksums are built from the current content of changed files, so once reported they match the lookup again
+            changed = [migration for migration in migrations if migration.name in recorded and recorded[migration.name][1] != migration.checksum]
+            acknowledged = {**recorded, **{migration.name: (migration.number, migration.checksum) for migration in changed}}
+            for migration in changed:
+                await self.__print_log(backtrace=None, def_level="WARNING", def_color="YELLOW", def_module="DATABASE", def_msg=f"{migration.name} changed after it was applied, it is not applied again", is_raise_on_fail=False)
+
+            for migration in migrations:
+                if migration.name in recorded:
+                    continue
+                if not is_baseline:
+                    for sql_command in SqlFileObject(path=migration.path, dict_of_values=self.settings).sql_objects:
+                        try:
+                            await cursor.execute(sql_command.code)
+                        except mysql_connector.Error as ex:
+                            raise MigrationError(
+                                f"[SQL MIGRATION ERROR]\nFile: {migration.path}\nObject: {sql_command.name}\nSQL Code:\n{sql_command.code.strip()}\n{ex}\n"
+                            ) from ex
+                acknowledged[migration.name] = (migration.number, migration.checksum)
+                await cursor.execute(MIGRATION_INSERT, (migration.number, migration.name, migration.checksum, get_schema_checksum(acknowledged)))
+                await connection.commit()
+                applied.append(migration.name)
+            if changed and not applied:
+                await cursor.execute(MIGRATION_ACKNOWLEDGE, (get_schema_checksum(acknowledged),))
+                await connection.commit()
+        finally:
+            # * if this fails too, releasing the connection (session reset or close) frees the lock
+            with contextlib.suppress(mysql_connector.Error):
+                await cursor.execute("SELECT RELEASE_LOCK(%s)", (lock_name,))
+                await cursor.fetchall()
+
+        if is_baseline:
+            await self.__print_log(backtrace=None, def_level="INFO", def_color="CYAN", def_module="DATABASE", def_msg=f"Created wavesql_migrations, {len(applied)} existing files recorded as applied", is_raise_on_fail=False)
+            return []
+        if applied:
+            await self.log(level=3, text=f"Database updated: {', '.join(applied)}")
+        return applied
+
+    async def upgrade_logs(self) -> list[str]:
+        """
+        Brings the log tables of a database created by an older WaveSQL up to date. `-1_init_logs.sql` only runs when the database
+        is created and `migrate()` skips files with negative numbers, so `start()` calls this on every existing database.\n
+        `logs`, `archived_logs` and `logs_exchange` (of the partitioned schema) get the `repeat_count`/`last_date` columns
+        summary records of `log_rate_limit` are written with; `log_archive_runs` and the `archive_logs` procedure are created
+        and a `delete_old_logs` event that still moves all rows in one transaction is replaced with the one calling `archive_logs`.
+        When nothing is missing this is one information_schema query;
+        otherwise the statements run under `GET_LOCK` (waiting at most `migration_lock_timeout` seconds), so workers starting at once don't race.
+
+        Returns:
+            list[str]: Statements that were executed, empty if the schema was current.
+
+        Raises:
+            MigrationError: If the lock wasn't acquired in time or a statement failed.
+        """
+        # * DDL commits implicitly, so it is kept out of an active transaction
+        token = self.__transaction.set(None)
+        try:
+            connection, cursor = await self.__db_connect(is_dictionary=False)
+            try:
+                await cursor.execute(LOG_SCHEMA_LOOKUP)
+                if not await cursor.fetchall():
+                    return []
+                return await self.__apply_log_upgrades(cursor)
+            except mysql_connector.Error as err:
+                raise MigrationError(f"Error upgrading the log schema: {err}") from err
+            finally:
+                await self.__db_release(connection, cursor)
+        finally:
+            self.__transaction.reset(token)
+
+    async def __apply_log_upgrades(self, cursor: MySQLCursor) -> list[str]:
+        lock_name = f"wavesql_upgrade_logs_{self.settings['dbname']}"
+        await cursor.execute("SELECT GET_LOCK(%s, %s)", (lock_name, self.migration_lock_timeout))
+        if (await cursor.fetchone())[0] != 1:
+            raise MigrationError(f"Log upgrade lock '{lock_name}' was not acquired within {self.migration_lock_timeout} seconds")
+        try:
+            # * another worker may have upgraded the schema while this one waited for the lock
+            await cursor.execute(LOG_SCHEMA_LOOKUP)
+            statements = get_log_upgrades(await cursor.fetchall(), self.settings)
+            for statement in statements:
+                await cursor.execute(statement)
+        finally:
+            with contextlib.suppress(mysql_connector.Error):
+                await cursor.execute("SELECT RELEASE_LOCK(%s)", (lock_name,))
+                await cursor.fetchall()
+
+        if statements:
+            await self.log(level=3, text=f"Log schema upgraded, {len(statements)} statements executed")
+        return statements
+
+    async def partition_logs(self) -> None:
+        """
+        Converts `logs` and `archived_logs` of an existing database to the partitioned schema (`sql/partitioning/-1_partition_logs.sql`),
+        replaces the `delete_old_logs` event with `rotate_logs` and creates the future partitions.
+        Both tables are rebuilt, so run it once in a maintenance window.
+        """
+        connection, cursor = await self.__db_connect()
+        try:
+            for sql_command in SqlFileObject(path=PATH_LOG_PARTITIONING_SCRIPT, dict_of_values=self.settings).sql_objects:
+                await cursor.execute(sql_command.code)
+        finally:
+            await self.__db_release(connection, cursor)
+        await self.add_log_partitions()
+
+    async def add_log_partitions(self, days_ahead: int | None = None) -> None:
+        """
+        Creates the missing daily partitions of `logs` and `archived_logs` (`CALL add_log_partitions`).
+
+        Args:
+            days_ahead (int, optional): Number of days after today to create partitions for. If None, `log_partition_days_ahead` is used.
+        """
+        await self.__call_log_procedure("add_log_partitions", (self.log_partition_days_ahead if days_ahead is None else days_ahead,))
+
+    async def rotate_log_partitions(self, keep_days: int | None = None, archive_days: int | None = None) -> None:
+        """
+        Moves partitions of `logs` older than `keep_days` to `archived_logs` and drops archived partitions older than `archive_days`
+        (`CALL rotate_log_partitions`), the same as the daily `rotate_logs` event does. Useful when `event_scheduler` is OFF.
+
+        Args:
+            keep_days (int, optional): Days kept in `logs`. If None, `log_keep_days` is used.
+            archive_days (int, optional): Days kept in `archived_logs`. If None, `log_archive_days` is used.
+        """
+        await self.__call_log_procedure(
+            "rotate_log_partitions",
+            (self.log_keep_days if keep_days is None else keep_days, self.log_archive_days if archive_days is None else archive_days)
+        )
+
+    async def archive_logs(
+        self, keep_days: int | None = None, archive_days: int | None = None, batch_size: int | None = None,
+        sleep: float | None = None, max_batches: int = 0
+    ) -> dict | None:
+        """
+        Runs the `archive_logs` procedure: moves old rows from `logs` to `archived_logs` and purges expired archived rows
+        in short batches, so foreground log inserts are never blocked by one long transaction.
+        Arguments left as None take the `log_keep_days`, `log_archive_days`, `log_archive_batch_size` and `log_archive_sleep` values.
+
+        Args:
+            keep_days (int, optional): Days kept in `logs`.
+            archive_days (int, optional): Days kept in `archived_logs`.
+            batch_size (int, optional): Rows per batch.
+            sleep (float, optional): Seconds to sleep between batches.
+            max_batches (int, optional): Batches to run before returning, 0 runs until done. An unfinished run is resumed by the next call.
+
+        Returns:
+            dict | None: The `log_archive_runs` row of the run (`id`, `started_at`, `finished_at`, `last_id`, `batches`,
+                `rows_moved`, `rows_purged`), None if another run holds the archival lock.
+        """
+        inputs = (
+            self.log_keep_days if keep_days is None else keep_days,
+            self.log_archive_days if archive_days is None else archive_days,
+            self.log_archive_batch_size if batch_size is None else batch_size,
+            self.log_archive_sleep if sleep is None else sleep,
+            max_batches
         )
+        token = self.__transaction.set(None)
+        try:
+            connection, cursor = await self.__db_connect(is_dictionary=False)
+            try:
+                await cursor.callproc("archive_logs", inputs)
+                metrics = None
+                for result_cursor in cursor.stored_results():
+                    row = await result_cursor.fetchone()
+                    if row is not None:
+                        metrics = row if isinstance(row, dict) else dict(zip(result_cursor.column_names, row))
+            finally:
+                await self.__db_release(connection, cursor)
+        finally:
+            self.__transaction.reset(token)
+        return metrics
+
+    async def __call_log_procedure(self, procedure_name: str, inputs: tuple) -> None:
+        # * unlike _db_call_procedure errors are raised to the caller, and the call is kept out of an active transaction (DDL commits implicitly)
+        token = self.__transaction.set(None)
+        try:
+            connection, cursor = await self.__db_connect()
+            try:
+                await cursor.callproc(procedure_name, inputs)
+            finally:
+                await self.__db_release(connection, cursor)
+        finally:
+            self.__transaction.reset(token)
+
+    async def __load_log_levels(self) -> None:
+        # * level names and colors are read once, log() renders the console line from them instead of reading the row back
+        connection, cursor = await self.__db_connect(is_dictionary=False)
+        try:
+            await cursor.execute("SELECT ll.id, ll.name, lc.name FROM log_levels AS ll JOIN log_colors AS lc ON lc.id = ll.color_id")
+            rows = await cursor.fetchall()
+        finally:
+            await self.__db_release(connection, cursor)
+        if rows:
+            self.__log_levels = {level_id: {"name": name, "color": color} for level_id, name, color in rows}
+
+    def log_levels(self) -> dict[int, dict]:
+        """
+        Returns the log levels `log()` renders console output with.
+
+        Returns:
+            dict[int, dict]: `{"name": ..., "color": ...}` keyed by level id, read from `log_levels`/`log_colors` by `start()`
+                (the levels seeded by `-1_init_logs.sql` until then).
+        """
+        return dict(self.__log_levels)
 
     async def log(
         self, text: str | Exception | Any = "", *args, level: int = None,
@@ -519,6 +2584,13 @@ class AsyncWaveSQL:
         - Converts `text` to a string for logging.
         - If an exception is passed (`err` or `text` is an `Exception`), formats the stack trace.
         - If `is_console_log=True`, additionally outputs the log to the console via `self.__print_log(...)`.
+        - The record is saved with a single INSERT into `logs` (or put on the `AsyncLogWriter` queue if `self.is_log_writer` is set),
+          the console output is rendered from the log levels cached by `start()` without reading the row back.
+        - A record saved directly gets its `date` from the server (`NOW()`), so retention by `CURDATE()` isn't shifted by the client clock.
+          Records saved later (by the log writer, from the spool) keep the client time of the call, a naive local datetime
+          that MySQL interprets in the session time zone.
+        - An unknown level or a failed INSERT is printed to the console with the error.
+        - With `log_rate_limit`/`log_sample_rate` the record may be sampled out or coalesced into a later summary record.
 
         Notes
         -----
@@ -545,25 +2617,43 @@ class AsyncWaveSQL:
 
         msg = sep.join(parts)
 
+        log_level = self.__log_levels.get(level)
+        if log_level is None:
+            return await self.__print_log(log={}, backtrace=ValueError(f"The logging level {level!r} was not found!"), def_msg=msg, is_raise_on_fail=is_raise_on_fail, is_pprint=is_pprint)
+        if self.__log_limiter is not None:
+            await self.__save_log_summaries()
+            # * checked before the traceback is formatted, a suppressed record costs only a dict lookup
+            if not self.__log_limiter.check(level, module, msg):
+                return
+
         if isinstance(err, Exception):
             backtrace = "".join(traceback.format_exception(type(err), err, err.__traceback__))
         elif isinstance(text, Exception):
             backtrace = "".join(traceback.format_exception(type(text), text, text.__traceback__))
         else:
             backtrace = ""
-        try:
-            db_log: dict = await self.__save_log_query(level=level, module=module, msg=msg, backtrace=backtrace)
-            new_backtrace = None
-        except Exception as ex:
-            new_backtrace = ex
-            db_log: dict = {}
-            is_console_log = True
+        record = (level, datetime.now(), module, msg, backtrace)
+        if self.__is_log_spooling:
+            await self.__spool_logs([record])
+        elif self.is_log_writer:
+            if not await self.__get_log_writer().put(record) and self.__log_spool is not None:
+                await self.__spool_logs([record])
+        else:
+            try:
+                # * a direct INSERT takes the server time like `DEFAULT NOW()`, the client time is kept only by
+                # * queued and spooled records that are written later
+                await self.__save_log_query((level, None, module, msg, backtrace))
+            except Exception as ex:
+                # * only an unreachable database is worth spooling, a rejected record would be rejected again on replay
+                if self.__log_spool is None or not is_connection_error(ex):
+                    return await self.__print_log(log={}, backtrace=ex, def_msg=msg, is_raise_on_fail=is_raise_on_fail, is_pprint=is_pprint)
+                await self.__spool_logs([record], err=ex)
         if is_console_log:
-            if db_log == {} or db_log is None:
-                new_backtrace = (new_backtrace if new_backtrace else backtrace)
-                return await self.__print_log(log=db_log, backtrace=new_backtrace, def_msg=msg, is_raise_on_fail=is_raise_on_fail, is_pprint=is_pprint)
-            else:
-                return await self.__print_log(log=db_log, backtrace=(backtrace if is_log_backtrace and backtrace else None), is_raise_on_fail=is_raise_on_fail, is_pprint=is_pprint)
+            db_log = {
+                "log_date": record[1], "log_level_name": log_level["name"], "log_level_color_name": log_level["color"],
+                "log_module": module, "log_message": msg
+            }
+            return await self.__print_log(log=db_log, backtrace=(backtrace if is_log_backtrace and backtrace else None), is_raise_on_fail=is_raise_on_fail, is_pprint=is_pprint)
     
     def sync_log(
         self, text: str | Exception | Any = "", *args, level: int | None = None,
@@ -628,7 +2718,7 @@ class AsyncWaveSQL:
             is_pprint = self.is_pprint
             
         if log is not None:
-            color = LOG_COLORS.get(log.get("log_level_color_name", def_color), Fore.RED)
+            color = LOG_COLORS.get(log.get("log_level_color_name", def_color), LOG_COLORS["RED"])
             log_time_str = log.get("log_date", def_time).strftime("%d-%m-%Y %H:%M:%S")
             log_level = log.get("log_level_name", def_level)
             module = log.get("log_module", def_module)
@@ -645,8 +2735,9 @@ class AsyncWaveSQL:
             # print(color)
             # print(print_mes)
             
+        init_console()
         if is_pprint:
-            pprint(color + print_mes)
+            pprint.pprint(color + print_mes)
         else:
             print(color + print_mes)
 
@@ -0,0 +1,153 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import array
+import functools
+import importlib.util
+import itertools
+
+from datetime import datetime, date, timedelta
+from typing import Any, Literal, Sequence
+
+from .lazyImport import LazyModule
+
+# * NumPy takes longer to import than the rest of wavesql, it is only checked for here and imported by the first result that uses it
+numpy = LazyModule("numpy") if importlib.util.find_spec("numpy") is not None else None
+
+ColumnKind = Literal["int", "float", "datetime", "object"]
+
+
+@functools.cache
+def _get_kinds() -> dict[int, ColumnKind]:
+    # * the connector is loaded by the time a result is built
+    from mysql.connector.constants import FieldType
+
+    kinds: dict[int, ColumnKind] = {}
+    kinds.update(dict.fromkeys((FieldType.TINY, FieldType.SHORT, FieldType.LONG, FieldType.LONGLONG, FieldType.INT24, FieldType.YEAR), "int"))
+    kinds.update(dict.fromkeys((FieldType.FLOAT, FieldType.DOUBLE), "float"))
+    kinds.update(dict.fromkeys((FieldType.DATETIME, FieldType.TIMESTAMP, FieldType.DATE), "datetime"))
+    return kinds
+
+
+_epoch = datetime(1970, 1, 1)
+_microsecond = timedelta(microseconds=1)
+
+
+class ColumnBuilder:
+    """Builds a query result column by column from chunks of tuple rows.\n
+    With NumPy installed every column is a `numpy.ndarray`: integers are `int64`, floats are `float64` (NULL is `nan`),
+    dates and datetimes are `datetime64[us]` (NULL is `NaT`), everything else is an `object` array.
+    Without NumPy integers are `array.array("q")`, floats `array.array("d")` and datetimes `array.array("q")`
+    of microseconds since 1970-01-01; other columns are lists.
+    An integer or datetime column holding NULL (or an integer out of the int64 range) is kept as objects.
+    Only one chunk of row tuples is alive at a time, so peak memory is the columns plus one chunk.
+    """
+    def __init__(self, description: Sequence[tuple], is_numpy: bool | None = None) -> None:
+        if is_numpy is None:
+            is_numpy = numpy is not None
+        elif is_numpy and numpy is None:
+            raise ImportError("NumPy is required for is_numpy=True")
+        self.is_numpy = is_numpy
+        self.names: list[str] = [column[0] for column in description]
+        self.kinds: list[ColumnKind] = [self.get_kind(column[1]) for column in description]
+        self.rows = 0
+
+        self.__chunks: list[list] = [[] for _ in self.names]
+
+    @staticmethod
+    def get_kind(type_code: int) -> ColumnKind:
+        return _get_kinds().get(type_code, "object")
+
+    def add(self, rows: Sequence[tuple]) -> None:
+        """
+        Converts a chunk of rows and appends it to the columns.
+
+        Args:
+            rows (Sequence[tuple]): Rows read from a tuple cursor.
+        """
+        if not rows:
+            return
+        self.rows += len(rows)
+        convert = self.__convert_numpy if self.is_numpy else self.__convert_array
+        for chunks, kind, values in zip(self.__chunks, self.kinds, zip(*rows)):
+            chunks.append(convert(kind, values))
+
+    def result(self) -> dict[str, Any]:
+        """
+        Returns:
+            dict[str, Any]: Column name -> column of all added rows, in the order of the SELECT list.
+        """
+        concatenate = self.__concatenate_numpy if self.is_numpy else self.__concatenate_array
+        columns = {name: concatenate(kind, chunks) for name, kind, chunks in zip(self.names, self.kinds, self.__chunks)}
+        self.__chunks = [[] for _ in self.names]
+        return columns
+
+    @staticmethod
+    def __convert_numpy(kind: ColumnKind, values: tuple) -> Any:
+        if kind == "int" and None not in values:
+            try:
+                return numpy.array(values, dtype=numpy.int64)
+            except OverflowError:
+                pass
+        elif kind == "float":
+            return numpy.array(values, dtype=numpy.float64)
+        elif kind == "datetime":
+            return numpy.array(values, dtype="datetime64[us]")
+        # * assigning into an empty array keeps numpy from treating the values as nested sequences
+        column = numpy.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+
+    @staticmethod
+    def __convert_array(kind: ColumnKind, values: tuple) -> array.array | list:
+        if kind == "int" and None not in values:
+            try:
+                return array.array("q", values)
+            except OverflowError:
+                pass
+        elif kind == "float":
+            return array.array("d", [float("nan") if value is None else value for value in values])
+        elif kind == "datetime":
+            values = [None if value is None else to_microseconds(value) for value in values]
+            if None not in values:
+                return array.array("q", values)
+        return list(values)
+
+    @staticmethod
+    def __concatenate_numpy(kind: ColumnKind, chunks: list) -> Any:
+        if not chunks:
+            return numpy.array([], dtype={"int": numpy.int64, "float": numpy.float64, "datetime": "datetime64[us]"}.get(kind, object))
+        if len(chunks) == 1:
+            return chunks[0]
+        return numpy.concatenate(chunks)
+
+    @staticmethod
+    def __concatenate_array(kind: ColumnKind, chunks: list) -> array.array | list:
+        if all(isinstance(chunk, array.array) for chunk in chunks):
+            column = array.array("d" if kind == "float" else "q") if kind != "object" else []
+            for chunk in chunks:
+                column.extend(chunk)
+            return column
+        return list(itertools.chain.from_iterable(chunks))
+
+
+def to_microseconds(value: datetime | date) -> int:
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return (value.replace(tzinfo=None) - _epoch) // _microsecond
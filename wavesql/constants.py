@@ -19,30 +19,48 @@
 
 from pathlib import Path
 import os
-from colorama import Fore
 
 CUR_PATH: Path = Path(os.path.dirname(os.path.realpath(__file__)))
 PATH_DB_INIT_SCRIPTS = CUR_PATH / "sql"
+PATH_LOG_INIT_SCRIPT = PATH_DB_INIT_SCRIPTS / "-1_init_logs.sql"
+PATH_LOG_PARTITIONING_SCRIPT = PATH_DB_INIT_SCRIPTS / "partitioning" / "-1_partition_logs.sql"
+PATH_MIGRATIONS_SCRIPT = PATH_DB_INIT_SCRIPTS / "migrations" / "-1_migrations_table.sql"
 CONFIG_PATH = CUR_PATH / "config.ini"
 
 
+# * ANSI codes of colorama.Fore, spelled out so that importing wavesql doesn't import colorama
+# * (it is initialized by init_console() before the first colored print)
 LOG_COLORS = {
-    "GREEN": Fore.GREEN,
-    "LIGHTGREEN": Fore.LIGHTGREEN_EX,
-    "YELLOW": Fore.YELLOW,
-    "LIGHTYELLOW": Fore.LIGHTYELLOW_EX,
-    "RED": Fore.RED,
-    "LIGHTRED": Fore.LIGHTRED_EX,
-    "CYAN": Fore.CYAN,
-    "LIGHTCYAN": Fore.LIGHTCYAN_EX,
-    "BLUE": Fore.BLUE,
-    "LIGHTBLUE": Fore.LIGHTBLUE_EX,
-    "MAGENTA": Fore.MAGENTA,
-    "LIGHTMAGENTA": Fore.LIGHTMAGENTA_EX,
-    "WHITE": Fore.WHITE,
-    "LIGHTWHITE": Fore.LIGHTWHITE_EX,
-    "BLACK": Fore.BLACK,
-    "LIGHTBLACK": Fore.LIGHTBLACK_EX,
+    "GREEN": "\x1b[32m",
+    "LIGHTGREEN": "\x1b[92m",
+    "YELLOW": "\x1b[33m",
+    "LIGHTYELLOW": "\x1b[93m",
+    "RED": "\x1b[31m",
+    "LIGHTRED": "\x1b[91m",
+    "CYAN": "\x1b[36m",
+    "LIGHTCYAN": "\x1b[96m",
+    "BLUE": "\x1b[34m",
+    "LIGHTBLUE": "\x1b[94m",
+    "MAGENTA": "\x1b[35m",
+    "LIGHTMAGENTA": "\x1b[95m",
+    "WHITE": "\x1b[37m",
+    "LIGHTWHITE": "\x1b[97m",
+    "BLACK": "\x1b[30m",
+    "LIGHTBLACK": "\x1b[90m",
 }
 
 no_python_names = ["insert_log"]
+
+# * mirrors the rows seeded into `log_levels` by -1_init_logs.sql (ids follow the insert order),
+# * used until start() loads the actual levels from the database
+LOG_LEVELS = {
+    1: {"name": "INFO", "color": "CYAN"},
+    2: {"name": "DEBUG", "color": "MAGENTA"},
+    3: {"name": "OK", "color": "GREEN"},
+    4: {"name": "FAILURE", "color": "RED"},
+    5: {"name": "WARNING", "color": "YELLOW"},
+    6: {"name": "EXPECTED ERROR", "color": "RED"},
+    7: {"name": "UNEXPECTED ERROR", "color": "RED"},
+    8: {"name": "ERROR", "color": "RED"},
+    9: {"name": "FATAL ERROR", "color": "LIGHTRED"},
+}
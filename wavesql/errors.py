@@ -25,3 +25,23 @@ class LogError(Exception):
 class SqlInitError(Exception):
     def __init__(self, message, **kwargs):
         super().__init__(self, message, **kwargs)
+
+
+class PoolError(Exception):
+    def __init__(self, message, **kwargs):
+        super().__init__(self, message, **kwargs)
+
+
+class PoolTimeoutError(PoolError):
+    def __init__(self, message, **kwargs):
+        super().__init__(message, **kwargs)
+
+
+class TransactionError(Exception):
+    def __init__(self, message, **kwargs):
+        super().__init__(self, message, **kwargs)
+
+
+class MigrationError(Exception):
+    def __init__(self, message, **kwargs):
+        super().__init__(self, message, **kwargs)
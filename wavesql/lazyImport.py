@@ -0,0 +1,55 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import importlib
+
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule:
+    """Stands in for a module that is imported on first attribute access.\n
+    Keeps heavy dependencies (the MySQL connector, NumPy) out of `import wavesql.sync` until a connection or a result needs them.
+    Attributes are looked up on the module every time, so patching the module (e.g. `mysql.connector.connect` in tests) still works.
+
+    Example:\n
+        mysql_connector = LazyModule("mysql.connector")
+        connection = mysql_connector.connect(**config)  # * mysql.connector is imported here
+    """
+    def __init__(self, name: str) -> None:
+        self.__name = name
+        self.__module: ModuleType | None = None
+
+    def __getattr__(self, attr: str) -> Any:
+        module = self.__module
+        if module is None:
+            # * import_module holds the import lock, threads racing on the first access get the same module
+            module = self.__module = importlib.import_module(self.__name)
+        return getattr(module, attr)
+
+    def __repr__(self) -> str:
+        return f"<LazyModule {self.__name!r}{'' if self.__module is None else ' (loaded)'}>"
+
+
+@functools.cache
+def init_console() -> None:
+    """Initializes colorama (ANSI colors on Windows consoles, reset after every print) before the first colored print."""
+    import colorama
+    colorama.init(autoreset=True)
@@ -0,0 +1,160 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import re
+import threading
+import time
+
+from datetime import datetime
+
+_fingerprint_digits = re.compile(r"\d+")
+
+
+class LogLimiter:
+    """Sampling, rate limiting and duplicate coalescing of log records.\n
+    Records are grouped by (module, level, fingerprint), where the fingerprint is the message with every number replaced by `#`,
+    so "timeout after 31 ms" and "timeout after 40 ms" are the same record.
+    A record is first kept with the probability `sample_rate` of its level (records sampled out are only counted).
+    Then, if `limit` is set, at most `limit` records of a group are written per `window` seconds; the rest are coalesced
+    and `pop_summaries()` returns one summary record per group after its window ends, carrying the repeat count
+    and the first/last timestamps. The limiter is guarded by a lock and is shared by `WaveSQL` (threads) and `AsyncWaveSQL` (no awaits inside).
+
+    Example:\n
+        limiter = LogLimiter(limit=10, window=60.0)
+        if limiter.check(8, "API", "Upstream timeout after 30 s"):
+            ...  # write the record
+        for level, first_date, module, message, traceback, repeat_count, last_date in limiter.pop_summaries():
+            ...  # write the summary
+    """
+    def __init__(
+        self, limit: int | None = None, window: float = 60.0, sample_rate: float | dict[int, float] = 1.0, max_groups: int = 10000
+    ) -> None:
+        if limit is not None and (not isinstance(limit, int) or limit < 0):
+            raise ValueError(f"Expected 'limit' to be a non-negative int or None, but got: {limit!r}")
+        if not isinstance(window, (int, float)) or window <= 0:
+            raise ValueError(f"Expected 'window' to be a positive number, but got: {window!r}")
+        self.limit = limit
+        self.window = window
+        self.sample_rate = sample_rate
+        self.max_groups = max_groups
+
+        self.__lock = threading.Lock()
+        # * group -> [window start, records written in the window, coalesced count, first message, first date, last date]
+        self.__groups: dict[tuple, list] = {}
+        self.__summaries: list[tuple] = []
+        self.__next_sweep = time.monotonic() + min(self.window, 1.0)
+        self.__stats = {"written": 0, "sampled": 0, "coalesced": 0, "summaries": 0}
+
+    def stats(self) -> dict:
+        with self.__lock:
+            return {"groups": len(self.__groups), **self.__stats}
+
+    def check(self, level: int, module: str, msg: str) -> bool:
+        """
+        Decides whether a record is written.
+
+        Returns:
+            bool: True if the record should be written, False if it was sampled out or coalesced.
+        """
+        sample_rate = self.sample_rate.get(level, 1.0) if isinstance(self.sample_rate, dict) else self.sample_rate
+        if sample_rate < 1.0 and random.random() >= sample_rate:
+            with self.__lock:
+                self.__stats["sampled"] += 1
+            return False
+        if self.limit is None:
+            with self.__lock:
+                self.__stats["written"] += 1
+            return True
+
+        key = (module, level, _fingerprint_digits.sub("#", msg))
+        now = time.monotonic()
+        with self.__lock:
+            group = self.__groups.get(key)
+            if group is None or now - group[0] >= self.window:
+                if group is not None:
+                    self.__close_group(key, group)
+                elif len(self.__groups) >= self.max_groups:
+                    self.__sweep(now, is_force=False)
+                    if len(self.__groups) >= self.max_groups:
+                        self.__sweep(now, is_force=True)
+                group = self.__groups[key] = [now, 0, 0, None, None, None]
+            if group[1] < self.limit:
+                group[1] += 1
+                self.__stats["written"] += 1
+                return True
+            log_date = datetime.now()
+            if group[2] == 0:
+                group[3], group[4] = msg, log_date
+            group[2] += 1
+            group[5] = log_date
+            self.__stats["coalesced"] += 1
+            return False
+
+    def pop_summaries(self, is_force: bool = False) -> list[tuple]:
+        """
+        Returns the summary records of groups whose window ended.
+
+        Args:
+            is_force (bool, optional): If True, every group with coalesced records is summarized, e.g. before shutdown.
+
+        Returns:
+            list[tuple]: `(level, first_date, module, message, "", repeat_count, last_date)` records.
+        """
+        now = time.monotonic()
+        if not is_force and now < self.__next_sweep and not self.__summaries:
+            return []
+        with self.__lock:
+            if is_force or now >= self.__next_sweep:
+                self.__sweep(now, is_force)
+                self.__next_sweep = now + min(self.window, 1.0)
+            summaries, self.__summaries = self.__summaries, []
+            return summaries
+
+    def __sweep(self, now: float, is_force: bool) -> None:
+        for key, group in list(self.__groups.items()):
+            if is_force or now - group[0] >= self.window:
+                self.__close_group(key, group)
+                del self.__groups[key]
+
+    def __close_group(self, key: tuple, group: list) -> None:
+        if group[2]:
+            module, level, _ = key
+            self.__summaries.append((level, group[4], module, group[3], "", group[2], group[5]))
+            self.__stats["summaries"] += 1
+
+
+def get_log_insert(records: list[tuple]) -> tuple[str, tuple]:
+    """
+    Builds one multi-row INSERT for log records.
+    Plain records are `(level, date, module, message, traceback)`; if a summary record from `LogLimiter.pop_summaries()`
+    is among them, every row also gets `repeat_count` and `last_date` (plain records get 1 and NULL).
+    A `date` of None is filled with the server time (`NOW()`), a datetime is written as is.
+    """
+    if all(len(record) == 5 for record in records):
+        return (
+            "INSERT INTO logs (level_id, date, module, message, traceback) VALUES "
+            + ", ".join(["(%s, COALESCE(%s, NOW()), %s, %s, %s)"] * len(records)),
+            tuple(value for record in records for value in record)
+        )
+    return (
+        "INSERT INTO logs (level_id, date, module, message, traceback, repeat_count, last_date) VALUES "
+        + ", ".join(["(%s, COALESCE(%s, NOW()), %s, %s, %s, %s, %s)"] * len(records)),
+        tuple(value for record in records for value in (record if len(record) == 7 else (*record, 1, None)))
+    )
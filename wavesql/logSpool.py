@@ -0,0 +1,399 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import atexit
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .errors import PoolTimeoutError
+from .lazyImport import LazyModule
+
+try:
+    import fcntl
+except ImportError:
+    # * Windows: a byte-range lock on the first byte of the segment
+    fcntl = None
+    import msvcrt
+
+mysql_connector = LazyModule("mysql.connector")
+
+_SEGMENT_MAGIC = b"WSLS"
+_SEGMENT_SUFFIX = ".wslog"
+# * magic, replayed offset, reserved
+_SEGMENT_HEADER = struct.Struct("<4sI8x")
+# * payload length, crc32 of the payload
+_RECORD_HEADER = struct.Struct("<II")
+_QUARANTINE_NAME = "quarantine.jsonl"
+# * CR_CONN_HOST_ERROR, CR_SERVER_GONE_ERROR, CR_SERVER_LOST, CR_SERVER_LOST_EXTENDED
+_CONNECTION_ERRNOS = frozenset((2003, 2006, 2013, 2055))
+
+
+def is_connection_error(err: BaseException) -> bool:
+    """
+    True if `err` means the database could not be reached (refused or lost connection, no free pooled connection),
+    so saving the same records later may succeed. Other errors (a value too long for its column, a missing column)
+    would fail again for the same records and must not be spooled.
+    """
+    if isinstance(err, (OSError, PoolTimeoutError)):
+        return True
+    # * checked only after a failed query, so the connector is already imported
+    return isinstance(err, (mysql_connector.InterfaceError, mysql_connector.OperationalError)) and err.errno in _CONNECTION_ERRNOS
+
+
+def try_lock_file(file) -> bool:
+    """Takes an exclusive lock on an open file without waiting, released when the file is closed. Returns False if another handle holds it."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def dump_log_record(record: tuple) -> str:
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in record]
+    return json.dumps(values, ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_log_record(record: tuple) -> bytes:
+    payload = dump_log_record(record).encode("utf-8")
+    return _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_log_record(payload: bytes) -> tuple:
+    values = json.loads(payload)
+    # * date (and last_date of a summary record) keep the time the record was logged
+    values[1] = datetime.fromisoformat(values[1])
+    if len(values) > 6 and values[6] is not None:
+        values[6] = datetime.fromisoformat(values[6])
+    return tuple(values)
+
+
+class LogSpool:
+    """Append-only local spool for log records that could not be saved to the database.\n
+    Records are written to memory-mapped segment files of `segment_size` bytes in `directory`
+    (`000000000001.wslog`, ...), each one prefixed with its length and CRC32. The mapped pages are flushed to disk
+    (`msync`) every `fsync_every` records or `fsync_interval` seconds, by `sync()` and by `close()`, which is also registered with `atexit`.
+    `replay_batches()` reads spooled records in order and deletes a segment once all of its records were handed out;
+    the replayed offset is kept in the segment header, so a replay interrupted by an error continues where it stopped.
+    A torn record at the end of a segment (crash during a write) fails its CRC check and ends the segment.
+    Several processes may share `directory`: a segment is created exclusively (`O_EXCL`) and locked while its process writes to it,
+    and replay only takes segments whose lock it gets, so a segment is never truncated or replayed under its writer.
+    Records the database rejects are moved out of the replay with `quarantine()`, so they don't hold back the records behind them.
+
+    Example:\n
+        spool = LogSpool("logs_spool")
+        spool.append((8, datetime.now(), "API", "Database is down", ""))
+        for records in spool.replay_batches(500):
+            save(records)  # raises to keep the batch spooled
+    """
+    def __init__(
+        self, directory: Path | str, segment_size: int = 4 * 1024 * 1024, fsync_interval: float = 1.0, fsync_every: int = 100
+    ) -> None:
+        if not isinstance(segment_size, int) or segment_size <= _SEGMENT_HEADER.size + _RECORD_HEADER.size:
+            raise ValueError(f"Expected 'segment_size' to be an int larger than {_SEGMENT_HEADER.size + _RECORD_HEADER.size}, but got: {segment_size!r}")
+        self.directory = Path(directory)
+        self.quarantine_path = self.directory / _QUARANTINE_NAME
+        self.segment_size = segment_size
+        self.fsync_interval = fsync_interval
+        self.fsync_every = fsync_every
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.__lock = threading.Lock()
+        self.__replay_lock = threading.Lock()
+        self.__file = None
+        self.__mmap: mmap.mmap | None = None
+        self.__offset = 0
+        self.__unsynced = 0
+        self.__last_sync = time.monotonic()
+        self.__stats = {"spooled": 0, "replayed": 0, "segments": 0, "syncs": 0, "quarantined": 0}
+        # * segments left by a previous process are replayed first, new records go to the next one
+        self.__seq = self.__last_seq()
+        atexit.register(self.close)
+
+    @property
+    def has_pending(self) -> bool:
+        with self.__lock:
+            if self.__mmap is not None and self.__offset > _SEGMENT_HEADER.size:
+                return True
+        current = self.__current_stem()
+        # * a segment another process still writes to is its own to replay
+        return any(path.stem != current and self.__is_unlocked(path) for path in self.__segment_paths())
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Number of `pending_segments` on disk and cumulative `spooled`, `replayed`, `segments`, `syncs` and `quarantined` counters.
+        """
+        with self.__lock:
+            return {"pending_segments": len(self.__segment_paths()), **self.__stats}
+
+    def append(self, *records: tuple) -> None:
+        """
+        Appends records to the current segment, starting a new one when it is full.
+
+        Args:
+            *records (tuple): `(level, date, module, message, traceback)` records (or summary records with `repeat_count` and `last_date`).
+        """
+        data = [encode_log_record(record) for record in records]
+        with self.__lock:
+            for item in data:
+                if self.__mmap is None or self.__offset + len(item) > len(self.__mmap):
+                    self.__rotate(len(item))
+                self.__mmap[self.__offset:self.__offset + len(item)] = item
+                self.__offset += len(item)
+            self.__stats["spooled"] += len(data)
+            self.__unsynced += len(data)
+            if self.__unsynced >= self.fsync_every or time.monotonic() - self.__last_sync >= self.fsync_interval:
+                self.__sync()
+
+    def quarantine(self, *records: tuple) -> None:
+        """
+        Appends records the database rejected to `quarantine.jsonl` in the spool directory, one JSON array per line,
+        to be inspected and inserted by hand. They are not replayed again.
+
+        Args:
+            *records (tuple): Records as yielded by `replay_batches()`.
+        """
+        data = "".join(dump_log_record(record) + "\n" for record in records)
+        with self.__lock:
+            # * one append-mode write, so lines of processes sharing the directory don't interleave
+            with open(self.quarantine_path, "a", encoding="utf-8") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            self.__stats["quarantined"] += len(records)
+
+    def sync(self) -> None:
+        """Flushes records appended since the last flush to disk."""
+        with self.__lock:
+            if self.__unsynced:
+                self.__sync()
+
+    def replay_batches(self, batch_size: int = 500) -> Iterator[list[tuple]]:
+        """
+        Yields spooled records in lists of up to `batch_size`, oldest first.
+        A batch counts as replayed when the next one is requested (or the loop ends); if the consumer raises,
+        the batch stays in the spool. The current segment is replayed last, records appended meanwhile go to a new one.
+        Segments locked by another process (being written or replayed there) are skipped.
+
+        Args:
+            batch_size (int, optional): Maximum records per batch.
+
+        Yields:
+            list[tuple]: Records with their original timestamps.
+        """
+        if not self.__replay_lock.acquire(blocking=False):
+            return
+        try:
+            for path in self.__closed_segment_paths(is_close_current=False):
+                yield from self.__replay_segment(path, batch_size)
+            # * the current segment is closed only once the older ones went through, so an outage doesn't rotate it every round
+            for path in self.__closed_segment_paths(is_close_current=True):
+                yield from self.__replay_segment(path, batch_size)
+        finally:
+            self.__replay_lock.release()
+
+    def close(self) -> None:
+        """Flushes and closes the current segment. Appending opens a new one."""
+        with self.__lock:
+            self.__close_segment()
+        atexit.unregister(self.close)
+
+    def __replay_segment(self, path: Path, batch_size: int) -> Iterator[list[tuple]]:
+        try:
+            file = open(path, "r+b")
+        except FileNotFoundError:
+            # * replayed and deleted by another process
+            return
+        with file:
+            if not try_lock_file(file):
+                return
+            # * deleted by another process between opening and locking it, or not sized yet by its writer
+            stat = os.fstat(file.fileno())
+            if stat.st_nlink == 0 or stat.st_size < _SEGMENT_HEADER.size:
+                return
+            with mmap.mmap(file.fileno(), 0) as segment:
+                magic, offset = _SEGMENT_HEADER.unpack_from(segment, 0)
+                # * created by another process that didn't lock and write the header yet
+                if magic == bytes(len(_SEGMENT_MAGIC)):
+                    return
+                yield from self.__replay_records(segment, magic, offset, batch_size)
+            if fcntl is not None:
+                # * deleted while still locked, so no other process reuses the name in between
+                path.unlink()
+                return
+        # * Windows can't delete an open file
+        path.unlink(missing_ok=True)
+
+    def __replay_records(self, segment: mmap.mmap, magic: bytes, offset: int, batch_size: int) -> Iterator[list[tuple]]:
+        if magic != _SEGMENT_MAGIC:
+            offset = len(segment)
+        offset = max(offset, _SEGMENT_HEADER.size)
+        while True:
+            batch, end = self.__read_records(segment, offset, batch_size)
+            if not batch:
+                break
+            yield batch
+            # * the consumer asked for more, so the batch was saved
+            _SEGMENT_HEADER.pack_into(segment, 0, _SEGMENT_MAGIC, end)
+            segment.flush()
+            offset = end
+            with self.__lock:
+                self.__stats["replayed"] += len(batch)
+
+    @staticmethod
+    def __read_records(segment: mmap.mmap, offset: int, batch_size: int) -> tuple[list[tuple], int]:
+        records = []
+        while len(records) < batch_size and offset + _RECORD_HEADER.size <= len(segment):
+            length, crc = _RECORD_HEADER.unpack_from(segment, offset)
+            start = offset + _RECORD_HEADER.size
+            if length == 0 or start + length > len(segment):
+                break
+            payload = segment[start:start + length]
+            if zlib.crc32(payload) != crc:
+                break
+            records.append(decode_log_record(payload))
+            offset = start + length
+        return records, offset
+
+    def __closed_segment_paths(self, is_close_current: bool) -> list[Path]:
+        with self.__lock:
+            if is_close_current and self.__mmap is not None and self.__offset > _SEGMENT_HEADER.size:
+                self.__close_segment()
+            current = self.__current_stem()
+            return [path for path in self.__segment_paths() if path.stem != current]
+
+    def __segment_paths(self) -> list[Path]:
+        return sorted(path for path in self.directory.glob(f"*{_SEGMENT_SUFFIX}") if path.stem.isdigit())
+
+    def __last_seq(self) -> int:
+        return max((int(path.stem) for path in self.__segment_paths()), default=0)
+
+    @staticmethod
+    def __is_unlocked(path: Path) -> bool:
+        try:
+            with open(path, "rb") as file:
+                return try_lock_file(file)
+        except FileNotFoundError:
+            return False
+
+    def __current_stem(self) -> str | None:
+        return f"{self.__seq:012d}" if self.__mmap is not None else None
+
+    def __rotate(self, min_size: int) -> None:
+        self.__close_segment()
+        size = max(self.segment_size, _SEGMENT_HEADER.size + min_size)
+        while True:
+            self.__seq += 1
+            try:
+                # * "x" never truncates a segment another process created under the same number
+                self.__file = open(self.directory / f"{self.__seq:012d}{_SEGMENT_SUFFIX}", "x+b")
+                break
+            except FileExistsError:
+                self.__seq = max(self.__seq, self.__last_seq())
+        # * held until the segment is closed, replay skips segments it can't lock
+        while not try_lock_file(self.__file):
+            time.sleep(0.001)
+        self.__file.truncate(size)
+        self.__mmap = mmap.mmap(self.__file.fileno(), size)
+        _SEGMENT_HEADER.pack_into(self.__mmap, 0, _SEGMENT_MAGIC, _SEGMENT_HEADER.size)
+        self.__offset = _SEGMENT_HEADER.size
+        self.__stats["segments"] += 1
+
+    def __close_segment(self) -> None:
+        if self.__mmap is None:
+            return
+        self.__sync()
+        is_empty = self.__offset <= _SEGMENT_HEADER.size
+        self.__mmap.close()
+        self.__file.close()
+        if is_empty:
+            os.remove(self.__file.name)
+        self.__mmap = self.__file = None
+
+    def __sync(self) -> None:
+        self.__mmap.flush()
+        self.__unsynced = 0
+        self.__last_sync = time.monotonic()
+        self.__stats["syncs"] += 1
+
+
+class LogSpoolReplayer:
+    """Background thread that replays a `LogSpool` into the database.\n
+    Every `interval` seconds the spool is flushed and, if it holds records, they are passed to `write_batch`
+    in batches of `batch_size`. `on_replayed` is called after the spool was emptied, `on_error` when a batch failed
+    (the batch stays spooled and is retried on the next round). `write_batch` deals with records the database rejects
+    (see `LogSpool.quarantine()`) and only raises when the batch should be retried.
+    """
+    def __init__(
+        self, spool: LogSpool, write_batch: Callable[[list[tuple]], None], on_replayed: Callable[[], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None, interval: float = 5.0, batch_size: int = 500
+    ) -> None:
+        self.spool = spool
+        self.write_batch = write_batch
+        self.on_replayed = on_replayed
+        self.on_error = on_error
+        self.interval = interval
+        self.batch_size = batch_size
+
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, name="WaveSQL-LogSpoolReplayer", daemon=True)
+
+    def start(self) -> None:
+        if not self.__thread.is_alive() and not self.__stop.is_set():
+            self.__thread.start()
+
+    def close(self, timeout: float | None = None) -> None:
+        self.__stop.set()
+        if self.__thread.is_alive():
+            self.__thread.join(timeout)
+
+    def __run(self) -> None:
+        while not self.__stop.wait(self.interval):
+            self.spool.sync()
+            if not self.spool.has_pending:
+                continue
+            try:
+                for records in self.spool.replay_batches(self.batch_size):
+                    # * leaving before the write keeps the batch spooled, leaving after it would replay it twice
+                    if self.__stop.is_set():
+                        break
+                    self.write_batch(records)
+            except Exception as err:
+                if self.on_error is not None:
+                    try:
+                        self.on_error(err)
+                    except Exception:
+                        pass
+                continue
+            if self.on_replayed is not None and not self.spool.has_pending:
+                self.on_replayed()
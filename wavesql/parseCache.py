@@ -0,0 +1,146 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import os
+import pickle
+import threading
+
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from .lazyImport import LazyModule
+
+# * imports OpenSSL bindings, only needed once a SQL file is read
+hashlib = LazyModule("hashlib")
+
+PARSE_CACHE_NAME = ".wavesql_parse_cache.pickle"
+_PARSE_CACHE_VERSION = 1
+
+T = TypeVar("T")
+
+
+@functools.cache
+def get_generator_fingerprint() -> str:
+    """Hash of the modules that parse SQL and generate bridge code, so an upgrade of WaveSQL invalidates the cache."""
+    digest = hashlib.blake2b(str(_PARSE_CACHE_VERSION).encode(), digest_size=16)
+    for name in ("sqlFileObject.py", "constants.py"):
+        digest.update(Path(__file__).with_name(name).read_bytes())
+    return digest.hexdigest()
+
+
+def get_content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ParseCache:
+    """On-disk cache of parsed SQL files (`SqlFileObject.sql_objects`, `SqlFileQueries.sql_queries` with their generated bridge code).\n
+    Entries are keyed by the absolute file path and hold the parse options, the file's mtime/size and a content hash.
+    A file whose mtime and size didn't change is not even read; a touched file is read and hashed and only
+    parsed again if its content or the parse options changed. The cache is a pickle file (by default `.wavesql_parse_cache.pickle`
+    in the SQL directory), written atomically by `save()` with the entries used since it was loaded.
+    A missing, unreadable or outdated cache file is ignored. Only use it in a directory that is as trusted as the SQL files themselves.
+
+    Example:\n
+        cache = ParseCache(Path("sql") / PARSE_CACHE_NAME)
+        queries = SqlFileQueries(path=Path("sql") / "queries.sql", create_python=True, parse_cache=cache)
+        cache.save()
+    """
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+
+        self.__lock = threading.Lock()
+        self.__entries: dict[str, dict] | None = None
+        self.__used: set[str] = set()
+        self.__is_dirty = False
+
+    def load(self, file_path: Path | str, options: tuple, parse: Callable[[str], T]) -> T:
+        """
+        Returns the cached result for a file, or parses it and stores the result.
+
+        Args:
+            file_path (Path | str): SQL file.
+            options (tuple): Everything besides the file content the result depends on (template values, flags); must be picklable.
+            parse (Callable[[str], T]): Parses the file content.
+
+        Returns:
+            T: Result of `parse` for the current file content and options.
+
+        Raises:
+            OSError: If the file can't be read.
+        """
+        key = str(Path(file_path).resolve())
+        stat = os.stat(key)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        with self.__lock:
+            entry = self.__get_entries().get(key)
+            self.__used.add(key)
+            if entry is not None and entry["options"] == options and entry["stat"] == stat_key:
+                return entry["value"]
+
+        with open(key, "rb") as file:
+            data = file.read()
+        content_hash = get_content_hash(data)
+        if entry is not None and entry["options"] == options and entry["hash"] == content_hash:
+            value = entry["value"]
+        else:
+            value = parse(data.decode("utf-8"))
+        with self.__lock:
+            self.__get_entries()[key] = {"options": options, "stat": stat_key, "hash": content_hash, "value": value}
+            self.__is_dirty = True
+        return value
+
+    def save(self) -> bool:
+        """
+        Writes the cache file if anything changed. Errors (e.g. a read-only directory) are ignored.
+
+        Returns:
+            bool: True if the file was written.
+        """
+        with self.__lock:
+            if not self.__is_dirty:
+                return False
+            entries = {key: entry for key, entry in self.__get_entries().items() if key in self.__used}
+            self.__is_dirty = False
+        data = {"version": get_generator_fingerprint(), "entries": entries}
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as file:
+                pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+            # * several processes may start at once, each one replaces the file as a whole
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+        return True
+
+    def __get_entries(self) -> dict[str, dict]:
+        if self.__entries is None:
+            self.__entries = {}
+            try:
+                with open(self.path, "rb") as file:
+                    data: dict[str, Any] = pickle.load(file)
+                if data.get("version") == get_generator_fingerprint():
+                    self.__entries = data["entries"]
+            except Exception:
+                pass
+        return self.__entries
@@ -7,7 +7,7 @@
 # License: Apache-2.0 (see https://www.apache.org/licenses/LICENSE-2.0)
 
 from wavesql.sync import WaveSQL
-from typing import Literal
+from typing import Literal, Any, NamedTuple, Iterable, Iterator
 from datetime import datetime
 from pathlib import Path
 
@@ -18,7 +18,21 @@ class DataBase(WaveSQL):
         is_console_log: bool = False, is_log_backtrace: bool = False, raise_log_on_fail: bool = False,
         is_pprint: bool = False, is_protected: bool = True, is_auto_start: bool = False, is_try_update_db: bool = False,
         is_create_python_bridge: bool = False, is_try_update_python_bridge: bool = True, default_log_sep: str = " ",
-        default_log_module: str = "DATABASE", default_log_level: int | Literal[1, 2, 3, 4, 5, 6, 7, 8, 9] = 1
+        default_log_module: str = "DATABASE", default_log_level: int | Literal[1, 2, 3, 4, 5, 6, 7, 8, 9] = 1,
+        is_pool: bool = True, pool_min_size: int = 1, pool_max_size: int = 10,
+        pool_max_idle_time: float | None = 300.0, pool_timeout: float | None = 30.0,
+        is_log_writer: bool = False, log_batch_size: int = 100, log_flush_interval: float = 1.0,
+        log_queue_size: int = 10000, log_queue_policy: Literal["block", "drop"] = "block",
+        is_prepared: bool = False, prepared_cache_size: int = 100, bulk_chunk_size: int = 1000,
+        stream_chunk_size: int = 1000,
+        is_result_cache: bool = False, result_cache_size: int = 1024, result_cache_ttl: float | None = 60.0,
+        is_row_class: bool = False,
+        log_rate_limit: int | None = None, log_rate_window: float = 60.0, log_sample_rate: float | dict[int, float] = 1.0,
+        is_log_partitioning: bool = False, log_partition_days_ahead: int = 7,
+        is_log_archiver: bool = False, log_archive_interval: float = 86400.0, log_archive_batch_size: int = 5000,
+        log_archive_sleep: float = 0.1, log_keep_days: int = 30, log_archive_days: int = 60,
+        log_spool_path: Path | str | None = None, log_spool_segment_size: int = 4194304, log_spool_fsync_interval: float = 1.0,
+        log_spool_replay_interval: float = 5.0, is_parse_cache: bool = True, migration_lock_timeout: int = 60
     ) -> None:
         super().__init__(
             config=config, path_to_sql=path_to_sql, is_dictionary=is_dictionary,
@@ -26,5 +40,20 @@ class DataBase(WaveSQL):
             is_pprint=is_pprint, is_protected=is_protected, is_auto_start=is_auto_start,
             is_try_update_db=is_try_update_db, is_create_python_bridge=is_create_python_bridge,
             is_try_update_python_bridge=is_try_update_python_bridge, default_log_sep=default_log_sep,
-            default_log_module=default_log_module, default_log_level=default_log_level
+            default_log_module=default_log_module, default_log_level=default_log_level,
+            is_pool=is_pool, pool_min_size=pool_min_size, pool_max_size=pool_max_size,
+            pool_max_idle_time=pool_max_idle_time, pool_timeout=pool_timeout,
+            is_log_writer=is_log_writer, log_batch_size=log_batch_size, log_flush_interval=log_flush_interval,
+            log_queue_size=log_queue_size, log_queue_policy=log_queue_policy,
+            is_prepared=is_prepared, prepared_cache_size=prepared_cache_size, bulk_chunk_size=bulk_chunk_size,
+            stream_chunk_size=stream_chunk_size,
+            is_result_cache=is_result_cache, result_cache_size=result_cache_size, result_cache_ttl=result_cache_ttl,
+            is_row_class=is_row_class,
+            log_rate_limit=log_rate_limit, log_rate_window=log_rate_window, log_sample_rate=log_sample_rate,
+            is_log_partitioning=is_log_partitioning, log_partition_days_ahead=log_partition_days_ahead,
+            is_log_archiver=is_log_archiver, log_archive_interval=log_archive_interval, log_archive_batch_size=log_archive_batch_size,
+            log_archive_sleep=log_archive_sleep, log_keep_days=log_keep_days, log_archive_days=log_archive_days,
+            log_spool_path=log_spool_path, log_spool_segment_size=log_spool_segment_size, log_spool_fsync_interval=log_spool_fsync_interval,
+            log_spool_replay_interval=log_spool_replay_interval, is_parse_cache=is_parse_cache,
+            migration_lock_timeout=migration_lock_timeout
         )
@@ -0,0 +1,144 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable
+
+
+class ResultCache:
+    """In-process LRU + TTL cache of query results with table-based invalidation.\n
+    Every entry is tagged with the tables its query reads; `invalidate()` drops all entries of the written tables.
+    Results are copied on the way in and out, so callers may modify what they get back.
+    The cache is guarded by a lock and is shared by `WaveSQL` (threads) and `AsyncWaveSQL` (no awaits inside).
+    """
+    def __init__(self, max_size: int = 1024, ttl: float | None = 60.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.__lock = threading.Lock()
+        self.__entries: OrderedDict[Hashable, tuple[float | None, Any, tuple[str, ...]]] = OrderedDict()
+        self.__tables: dict[str, set[Hashable]] = {}
+        self.__generation = 0
+        self.__stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def stats(self) -> dict:
+        with self.__lock:
+            return {"size": len(self.__entries), "max_size": self.max_size, **self.__stats}
+
+    def get(self, key: Hashable) -> tuple[bool, Any, int]:
+        """
+        Looks up a cached result.
+
+        Args:
+            key (Hashable): Cache key of the query.
+
+        Returns:
+            tuple[bool, Any, int]: Whether it was a hit, a copy of the result and the generation to pass to `set()` on a miss.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                expires_at, value, _ = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self.__entries.move_to_end(key)
+                    self.__stats["hits"] += 1
+                    return True, self.__copy(value), self.__generation
+                self.__remove(key)
+                self.__stats["expirations"] += 1
+            self.__stats["misses"] += 1
+            return False, None, self.__generation
+
+    def set(self, key: Hashable, value: Any, tables: Iterable[str], generation: int | None = None) -> bool:
+        """
+        Stores a result, evicting the least recently used entries above `max_size`.
+
+        Args:
+            key (Hashable): Cache key of the query.
+            value (Any): Query result.
+            tables (Iterable[str]): Tables the query reads.
+            generation (int, optional): Generation returned by the `get()` that missed. If any invalidation happened
+                since then, the result may already be stale and is not stored.
+
+        Returns:
+            bool: True if the result was stored.
+        """
+        tables = tuple(normalize_table_name(table) for table in tables)
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        with self.__lock:
+            if generation is not None and generation != self.__generation:
+                return False
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = (expires_at, self.__copy(value), tables)
+            for table in tables:
+                self.__tables.setdefault(table, set()).add(key)
+            while len(self.__entries) > self.max_size:
+                self.__remove(next(iter(self.__entries)))
+                self.__stats["evictions"] += 1
+            return True
+
+    def invalidate(self, tables: Iterable[str] | None = None) -> int:
+        """
+        Drops every entry that reads one of `tables`, or all entries if `tables` is None.
+
+        Returns:
+            int: Number of dropped entries.
+        """
+        with self.__lock:
+            self.__generation += 1
+            if tables is None:
+                count = len(self.__entries)
+                self.__entries.clear()
+                self.__tables.clear()
+            else:
+                keys = set()
+                for table in tables:
+                    keys.update(self.__tables.get(normalize_table_name(table), ()))
+                for key in keys:
+                    self.__remove(key)
+                count = len(keys)
+            self.__stats["invalidations"] += count
+            return count
+
+    def __remove(self, key: Hashable) -> None:
+        _, _, tables = self.__entries.pop(key)
+        for table in tables:
+            keys = self.__tables.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.__tables[table]
+
+    @staticmethod
+    def __copy(value: Any) -> Any:
+        if isinstance(value, list):
+            return [dict(row) if isinstance(row, dict) else row for row in value]
+        if isinstance(value, dict):
+            return dict(value)
+        return value
+
+
+def normalize_table_name(table: str) -> str:
+    return table.strip("`").rsplit(".", 1)[-1].strip("`").lower()
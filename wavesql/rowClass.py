@@ -0,0 +1,49 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+
+from collections import namedtuple
+from typing import Iterable, Sequence
+
+
+@functools.lru_cache(maxsize=1024)
+def get_row_class(column_names: tuple[str, ...]) -> type[tuple]:
+    """
+    Returns a named tuple class for rows with the given columns, created once per column list.
+    Column names that are not valid identifiers (`COUNT(*)`, duplicates) become positional names like `_0`.
+    """
+    return namedtuple("Row", column_names, rename=True)
+
+
+def resolve_row_class(row_class: type[tuple] | bool, column_names: Sequence[str]) -> type[tuple]:
+    if row_class is True:
+        return get_row_class(tuple(column_names))
+    return row_class
+
+
+def make_row(row_class: type[tuple], row: Sequence | None) -> tuple | None:
+    if row is None:
+        return None
+    # * tuple.__new__ skips the generated __new__, the row is already in column order
+    return tuple.__new__(row_class, row)
+
+
+def make_rows(row_class: type[tuple], rows: Iterable[Sequence]) -> list[tuple]:
+    return list(map(functools.partial(tuple.__new__, row_class), rows))
@@ -0,0 +1,104 @@
+# Copyright 2025 eelus1ve and the WaveTeam
+#
+# GitHub (author): https://github.com/eelus1ve
+# GitHub (organization): https://github.com/WaveTeamDevs
+# Repository: https://github.com/WaveTeamDevs/WaveSQL
+# Website: https://waveteam.net
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from .constants import PATH_LOG_INIT_SCRIPT
+from .lazyImport import LazyModule
+from .parseCache import get_content_hash
+from .sqlFileObject import SqlFileObject
+
+hashlib = LazyModule("hashlib")
+
+MIGRATION_INSERT = "INSERT INTO wavesql_migrations (number, name, checksum, schema_checksum) VALUES (%s, %s, %s, %s)"
+MIGRATION_LOOKUP = "SELECT 1 FROM wavesql_migrations WHERE schema_checksum = %s LIMIT 1"
+# * the latest row takes the combined checksum of the files as they are now, after a changed file was reported
+MIGRATION_ACKNOWLEDGE = "UPDATE wavesql_migrations SET schema_checksum = %s ORDER BY id DESC LIMIT 1"
+
+# * `(kind, name)` of every part of the log schema an older WaveSQL didn't create, no rows means the schema is current
+LOG_SCHEMA_LOOKUP = (
+    "SELECT 'columns', TABLE_NAME FROM information_schema.TABLES AS t "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ('logs', 'archived_logs', 'logs_exchange') AND NOT EXISTS ("
+    "SELECT 1 FROM information_schema.COLUMNS AS c "
+    "WHERE c.TABLE_SCHEMA = t.TABLE_SCHEMA AND c.TABLE_NAME = t.TABLE_NAME AND c.COLUMN_NAME = 'repeat_count') "
+    "UNION ALL SELECT 'table', 'log_archive_runs' FROM DUAL WHERE NOT EXISTS ("
+    "SELECT 1 FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'log_archive_runs') "
+    "UNION ALL SELECT 'procedure', 'archive_logs' FROM DUAL WHERE NOT EXISTS ("
+    "SELECT 1 FROM information_schema.ROUTINES WHERE ROUTINE_SCHEMA = DATABASE() AND ROUTINE_TYPE = 'PROCEDURE' AND ROUTINE_NAME = 'archive_logs') "
+    # * the event of the partitioned schema (rotate_logs) replaces delete_old_logs, a dropped event is not recreated
+    "UNION ALL SELECT 'event', EVENT_NAME FROM information_schema.EVENTS "
+    "WHERE EVENT_SCHEMA = DATABASE() AND EVENT_NAME = 'delete_old_logs' AND LOCATE('archive_logs', EVENT_DEFINITION) = 0"
+)
+LOG_COLUMNS_UPGRADE = "ALTER TABLE {table} ADD COLUMN repeat_count INT UNSIGNED NOT NULL DEFAULT 1, ADD COLUMN last_date TIMESTAMP NULL DEFAULT NULL"
+_LOG_UPGRADE_ORDER = ("columns", "table", "procedure", "event")
+
+
+class Migration(NamedTuple):
+    number: int
+    name: str
+    path: Path
+    checksum: str
+
+
+def get_migrations(path_to_sql: Path) -> list[Migration]:
+    """
+    Returns the `*_init_*.sql` files of `path_to_sql` numbered 0 and up with the hash of their content, in the order they are applied.
+    Files with negative numbers belong to WaveSQL: they create the database and are not migrated.
+    """
+    migrations = []
+    for path in path_to_sql.rglob("*_init_*.sql"):
+        number = int(path.name.split("_")[0])
+        if number >= 0:
+            migrations.append(Migration(number, path.name, path, get_content_hash(path.read_bytes())))
+    return sorted(migrations)
+
+
+def get_schema_checksum(checksums: dict[str, tuple[int, str]]) -> str:
+    """
+    Combines the checksums of a set of files (name -> (number, checksum)) into one, the key `migrate()` looks up to skip all work.
+    Every row of `wavesql_migrations` stores the combined checksum of the files recorded up to and including it,
+    with the current checksum of recorded files whose change was already reported.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for name, (number, checksum) in sorted(checksums.items(), key=lambda item: (item[1][0], item[0])):
+        digest.update(f"{number}:{name}:{checksum}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_log_upgrades(missing: Iterable[tuple[str, str]], dict_of_values: dict) -> list[str]:
+    """
+    Returns the statements that bring the log schema of a database created by an older WaveSQL up to date,
+    for the `(kind, name)` rows of `LOG_SCHEMA_LOOKUP`. `-1_init_logs.sql` only runs when the database is created,
+    so columns added to it later are added to existing tables here, and missing tables, procedures and outdated events
+    are created from the bundled `-1_init_logs.sql` (parsed only if needed).
+    """
+    statements = []
+    objects: dict[str, str] | None = None
+    for kind, name in sorted(missing, key=lambda row: _LOG_UPGRADE_ORDER.index(row[0])):
+        if kind == "columns":
+            statements.append(LOG_COLUMNS_UPGRADE.format(table=name))
+            continue
+        if objects is None:
+            sql_objects = SqlFileObject(path=PATH_LOG_INIT_SCRIPT, dict_of_values=dict_of_values).sql_objects
+            objects = {" ".join(sql_object.code.split()[:3]): sql_object.code for sql_object in sql_objects}
+        if kind == "event":
+            statements.append(f"DROP EVENT IF EXISTS {name}")
+        statements.append(objects[f"CREATE {kind.upper()} {name}"])
+    return statements
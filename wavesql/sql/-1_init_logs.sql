@@ -64,6 +64,8 @@ CREATE TABLE logs (
     module VARCHAR(255) NOT NULL DEFAULT "DATABASE",
     message TEXT,
     traceback TEXT,
+    repeat_count INT UNSIGNED NOT NULL DEFAULT 1,
+    last_date TIMESTAMP NULL DEFAULT NULL,
     INDEX(level_id),
     INDEX(date),
     INDEX(module),
@@ -80,6 +82,8 @@ CREATE TABLE archived_logs (
     module VARCHAR(255) NOT NULL DEFAULT "DATABASE",
     message TEXT,
     traceback TEXT,
+    repeat_count INT UNSIGNED NOT NULL DEFAULT 1,
+    last_date TIMESTAMP NULL DEFAULT NULL,
     INDEX(level_id),
     INDEX(date),
     INDEX(module),
@@ -98,42 +102,130 @@ CREATE PROCEDURE insert_log (
     IN p_traceback TEXT
 )
 BEGIN
-    DECLARE v_log_id INT UNSIGNED;
-
-    START TRANSACTION;
-
-        IF EXISTS (
-            SELECT 1 FROM log_levels WHERE id = p_level_id LIMIT 1
-        ) THEN
-
-            INSERT INTO logs (level_id, module, message, traceback)
-            VALUES (p_level_id, p_module, p_message, p_traceback);
-
-            SELECT 
-                LAST_INSERT_ID() INTO v_log_id;
-
-            SELECT 
-                l.date AS log_date,
-                ll.name AS log_level_name,
-                lc.name AS log_level_color_name,
-                l.module AS log_module,
-                l.message AS log_message,
-                l.traceback AS log_traceback
-            FROM logs AS l
-            JOIN log_levels AS ll ON l.level_id = ll.id
-            JOIN log_colors AS lc ON lc.id = ll.color_id
-            WHERE l.id = v_log_id;
-
-        ELSE
-            SIGNAL SQLSTATE '45000'
-            SET MESSAGE_TEXT = 'The logging level was not found!';
-        END IF;
-    COMMIT;
+    INSERT INTO logs (level_id, module, message, traceback)
+    VALUES (p_level_id, p_module, p_message, p_traceback);
 END$$
 DELIMITER ;
 
 
 
+CREATE TABLE log_archive_runs (
+    id INT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    started_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMP NULL DEFAULT NULL,
+    last_id INT UNSIGNED NOT NULL DEFAULT 0,
+    batches INT UNSIGNED NOT NULL DEFAULT 0,
+    rows_moved BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    rows_purged BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    INDEX(finished_at)
+)ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_general_ci;
+
+
+DELIMITER $$
+CREATE PROCEDURE archive_logs (
+    IN p_keep_days INT,
+    IN p_archive_days INT,
+    IN p_batch_size INT,
+    IN p_sleep_seconds DOUBLE,
+    IN p_max_batches INT
+)
+archive: BEGIN
+    DECLARE v_run_id INT UNSIGNED;
+    DECLARE v_last_id INT UNSIGNED;
+    DECLARE v_batch_end INT UNSIGNED;
+    DECLARE v_rows INT;
+    DECLARE v_batches INT DEFAULT 0;
+    DECLARE v_is_moved BOOL DEFAULT FALSE;
+    DECLARE v_is_purged BOOL DEFAULT FALSE;
+    DECLARE v_cutoff TIMESTAMP DEFAULT NOW() - INTERVAL p_keep_days DAY;
+    DECLARE v_purge_cutoff TIMESTAMP DEFAULT NOW() - INTERVAL p_archive_days DAY;
+
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        DO RELEASE_LOCK('wavesql_archive_logs');
+        RESIGNAL;
+    END;
+
+    -- * one run at a time, a second caller returns immediately
+    IF GET_LOCK('wavesql_archive_logs', 0) = 0 THEN
+        LEAVE archive;
+    END IF;
+
+    -- * an unfinished run (stopped by p_max_batches or an error) is resumed from its last batch
+    SET v_run_id = (SELECT id FROM log_archive_runs WHERE finished_at IS NULL ORDER BY id DESC LIMIT 1);
+    IF v_run_id IS NULL THEN
+        INSERT INTO log_archive_runs () VALUES ();
+        SET v_run_id = LAST_INSERT_ID();
+        COMMIT;
+    END IF;
+    SET v_last_id = (SELECT last_id FROM log_archive_runs WHERE id = v_run_id);
+
+    -- * rows are moved in primary key order, each batch is a short transaction of its own
+    move_loop: WHILE p_max_batches = 0 OR v_batches < p_max_batches DO
+        SET v_batch_end = (SELECT MAX(id) FROM (SELECT id FROM logs WHERE id > v_last_id ORDER BY id LIMIT p_batch_size) AS batch);
+        IF v_batch_end IS NULL THEN
+            SET v_is_moved = TRUE;
+            LEAVE move_loop;
+        END IF;
+
+        START TRANSACTION;
+        INSERT INTO archived_logs (level_id, date, module, message, traceback, repeat_count, last_date)
+        SELECT level_id, date, module, message, traceback, repeat_count, last_date
+        FROM logs
+        WHERE id > v_last_id AND id <= v_batch_end AND date < v_cutoff
+        ORDER BY id;
+        DELETE FROM logs
+        WHERE id > v_last_id AND id <= v_batch_end AND date < v_cutoff;
+        SET v_rows = ROW_COUNT();
+        UPDATE log_archive_runs
+        SET last_id = v_batch_end, batches = batches + 1, rows_moved = rows_moved + v_rows
+        WHERE id = v_run_id;
+        COMMIT;
+
+        SET v_last_id = v_batch_end;
+        SET v_batches = v_batches + 1;
+        -- * ids grow with time, a batch with nothing to move means the rest of the table is newer
+        IF v_rows = 0 THEN
+            SET v_is_moved = TRUE;
+            LEAVE move_loop;
+        END IF;
+        DO SLEEP(p_sleep_seconds);
+    END WHILE;
+
+    purge_loop: WHILE v_is_moved AND (p_max_batches = 0 OR v_batches < p_max_batches) DO
+        START TRANSACTION;
+        DELETE FROM archived_logs
+        WHERE date < v_purge_cutoff
+        ORDER BY id
+        LIMIT p_batch_size;
+        SET v_rows = ROW_COUNT();
+        UPDATE log_archive_runs
+        SET batches = batches + 1, rows_purged = rows_purged + v_rows
+        WHERE id = v_run_id;
+        COMMIT;
+
+        SET v_batches = v_batches + 1;
+        IF v_rows < p_batch_size THEN
+            SET v_is_purged = TRUE;
+            LEAVE purge_loop;
+        END IF;
+        DO SLEEP(p_sleep_seconds);
+    END WHILE;
+
+    IF v_is_purged THEN
+        UPDATE log_archive_runs SET finished_at = NOW() WHERE id = v_run_id;
+        COMMIT;
+    END IF;
+    DO RELEASE_LOCK('wavesql_archive_logs');
+
+    SELECT id, started_at, finished_at, last_id, batches, rows_moved, rows_purged
+    FROM log_archive_runs
+    WHERE id = v_run_id;
+END$$
+DELIMITER ;
+
+
 DELIMITER $$
 
 CREATE EVENT delete_old_logs
@@ -141,18 +233,6 @@ ON SCHEDULE EVERY 1 DAY
 STARTS CURRENT_TIMESTAMP
 DO
 BEGIN
-    DECLARE CONTINUE HANDLER FOR SQLEXCEPTION
-        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Error while deleting logs';
-
-    INSERT INTO archived_logs (level_id, date, module, message, traceback)
-    SELECT level_id, date, module, message, traceback
-    FROM logs
-    WHERE date < NOW() - INTERVAL 30 DAY;
-
-    DELETE FROM logs
-    WHERE date < NOW() - INTERVAL 30 DAY;
-
-    DELETE FROM archived_logs
-    WHERE date < NOW() - INTERVAL 60 DAY;
+    CALL archive_logs(30, 60, 5000, 0.1, 0);
 END$$
 DELIMITER ;
@@ -0,0 +1,17 @@
+-- This file was automatically generated by WaveSQL.
+-- Do not edit manually unless you know what you're doing.
+--
+-- Copyright 2025 eelus1ve and the WaveTeam
+-- GitHub: https://github.com/eelus1ve
+-- Repo: https://github.com/WaveTeamDevs/WaveSQL
+-- License: Apache-2.0 (see https://www.apache.org/licenses/LICENSE-2.0)
+
+CREATE TABLE IF NOT EXISTS wavesql_migrations (
+    id INT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    number INT NOT NULL,
+    name VARCHAR(255) NOT NULL UNIQUE,
+    checksum CHAR(32) NOT NULL,
+    schema_checksum CHAR(32) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    INDEX(schema_checksum)
+)ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_general_ci;
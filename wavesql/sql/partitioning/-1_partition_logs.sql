@@ -0,0 +1,153 @@
+-- This file was automatically generated by WaveSQL.
+-- Do not edit manually unless you know what you're doing.
+--
+-- Copyright 2025 eelus1ve and the WaveTeam
+-- GitHub: https://github.com/eelus1ve
+-- Repo: https://github.com/WaveTeamDevs/WaveSQL
+-- License: Apache-2.0 (see https://www.apache.org/licenses/LICENSE-2.0)
+--
+-- Optional schema mode, applied after -1_init_logs.sql by WaveSQL(is_log_partitioning=True).
+-- `logs` and `archived_logs` are RANGE-partitioned by day: partition pYYYYMMDD holds the rows dated before the next day
+-- that no older partition holds. Retention moves whole partitions instead of copying and deleting rows.
+-- Partitioned tables can't have foreign keys and the partitioning column must be part of the primary key.
+
+ALTER TABLE logs DROP FOREIGN KEY fk_log_levels;
+
+ALTER TABLE archived_logs DROP FOREIGN KEY fk_arh_log_levels;
+
+ALTER TABLE logs
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, date)
+    PARTITION BY RANGE (UNIX_TIMESTAMP(date)) (
+        PARTITION p_future VALUES LESS THAN MAXVALUE
+    );
+
+ALTER TABLE archived_logs
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, date)
+    PARTITION BY RANGE (UNIX_TIMESTAMP(date)) (
+        PARTITION p_future VALUES LESS THAN MAXVALUE
+    );
+
+CREATE TABLE logs_exchange LIKE logs;
+
+ALTER TABLE logs_exchange REMOVE PARTITIONING;
+
+DROP EVENT IF EXISTS delete_old_logs;
+
+
+DELIMITER $$
+CREATE PROCEDURE add_log_partitions (
+    IN p_days_ahead INT
+)
+BEGIN
+    DECLARE v_day DATE DEFAULT CURDATE();
+    DECLARE v_bound BIGINT;
+    DECLARE v_last_bound BIGINT;
+
+    SELECT COALESCE(MAX(CAST(PARTITION_DESCRIPTION AS UNSIGNED)), 0) INTO v_last_bound
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'logs' AND PARTITION_DESCRIPTION <> 'MAXVALUE';
+
+    WHILE v_day <= CURDATE() + INTERVAL p_days_ahead DAY DO
+        SET v_bound = UNIX_TIMESTAMP(v_day + INTERVAL 1 DAY);
+        IF v_bound > v_last_bound THEN
+            -- * p_future is empty, so splitting it moves no rows
+            SET @wavesql_partitions = CONCAT(
+                ' REORGANIZE PARTITION p_future INTO (PARTITION p', DATE_FORMAT(v_day, '%Y%m%d'),
+                ' VALUES LESS THAN (', v_bound, '), PARTITION p_future VALUES LESS THAN MAXVALUE)'
+            );
+            SET @wavesql_sql = CONCAT('ALTER TABLE logs', @wavesql_partitions);
+            PREPARE stmt FROM @wavesql_sql;
+            EXECUTE stmt;
+            DEALLOCATE PREPARE stmt;
+            SET @wavesql_sql = CONCAT('ALTER TABLE archived_logs', @wavesql_partitions);
+            PREPARE stmt FROM @wavesql_sql;
+            EXECUTE stmt;
+            DEALLOCATE PREPARE stmt;
+            SET v_last_bound = v_bound;
+        END IF;
+        SET v_day = v_day + INTERVAL 1 DAY;
+    END WHILE;
+END$$
+DELIMITER ;
+
+
+DELIMITER $$
+CREATE PROCEDURE rotate_log_partitions (
+    IN p_keep_days INT,
+    IN p_archive_days INT
+)
+BEGIN
+    DECLARE v_partition VARCHAR(64);
+
+    -- * rows left in the exchange table by an interrupted run
+    INSERT INTO archived_logs SELECT * FROM logs_exchange;
+    TRUNCATE TABLE logs_exchange;
+
+    -- * logs -> logs_exchange -> archived_logs, each step only swaps table metadata
+    exchange_loop: LOOP
+        SET v_partition = (
+            SELECT PARTITION_NAME
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'logs' AND PARTITION_DESCRIPTION <> 'MAXVALUE'
+                AND CAST(PARTITION_DESCRIPTION AS UNSIGNED) <= UNIX_TIMESTAMP(CURDATE() - INTERVAL p_keep_days DAY)
+            ORDER BY PARTITION_ORDINAL_POSITION
+            LIMIT 1
+        );
+        IF v_partition IS NULL THEN
+            LEAVE exchange_loop;
+        END IF;
+
+        SET @wavesql_sql = CONCAT('ALTER TABLE logs EXCHANGE PARTITION ', v_partition, ' WITH TABLE logs_exchange WITHOUT VALIDATION');
+        PREPARE stmt FROM @wavesql_sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+        IF EXISTS (SELECT 1 FROM logs_exchange) THEN
+            SET @wavesql_sql = CONCAT('ALTER TABLE archived_logs EXCHANGE PARTITION ', v_partition, ' WITH TABLE logs_exchange WITHOUT VALIDATION');
+            PREPARE stmt FROM @wavesql_sql;
+            EXECUTE stmt;
+            DEALLOCATE PREPARE stmt;
+            -- * the archived partition is normally empty, anything swapped out of it is put back
+            INSERT INTO archived_logs SELECT * FROM logs_exchange;
+            TRUNCATE TABLE logs_exchange;
+        END IF;
+        SET @wavesql_sql = CONCAT('ALTER TABLE logs DROP PARTITION ', v_partition);
+        PREPARE stmt FROM @wavesql_sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END LOOP;
+
+    -- * a partition is never dropped from archived_logs while logs still has its pair
+    drop_loop: LOOP
+        SET v_partition = (
+            SELECT PARTITION_NAME
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'archived_logs' AND PARTITION_DESCRIPTION <> 'MAXVALUE'
+                AND CAST(PARTITION_DESCRIPTION AS UNSIGNED) <= UNIX_TIMESTAMP(CURDATE() - INTERVAL GREATEST(p_keep_days, p_archive_days) DAY)
+            ORDER BY PARTITION_ORDINAL_POSITION
+            LIMIT 1
+        );
+        IF v_partition IS NULL THEN
+            LEAVE drop_loop;
+        END IF;
+
+        SET @wavesql_sql = CONCAT('ALTER TABLE archived_logs DROP PARTITION ', v_partition);
+        PREPARE stmt FROM @wavesql_sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END LOOP;
+END$$
+DELIMITER ;
+
+
+DELIMITER $$
+CREATE EVENT rotate_logs
+ON SCHEDULE EVERY 1 DAY
+STARTS CURRENT_TIMESTAMP
+DO
+BEGIN
+    CALL add_log_partitions(7);
+    CALL rotate_log_partitions(30, 60);
+END$$
+DELIMITER ;
@@ -19,10 +19,21 @@
 
 from pathlib import Path
 import re
+import keyword
 from .constants import no_python_names
+from .parseCache import ParseCache
 from typing import Literal
 
 _query = "self._db_query"
+_query_many = "self._db_query_many"
+_stream = "self.stream"
+
+_table_clause = re.compile(
+    r"\b(FROM|JOIN|INTO|UPDATE|ON)\b\s*(.*?)"
+    r"(?=\b(?:WHERE|SET|VALUES?|SELECT|ON|USING|NATURAL|STRAIGHT_JOIN|INNER|CROSS|LEFT|RIGHT|JOIN|GROUP|ORDER|HAVING|LIMIT|UNION|WINDOW|FOR|LOCK)\b|[();]|$)",
+    re.IGNORECASE | re.DOTALL
+)
+_table_modifiers = {"low_priority", "high_priority", "delayed", "ignore", "quick"}
 _procedure = "self._db_call_procedure"
 
 
@@ -92,19 +103,37 @@ class SqlObject(Sql):
 
 
 class SqlQuery(Sql):
-    def __init__(self, code: str, create_python: bool = False, all_spacing_count: int = 4, spacing_after: int = 4, dictionary_default: bool = True):
+    def __init__(
+        self, code: str, create_python: bool = False, all_spacing_count: int = 4, spacing_after: int = 4,
+        dictionary_default: bool = True, is_row_class: bool = False
+    ):
         super().__init__(code, create_python, all_spacing_count, spacing_after)
         self.dictionary_default = dictionary_default
+        self.is_row_class = is_row_class
+        self.row_class_ref: str | None = None
+        self.row_class_code = ""
+        self.is_bulk = False
+        self.is_columns = False
+        self.read_tables: tuple[str, ...] = ()
+        self.write_tables: tuple[str, ...] = ()
         if create_python:
             if self.name != self.code:
                 try:
                     self.action, self.python_name = self.name.split(" ")[:2]
-                    execute_query = " ".join(self.code.split(" ")[4:])
+                    self.is_bulk = self.code.split(" ")[3].lower() == "bulk"
+                    self.is_columns = self.code.split(" ")[3].lower() == "columns"
+                    execute_query = " ".join(self.code.split(" ")[5 if self.is_bulk or self.is_columns else 4:])
                     query_type = execute_query.split(" ")[0]
                     self.sync_python_code = None
                     self.async_python_code = None
+                    if query_type.lower() == "select":
+                        self.read_tables = self.get_tables(execute_query)
+                    else:
+                        self.write_tables = self.get_tables(re.sub(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b.*", "", execute_query, flags=re.IGNORECASE | re.DOTALL))
                     if self.action.lower() == "create" and self.python_name:
-                        if query_type.lower() == "select":
+                        if query_type.lower() == "select" and self.is_columns:
+                            self.sync_python_code, self.async_python_code = self.parse_select_query_to_columns_method(query=execute_query)
+                        elif query_type.lower() == "select" and not self.is_bulk:
                             self.sync_python_code, self.async_python_code = self.parse_select_query_to_method(query=execute_query)
                         elif query_type.lower() == "insert":
                             self.sync_python_code, self.async_python_code = self.parse_insert_query_to_method(query=execute_query)
@@ -120,6 +149,44 @@ class SqlQuery(Sql):
                 except Exception:
                     self.can_python = False
 
+    @staticmethod
+    def get_tables(query: str) -> tuple[str, ...]:
+        tables = []
+        for match in _table_clause.finditer(query):
+            items = match.group(2).split(",")
+            if match.group(1).upper() == "ON":
+                # * a join condition can only be followed by more comma-joined tables
+                items = items[1:]
+            for item in items:
+                words = [word for word in item.split() if word.lower() not in _table_modifiers]
+                if words:
+                    tables.append(words[0].replace("`", "").lower())
+        return tuple(dict.fromkeys(tables))
+
+    @property
+    def cache_part(self) -> str:
+        return f", cache_tables={self.read_tables!r}" if self.read_tables else ""
+
+    @property
+    def row_class_part(self) -> str:
+        return f", row_class={self.row_class_ref}" if self.row_class_ref else ""
+
+    @property
+    def row_type(self) -> str:
+        if self.row_class_ref == "True":
+            return "tuple"
+        if self.row_class_ref:
+            return self.row_class_ref.removeprefix("self.")
+        return "dict" if self.dictionary_default else "tuple"
+
+    @property
+    def invalidate_part(self) -> str:
+        return f"invalidate_tables={self.write_tables!r}" if self.write_tables else ""
+
+    @staticmethod
+    def join_arguments(*arguments: str) -> str:
+        return ", ".join(argument.strip().rstrip(",") for argument in arguments if argument and argument.strip())
+
     def clean_commas_inside_parentheses(self, s: str) -> str:
         def clean(match):
             inside = match.group(1)
@@ -139,6 +206,40 @@ class SqlQuery(Sql):
         sql = re.sub(r"\(\s*,", "(", sql)
         return sql
 
+    @staticmethod
+    def split_fields(fields: str) -> list[str]:
+        parts, depth, start = [], 0, 0
+        for i, char in enumerate(fields):
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+            elif char == "," and depth == 0:
+                parts.append(fields[start:i].strip())
+                start = i + 1
+        parts.append(fields[start:].strip())
+        return [part for part in parts if part]
+
+    @staticmethod
+    def get_field_name(field: str) -> str | None:
+        match = (
+            re.search(r"\s+AS\s+`?(\w+)`?$", field, re.IGNORECASE)
+            or re.fullmatch(r"(?:`?\w+`?\.)*`?(\w+)`?", field)
+            or re.search(r"[\w)`]\s+`?(\w+)`?$", field)
+        )
+        return match.group(1) if match else None
+
+    def set_row_class(self, cleaned_fields: str) -> None:
+        # * columns without a usable attribute name fall back to a row class derived from the cursor at runtime
+        names = [self.get_field_name(field) for field in self.split_fields(cleaned_fields)]
+        if any(name is None or not name.isidentifier() or keyword.iskeyword(name) or name.startswith("_") for name in names) or len(set(names)) != len(names):
+            self.row_class_ref = "True"
+            self.row_class_code = ""
+            return
+        class_name = "".join(word.capitalize() for word in self.python_name.split("_")) + "Row"
+        self.row_class_ref = f"self.{class_name}"
+        self.row_class_code = f"{self.all_spacing}class {class_name}(NamedTuple):\n" + "\n".join(f"{self.all_spacing}{self.spacing}{name}: Any" for name in names) + "\n\n"
+
     def get_matches_query(self, query: str) -> tuple[list, str]:
         matches = re.findall(r"\{\%\s*extend\s+(\w+)\s*:\s*(\w+)\s*\%\}", query)
         sql_query = re.sub(r"\{\%\s*extend\s+\w+\s*:\s*\w+\s*\%\}", "%s", query).strip()
@@ -165,77 +266,104 @@ class SqlQuery(Sql):
         param_signature = ", ".join(f"{name}: {typ}" for name, typ in matches)
         param_values = ", ".join(name for name, _ in matches)
         param_tuple = f" ({param_values}, )," if param_values else ""
-        
-        return (
-            self.parse_select_query_to_sync_method(
-                cleaned_fields=cleaned_fields, has_limit_1=has_limit_1,
-                param_signature=param_signature, fetch_value=fetch_value,
+
+        if self.is_row_class and not self.is_single_column(cleaned_fields):
+            self.set_row_class(cleaned_fields)
+
+        sync_python_code = self.parse_select_query_to_sync_method(
+            cleaned_fields=cleaned_fields, has_limit_1=has_limit_1,
+            param_signature=param_signature, fetch_value=fetch_value,
+            sql_query=sql_query, param_tuple=param_tuple
+        )
+        async_python_code = self.parse_select_query_to_async_method(
+            cleaned_fields=cleaned_fields, has_limit_1=has_limit_1,
+            param_signature=param_signature, fetch_value=fetch_value,
+            sql_query=sql_query, param_tuple=param_tuple
+        )
+        if not re.search(r"\bLIMIT\s+\d+", sql_query, re.IGNORECASE):
+            sync_python_code += "\n\n" + self.parse_select_query_to_sync_iter_method(
+                cleaned_fields=cleaned_fields, param_signature=param_signature,
                 sql_query=sql_query, param_tuple=param_tuple
-            ),
-            self.parse_select_query_to_async_method(
-                cleaned_fields=cleaned_fields, has_limit_1=has_limit_1,
-                param_signature=param_signature, fetch_value=fetch_value,
+            )
+            async_python_code += "\n\n" + self.parse_select_query_to_async_iter_method(
+                cleaned_fields=cleaned_fields, param_signature=param_signature,
                 sql_query=sql_query, param_tuple=param_tuple
             )
+        return self.row_class_code + sync_python_code, self.row_class_code + async_python_code
+
+    def parse_select_query_to_columns_method(self, query: str) -> tuple[str, str]:
+        matches, sql_query = self.get_matches_query(query=query)
+
+        sql_query = self.clean_commas_inside_parentheses(sql_query)
+        sql_query = self.clean_outer_commas(sql_query)
+
+        param_signature = ", ".join(f"{name}: {typ}" for name, typ in matches)
+        param_values = ", ".join(name for name, _ in matches)
+        param_tuple = f"({param_values}, )" if param_values else ""
+
+        arguments = self.join_arguments(f'"{sql_query}"', param_tuple, "fetch=4")
+        return (
+            f"{self.all_spacing}def {self.python_name}(self, {param_signature}) -> dict[str, Any]:\n{self.all_spacing}{self.spacing}return {_query}({arguments})",
+            f"{self.all_spacing}async def {self.python_name}(self, {param_signature}) -> dict[str, Any]:\n{self.all_spacing}{self.spacing}return await {_query}({arguments})"
         )
 
+    def is_single_column(self, cleaned_fields: str) -> bool:
+        return cleaned_fields != "*" and len(self.split_fields(cleaned_fields)) == 1
+
+    def get_select_fetch(self, cleaned_fields: str, has_limit_1: bool, fetch_value: Literal["1", "2"]) -> tuple[str, str]:
+        if self.is_single_column(cleaned_fields):
+            if has_limit_1:
+                return '"scalar"', " -> int | float | str | bool | datetime | None"
+            return '"column"', " -> list"
+        if fetch_value != "1":
+            return fetch_value, f" -> list[{self.row_type}]"
+        return fetch_value, f" -> {self.row_type}"
+
     def parse_select_query_to_sync_method(
         self, cleaned_fields: str, has_limit_1: bool, param_signature: str,
         fetch_value: Literal["1", "2"], sql_query: str, param_tuple: str
     ) -> str:
-        if cleaned_fields != "*" and len(cleaned_fields.split(",")) == 1:
-            if has_limit_1:
-                fetch_suffix = ", dictionary=False)[0]"
-                start_suffix = ""
-            else:
-                fetch_suffix = ", dictionary=False)))"
-                start_suffix = "list(map(lambda x: x[0], "
+        fetch_value, full_result = self.get_select_fetch(cleaned_fields, has_limit_1, fetch_value)
+        row_class_part = "" if self.is_single_column(cleaned_fields) else self.row_class_part
+
+        return f"{self.all_spacing}def {self.python_name}(self, {param_signature}){full_result}:\n{self.all_spacing}{self.spacing}return {_query}(\"{sql_query}\",{param_tuple} fetch={fetch_value}{self.cache_part}{row_class_part})"
+
+    def parse_select_query_to_sync_iter_method(
+        self, cleaned_fields: str, param_signature: str, sql_query: str, param_tuple: str
+    ) -> str:
+        if self.is_single_column(cleaned_fields):
+            full_result = " -> Iterator"
+            start_suffix = "(row[0] for row in "
+            fetch_suffix = ", is_dictionary=False))"
         else:
-            fetch_suffix = ")"
+            full_result = f" -> Iterator[{self.row_type}]"
             start_suffix = ""
-            
-        result_type = ("dict" if self.dictionary_default else "tuple")
-        full_result = ""
-        len_cleaned_fields = len(cleaned_fields.split(" "))
-        if len_cleaned_fields == 1 and cleaned_fields != "*" and has_limit_1:
-            full_result = ' -> int | float | str | bool | datetime | None'
-        elif len_cleaned_fields == 1 and cleaned_fields != "*" and not has_limit_1:
-            full_result = ' -> list'
-        elif fetch_value != "1":
-            full_result = f' -> list[{result_type}]'
+            fetch_suffix = f"{self.row_class_part})"
+
+        return f"{self.all_spacing}def iter_{self.python_name}(self, {param_signature}){full_result}:\n{self.all_spacing}{self.spacing}return {start_suffix}{_query}(\"{sql_query}\",{param_tuple} fetch=3{fetch_suffix}"
+
+    def parse_select_query_to_async_iter_method(
+        self, cleaned_fields: str, param_signature: str, sql_query: str, param_tuple: str
+    ) -> str:
+        if self.is_single_column(cleaned_fields):
+            full_result = " -> AsyncIterator"
+            start_suffix = "(row[0] async for row in "
+            fetch_suffix = f",{param_tuple or ''} is_dictionary=False))"
         else:
-            full_result = f' -> {result_type}'
+            full_result = f" -> AsyncIterator[{self.row_type}]"
+            start_suffix = ""
+            fetch_suffix = f",{param_tuple.rstrip(',')}{self.row_class_part})" if param_tuple else f"{self.row_class_part})"
 
-        return f"{self.all_spacing}def {self.python_name}(self, {param_signature}){full_result}:\n{self.all_spacing}{self.spacing}return {start_suffix}{_query}(\"{sql_query}\",{param_tuple} fetch={fetch_value}{fetch_suffix}"
+        return f"{self.all_spacing}def iter_{self.python_name}(self, {param_signature}){full_result}:\n{self.all_spacing}{self.spacing}return {start_suffix}{_stream}(\"{sql_query}\"{fetch_suffix}"
 
     def parse_select_query_to_async_method(
         self, cleaned_fields: str, has_limit_1: bool, param_signature: str,
         fetch_value: Literal["1", "2"], sql_query: str, param_tuple: str
     ) -> str:
-        if cleaned_fields != "*" and len(cleaned_fields.split(",")) == 1:
-            if has_limit_1:
-                fetch_suffix = ", dictionary=False))[0]"
-                start_suffix = "(await "
-            else:
-                fetch_suffix = ", dictionary=False))))"
-                start_suffix = "list(map(lambda x: x[0], (await "
-        else:
-            fetch_suffix = ")"
-            start_suffix = "await "
-            
-        result_type = ("dict" if self.dictionary_default else "tuple")
-        full_result = ""
-        len_cleaned_fields = len(cleaned_fields.split(" "))
-        if len_cleaned_fields == 1 and cleaned_fields != "*" and has_limit_1:
-            full_result = ' -> int | float | str | bool | datetime | None'
-        elif len_cleaned_fields == 1 and cleaned_fields != "*" and not has_limit_1:
-            full_result = ' -> list'
-        elif fetch_value != "1":
-            full_result = f' -> list[{result_type}]'
-        else:
-            full_result = f' -> {result_type}'
-            
-        return f"{self.all_spacing}async def {self.python_name}(self, {param_signature}){full_result}:\n{self.all_spacing}{self.spacing}return {start_suffix}{_query}(\"{sql_query}\",{param_tuple} fetch={fetch_value}{fetch_suffix}"
+        fetch_value, full_result = self.get_select_fetch(cleaned_fields, has_limit_1, fetch_value)
+        row_class_part = "" if self.is_single_column(cleaned_fields) else self.row_class_part
+
+        return f"{self.all_spacing}async def {self.python_name}(self, {param_signature}){full_result}:\n{self.all_spacing}{self.spacing}return await {_query}(\"{sql_query}\",{param_tuple} fetch={fetch_value}{self.cache_part}{row_class_part})"
     
     def parse_insert_query_to_method(self, query: str) -> str:
         matches, sql_query = self.get_matches_query(query=query)
@@ -247,16 +375,19 @@ class SqlQuery(Sql):
         param_values = ", ".join(name for name, _ in matches)
         values_part = f"({param_values}, )" if param_values else ""
 
-        return (
-            self.parse_insert_query_to_sync_method(param_signature=param_signature, sql_query=sql_query, values_part=values_part),
-            self.parse_insert_query_to_async_method(param_signature=param_signature, sql_query=sql_query, values_part=values_part)
+        return self.add_bulk_methods(
+            (
+                self.parse_insert_query_to_sync_method(param_signature=param_signature, sql_query=sql_query, values_part=values_part),
+                self.parse_insert_query_to_async_method(param_signature=param_signature, sql_query=sql_query, values_part=values_part)
+            ),
+            sql_query=sql_query
         )
     
     def parse_insert_query_to_sync_method(self, param_signature: str, sql_query: str, values_part: str) -> str:
-        return f"{self.all_spacing}def {self.python_name}(self, {param_signature}) -> None:\n{self.all_spacing}{self.spacing}{_query}(\"{sql_query}\", {values_part})"
+        return f"{self.all_spacing}def {self.python_name}(self, {param_signature}) -> None:\n{self.all_spacing}{self.spacing}{_query}({self.join_arguments(f'"{sql_query}"', values_part, self.invalidate_part)})"
     
     def parse_insert_query_to_async_method(self, param_signature: str, sql_query: str, values_part: str) -> str:
-        return f"{self.all_spacing}async def {self.python_name}(self, {param_signature}) -> None:\n{self.all_spacing}{self.spacing}await {_query}(\"{sql_query}\", {values_part})"
+        return f"{self.all_spacing}async def {self.python_name}(self, {param_signature}) -> None:\n{self.all_spacing}{self.spacing}await {_query}({self.join_arguments(f'"{sql_query}"', values_part, self.invalidate_part)})"
 
     def parse_delete_query_to_method(self, query: str) -> str:
         matches, sql_query = self.get_matches_query(query=query)
@@ -267,16 +398,19 @@ class SqlQuery(Sql):
         param_values = ", ".join(name for name, _ in matches)
         values_part = f"({param_values}, )" if param_values else ""
 
-        return (
-            self.parse_delete_query_to_sync_method(param_signature=param_signature, sql_query=sql_query, values_part=values_part),
-            self.parse_delete_query_to_async_method(param_signature=param_signature, sql_query=sql_query, values_part=values_part)
+        return self.add_bulk_methods(
+            (
+                self.parse_delete_query_to_sync_method(param_signature=param_signature, sql_query=sql_query, values_part=values_part),
+                self.parse_delete_query_to_async_method(param_signature=param_signature, sql_query=sql_query, values_part=values_part)
+            ),
+            sql_query=sql_query
         )
     
     def parse_delete_query_to_sync_method(self, param_signature: str, sql_query: str, values_part: str) -> str:
-        return f"{self.all_spacing}def {self.python_name}(self, {param_signature}) -> None:\n{self.all_spacing}{self.spacing}{_query}(\"{sql_query}\", {values_part})"
+        return f"{self.all_spacing}def {self.python_name}(self, {param_signature}) -> None:\n{self.all_spacing}{self.spacing}{_query}({self.join_arguments(f'"{sql_query}"', values_part, self.invalidate_part)})"
 
     def parse_delete_query_to_async_method(self, param_signature: str, sql_query: str, values_part: str) -> str:
-        return f"{self.all_spacing}async def {self.python_name}(self, {param_signature}) -> None:\n{self.all_spacing}{self.spacing}await {_query}(\"{sql_query}\", {values_part})"
+        return f"{self.all_spacing}async def {self.python_name}(self, {param_signature}) -> None:\n{self.all_spacing}{self.spacing}await {_query}({self.join_arguments(f'"{sql_query}"', values_part, self.invalidate_part)})"
 
     def parse_update_query_to_method(self, query: str) -> str:
         matches, sql_query = self.get_matches_query(query=query)
@@ -297,29 +431,50 @@ class SqlQuery(Sql):
         param_values = ", ".join(name for name, _ in matches)
         param_tuple = f" ({param_values}, )" if param_values else ""
 
-        return (
-            self.parse_update_query_to_sync_method(param_signature=param_signature, sql_query=sql_query, param_tuple=param_tuple),
-            self.parse_update_query_to_async_method(param_signature=param_signature, sql_query=sql_query, param_tuple=param_tuple)
+        return self.add_bulk_methods(
+            (
+                self.parse_update_query_to_sync_method(param_signature=param_signature, sql_query=sql_query, param_tuple=param_tuple),
+                self.parse_update_query_to_async_method(param_signature=param_signature, sql_query=sql_query, param_tuple=param_tuple)
+            ),
+            sql_query=sql_query
         )
     
     def parse_update_query_to_sync_method(self, param_signature: str, sql_query: str, param_tuple: str) -> str:
-        return f"{self.all_spacing}def {self.python_name}(self, {param_signature}) -> None:\n{self.all_spacing}{self.spacing}{_query}(\"{sql_query}\",{param_tuple})"
+        return f"{self.all_spacing}def {self.python_name}(self, {param_signature}) -> None:\n{self.all_spacing}{self.spacing}{_query}({self.join_arguments(f'"{sql_query}"', param_tuple, self.invalidate_part)})"
 
     def parse_update_query_to_async_method(self, param_signature: str, sql_query: str, param_tuple: str) -> str:
-        return f"{self.all_spacing}async def {self.python_name}(self, {param_signature}) -> None:\n{self.all_spacing}{self.spacing}await {_query}(\"{sql_query}\",{param_tuple})"
+        return f"{self.all_spacing}async def {self.python_name}(self, {param_signature}) -> None:\n{self.all_spacing}{self.spacing}await {_query}({self.join_arguments(f'"{sql_query}"', param_tuple, self.invalidate_part)})"
+
+    def add_bulk_methods(self, python_code: tuple[str, str], sql_query: str) -> tuple[str, str]:
+        if not self.is_bulk:
+            return python_code
+        sync_python_code, async_python_code = python_code
+        return (
+            sync_python_code + "\n\n" + self.parse_bulk_query_to_sync_method(sql_query=sql_query),
+            async_python_code + "\n\n" + self.parse_bulk_query_to_async_method(sql_query=sql_query)
+        )
+
+    def parse_bulk_query_to_sync_method(self, sql_query: str) -> str:
+        return f"{self.all_spacing}def {self.python_name}_many(self, rows: Iterable[tuple]) -> int | None:\n{self.all_spacing}{self.spacing}return {_query_many}({self.join_arguments(f'"{sql_query}"', "rows", self.invalidate_part)})"
+
+    def parse_bulk_query_to_async_method(self, sql_query: str) -> str:
+        return f"{self.all_spacing}async def {self.python_name}_many(self, rows: Iterable[tuple]) -> int | None:\n{self.all_spacing}{self.spacing}return await {_query_many}({self.join_arguments(f'"{sql_query}"', "rows", self.invalidate_part)})"
 
 
 class SqlFileQueries:
     def __init__(
         self, path: Path | str, create_python: bool = False, all_spacing_count: int = 4,
-        spacing_after: int = 4, is_dictionary_default: bool = True, dict_of_values: dict = {}
+        spacing_after: int = 4, is_dictionary_default: bool = True, dict_of_values: dict = {}, is_row_class: bool = False,
+        parse_cache: ParseCache | None = None
     ) -> None:
         self.file_path = path
         self.create_python = create_python
         self.all_spacing_count = all_spacing_count
         self.spacing_after = spacing_after
         self.dictionary_default = is_dictionary_default
+        self.is_row_class = is_row_class
         self.dict_of_values = dict_of_values
+        self.parse_cache = parse_cache
         self.sql_queries: tuple[SqlQuery] = self.file_to_sql_scripts()
     
     def parse_sql(self, code: str) -> tuple[SqlQuery]:
@@ -328,11 +483,16 @@ class SqlFileQueries:
         for command in sql_commands:
             stripped_command = command.strip()
             if stripped_command:
-                sql_obj_lst.append(SqlQuery(code=stripped_command, create_python=self.create_python, all_spacing_count=self.all_spacing_count, spacing_after=self.spacing_after, dictionary_default=self.dictionary_default))
+                sql_obj_lst.append(SqlQuery(code=stripped_command, create_python=self.create_python, all_spacing_count=self.all_spacing_count, spacing_after=self.spacing_after, dictionary_default=self.dictionary_default, is_row_class=self.is_row_class))
                     
         return tuple(sql_obj_lst)
     
     def file_to_sql_scripts(self, ) -> tuple[SqlQuery]:
+        if self.parse_cache is not None:
+            options = ("SqlFileQueries", self.dict_of_values, self.create_python, self.all_spacing_count, self.spacing_after, self.dictionary_default, self.is_row_class)
+            return self.parse_cache.load(
+                self.file_path, options, lambda code: self.parse_sql(code=substitute_template(text=code, values=self.dict_of_values))
+            )
         with open(self.file_path, "r", encoding="utf-8") as sql_file:
             code = sql_file.read()
         code = substitute_template(text=code, values=self.dict_of_values)
@@ -340,10 +500,11 @@ class SqlFileQueries:
 
 
 class SqlFileObject:
-    def __init__(self, path: Path | str, dict_of_values: dict = {}, is_create_python: bool = False) -> None:
+    def __init__(self, path: Path | str, dict_of_values: dict = {}, is_create_python: bool = False, parse_cache: ParseCache | None = None) -> None:
         self.file_path = path
         self.dict_of_values = dict_of_values
         self.is_create_python = is_create_python
+        self.parse_cache = parse_cache
         self.sql_objects: tuple[SqlObject] = self.file_to_sql_scripts()
     
     def parse_sql(self, code: str, is_create_python: bool | None = None) -> tuple[SqlObject]:
@@ -366,6 +527,15 @@ class SqlFileObject:
         return tuple(sql_obj_lst)
     
     def file_to_sql_scripts(self, ) -> tuple[SqlObject]:
+        if self.parse_cache is not None and isinstance(self.file_path, Path):
+            is_create_python = (not self.file_path.name.startswith("-")) and self.is_create_python
+            try:
+                return self.parse_cache.load(
+                    self.file_path, ("SqlFileObject", self.dict_of_values, is_create_python),
+                    lambda code: self.parse_sql(code=substitute_template(text=code, values=self.dict_of_values), is_create_python=is_create_python)
+                )
+            except OSError:
+                pass
         try:
             with open(self.file_path, "r", encoding="utf-8") as sql_file:
                 code = sql_file.read()